@@ -0,0 +1,89 @@
+"""This script benchmarks the number of file open calls made per .py file by
+the `copyright-status`, `copyright` and `copyright-delete` commands.
+
+To run
+cd ~/snlcopyright
+python benchmarks/bench_notice.py
+python benchmarks/bench_notice.py --files 5000
+
+File opens are counted with a Python audit hook, which requires Python 3.8+.
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import snlcopyright.copyright_crud as cr
+
+opens = {"all": 0, "notice": 0}  # running totals, updated by the audit hook
+
+
+def audit(event: str, args) -> None:
+    """Counts every file open, and separately the opens of `copyright.txt`."""
+    if event == "open":
+        opens["all"] += 1
+        if str(args[0]).endswith("copyright.txt"):
+            opens["notice"] += 1
+
+
+def measure(name: str, command, n_files: int) -> None:
+    """Runs `command` with stdout suppressed and prints opens per file."""
+    opens["all"] = 0
+    opens["notice"] = 0
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        command()
+    elapsed = time.perf_counter() - start
+    print(
+        f"{name:<18} {opens['all'] / n_files:6.2f} opens/file "
+        f"({opens['notice'] / n_files:5.2f} of copyright.txt) "
+        f"{elapsed:8.3f} s"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=1000, help="number of files")
+    args = parser.parse_args()
+
+    sys.addaudithook(audit)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        for ii in range(args.files):
+            root.joinpath(f"module_{ii}.py").write_text(f"x = {ii}\n")
+
+        original_path = Path.cwd()
+        os.chdir(root)
+        try:
+            print(f"{args.files} files")
+            measure("copyright-status", cr.copyright_status, args.files)
+            measure("copyright", cr.copyright, args.files)
+            measure("copyright-status", cr.copyright_status, args.files)
+            measure("copyright-delete", cr.copyright_delete, args.files)
+        finally:
+            os.chdir(original_path)
+
+
+if __name__ == "__main__":
+    main()
+
+
+"""
+Copyright 2023 Sandia National Laboratories
+
+Notice: This computer software was prepared by National Technology and Engineering Solutions of
+Sandia, LLC, hereinafter the Contractor, under Contract DE-NA0003525 with the Department of Energy
+(DOE). All rights in the computer software are reserved by DOE on behalf of the United States
+Government and the Contractor as provided in the Contract. You are authorized to use this computer
+software for Governmental purposes but it is not to be released or distributed to the public.
+NEITHER THE U.S. GOVERNMENT NOR THE CONTRACTOR MAKES ANY WARRANTY, EXPRESS OR IMPLIED, OR ASSUMES
+ANY LIABILITY FOR THE USE OF THIS SOFTWARE. This notice including this sentence must appear on any
+copies of this computer software. Export of this data may require a license from the United States
+Government.
+"""
@@ -0,0 +1,95 @@
+"""This script benchmarks the startup time of the commands, that is, the time
+to import what each command needs, as measured by `python -X importtime`,
+along with the wall time of running it in a fresh process.
+
+To run
+cd ~/snlcopyright
+python benchmarks/bench_startup.py
+python benchmarks/bench_startup.py --repeat 10
+
+The `pkg_resources` line is the cost the commands used to pay, for reference,
+when `copyright-info` and `copyright-version` were built on it.
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from typing import List, Tuple
+
+# The name of each measurement, and the Python code it runs.
+CASES: List[Tuple[str, str]] = [
+    ("python (empty)", "pass"),
+    ("pkg_resources", "import pkg_resources"),
+    ("snlcopyright.cli", "import snlcopyright.cli"),
+    ("snlcopyright version", "from snlcopyright.cli import main; main(['version'])"),
+    (
+        "snlcopyright status -h",
+        "from snlcopyright.cli import main; main(['status', '-h'])",
+    ),
+    ("snlcopyright.command_line", "import snlcopyright.command_line"),
+]
+
+
+def import_time_us(code: str) -> int:
+    """Returns the total import time in microseconds, as reported by
+    `-X importtime`, of running `code` in a fresh process."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+    )
+    total = 0
+    for line in completed.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not name.startswith("  "):  # a top level import
+            total += int(cumulative)
+    return total
+
+
+def wall_time_s(code: str) -> float:
+    """Returns the wall time in seconds of running `code` in a fresh process."""
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-c", code],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="runs per case")
+    args = parser.parse_args()
+    repeat = max(args.repeat, 1)
+
+    print(f"{'case':<28}{'imports ms':>12}{'wall ms':>10}  (median of {repeat})")
+    for name, code in CASES:
+        imports = statistics.median(import_time_us(code) for _ in range(repeat))
+        wall = statistics.median(wall_time_s(code) for _ in range(repeat))
+        print(f"{name:<28}{imports / 1000:>12.1f}{wall * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
+
+
+"""
+Copyright 2023 Sandia National Laboratories
+
+Notice: This computer software was prepared by National Technology and Engineering Solutions of
+Sandia, LLC, hereinafter the Contractor, under Contract DE-NA0003525 with the Department of Energy
+(DOE). All rights in the computer software are reserved by DOE on behalf of the United States
+Government and the Contractor as provided in the Contract. You are authorized to use this computer
+software for Governmental purposes but it is not to be released or distributed to the public.
+NEITHER THE U.S. GOVERNMENT NOR THE CONTRACTOR MAKES ANY WARRANTY, EXPRESS OR IMPLIED, OR ASSUMES
+ANY LIABILITY FOR THE USE OF THIS SOFTWARE. This notice including this sentence must appear on any
+copies of this computer software. Export of this data may require a license from the United States
+Government.
+"""
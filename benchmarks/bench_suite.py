@@ -0,0 +1,355 @@
+"""This script benchmarks the copyright commands over a generated source tree,
+and compares the results with a stored baseline.
+
+The tree is generated from a seed, so that runs are comparable: the number of
+files, the depth of the directories, the distribution of the file sizes, and
+the fraction of files already carrying the copyright block are configurable.
+Each phase runs in a fresh Python process, so that its bytes read and written
+and its peak resident set size are its own:
+
+* modules_list: walks the tree.
+* status: `copyright_status`, reading every file.
+* create: `copyright`, marking the unmarked files.
+* update: `process_files` with the update operation, changing the year.
+* delete: `copyright_delete`, deleting the updated block.
+
+The best time of `--repeat` runs is kept, each on a freshly generated tree.
+A phase fails the comparison if its files per second drop, or its bytes read
+or written or its peak RSS grow, by more than `--tolerance` relative to the
+baseline; the script then exits with status 1.  Timings depend on the
+machine, so save a baseline on the machine that compares against it.
+
+To run
+cd ~/snlcopyright
+python benchmarks/bench_suite.py
+python benchmarks/bench_suite.py --files 20000 --depth 6 --sizes lognormal
+python benchmarks/bench_suite.py --save-baseline
+python benchmarks/bench_suite.py --no-compare --json results.json
+
+Bytes read and written are taken from /proc/self/io, on Linux only, and the
+peak RSS from the `resource` module, on Unix only; elsewhere they are null.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import math
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import snlcopyright.copyright_crud as cr
+from snlcopyright.report import make_report
+
+BASELINE: Path = Path(__file__).with_name("baseline.json")
+PHASES = ("modules_list", "status", "create", "update", "delete")
+SIZES = ("fixed", "uniform", "lognormal")
+TREE_OPTIONS = ("files", "depth", "fanout", "sizes", "kilobytes", "marked", "seed")
+
+# Growth below these amounts is noise, e.g., a few reads of Python modules.
+SLACK = {"bytes_read": 2**16, "bytes_written": 2**16, "peak_rss_kib": 2**10}
+
+FUNCTION = '''
+
+def function_{index}(values, scale=1.0):
+    """Returns the scaled sum of the values."""
+    total = 0.0
+    for value in values:
+        total += scale * value
+    return total
+'''
+
+
+def file_sizes(n_files: int, sizes: str, kilobytes: float, rng) -> List[int]:
+    """Returns `n_files` sizes in bytes, with a mean of about `kilobytes`, drawn
+    from the `sizes` distribution, one of `SIZES`."""
+    mean = kilobytes * 1024
+    if sizes == "fixed":
+        return [int(mean)] * n_files
+    if sizes == "uniform":
+        return [int(rng.uniform(0, 2 * mean)) for _ in range(n_files)]
+    # The mean of lognormvariate(0, 1) is e**0.5; a few files are many times
+    # larger than the rest, as in real trees.
+    scale = mean / math.exp(0.5)
+    return [int(rng.lognormvariate(0.0, 1.0) * scale) for _ in range(n_files)]
+
+
+def make_tree(
+    root: Path,
+    *,
+    files: int,
+    depth: int,
+    fanout: int,
+    sizes: str,
+    kilobytes: float,
+    marked: float,
+    seed: int,
+) -> int:
+    """Writes `files` modules under `root`, in directories up to `depth` levels
+    deep with `fanout` subdirectories each, of sizes drawn from the `sizes`
+    distribution, with the copyright block appended to a `marked` fraction of
+    them.  Returns the total number of bytes written."""
+    rng = random.Random(seed)
+    block = "\n\n" + cr.text_block() + "\n"
+    total = 0
+
+    for index, size in enumerate(file_sizes(files, sizes, kilobytes, rng)):
+        parts = [f"pkg_{rng.randrange(fanout)}" for _ in range(rng.randint(0, depth))]
+        directory = root.joinpath(*parts)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        pieces = [f'"""Generated module {index}."""\n']
+        length = len(pieces[0])
+        while length < size:
+            pieces.append(FUNCTION.format(index=len(pieces)))
+            length += len(pieces[-1])
+        if rng.random() < marked:
+            pieces.append(block)
+
+        text = "".join(pieces)
+        directory.joinpath(f"module_{index}.py").write_text(text)
+        total += len(text)
+    return total
+
+
+def io_counters() -> Dict[str, Optional[int]]:
+    """Returns the bytes read and written by this process so far, from
+    /proc/self/io, or None if it is not available."""
+    counters: Dict[str, Optional[int]] = {"rchar": None, "wchar": None}
+    with contextlib.suppress(OSError):
+        with open("/proc/self/io", mode="r") as fin:
+            for line in fin:
+                key, _, value = line.partition(":")
+                if key in counters:
+                    counters[key] = int(value)
+    return counters
+
+
+def peak_rss_kib() -> Optional[int]:
+    """Returns the peak resident set size of this process in KiB, or None if
+    it is not available."""
+    try:
+        import resource
+    except ImportError:  # e.g., Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak  # bytes on macOS
+
+
+def _quiet_report():
+    """Returns a report that keeps the totals and writes nothing visible."""
+    return make_report("summary", stream=io.StringIO())
+
+
+def run_modules_list(root: Path, jobs: int) -> int:
+    return len(cr.modules_list(root))
+
+
+def run_status(root: Path, jobs: int) -> int:
+    report = _quiet_report()
+    cr.copyright_status(paths=[root], jobs=jobs, report=report)
+    return report.totals["files"]
+
+
+def run_create(root: Path, jobs: int) -> int:
+    report = _quiet_report()
+    cr.copyright(paths=[root], jobs=jobs, report=report)
+    return report.totals["files"]
+
+
+def run_update(root: Path, jobs: int) -> int:
+    notice = cr.notice_template()
+    new = notice.text.replace("2023", "2024")
+    results = cr.process_files(
+        cr.Operation().update, notice, paths=[root], jobs=jobs, new=new
+    )
+    return sum(1 for _ in results)
+
+
+def run_delete(root: Path, jobs: int) -> int:
+    notice = cr.notice_template()
+    updated = notice._replace(text=notice.text.replace("2023", "2024"))
+    report = _quiet_report()
+    cr.copyright_delete(updated, paths=[root], jobs=jobs, report=report)
+    return report.totals["files"]
+
+
+RUNNERS: Dict[str, Callable[[Path, int], int]] = {
+    "modules_list": run_modules_list,
+    "status": run_status,
+    "create": run_create,
+    "update": run_update,
+    "delete": run_delete,
+}
+
+
+def run_phase(phase: str, root: Path, jobs: int) -> Dict[str, Any]:
+    """Runs one phase over the tree at `root` in this process, and returns its
+    measurements."""
+    cr.notice_template()  # loaded before the clock starts
+
+    before = io_counters()
+    start = time.perf_counter()
+    n_files = RUNNERS[phase](root, jobs)
+    seconds = time.perf_counter() - start
+    after = io_counters()
+
+    def delta(key: str) -> Optional[int]:
+        if before[key] is None or after[key] is None:
+            return None
+        return after[key] - before[key]
+
+    return {
+        "files": n_files,
+        "seconds": seconds,
+        "files_per_sec": n_files / seconds if seconds > 0 else None,
+        "bytes_read": delta("rchar"),
+        "bytes_written": delta("wchar"),
+        "peak_rss_kib": peak_rss_kib(),
+    }
+
+
+def spawn_phase(phase: str, root: Path, jobs: int) -> Dict[str, Any]:
+    """Runs one phase in a fresh Python process, and returns its measurements."""
+    command = [sys.executable, __file__, "--run-phase", phase, str(root)]
+    command += ["--jobs", str(jobs)]
+    output = subprocess.run(
+        command, stdout=subprocess.PIPE, universal_newlines=True, check=True
+    ).stdout
+    return json.loads(output)
+
+
+def best(runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Returns the fastest of the `runs` of one phase."""
+    return min(runs, key=lambda run: run["seconds"])
+
+
+def compare(
+    results: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    tolerance: float,
+) -> List[str]:
+    """Returns a message for each measurement that regressed by more than
+    `tolerance`, as a fraction, relative to the `baseline`."""
+    regressions = []
+    for phase, result in results.items():
+        expected = baseline.get(phase)
+        if expected is None:
+            continue
+
+        old, new = expected.get("files_per_sec"), result.get("files_per_sec")
+        if old and new and new < old * (1 - tolerance):
+            regressions.append(
+                f"{phase}: {new:.0f} files/s, down from {old:.0f} files/s"
+            )
+
+        for key in ("bytes_read", "bytes_written", "peak_rss_kib"):
+            old, new = expected.get(key), result.get(key)
+            if old and new and new > old * (1 + tolerance) + SLACK[key]:
+                regressions.append(f"{phase}: {key} {new}, up from {old}")
+    return regressions
+
+
+def print_results(results: Dict[str, Dict[str, Any]]) -> None:
+    """Prints one line of measurements per phase."""
+
+    def cell(value: Optional[float], scale: float = 1.0) -> str:
+        return "-" if value is None else f"{value / scale:.1f}"
+
+    print(
+        f"{'phase':<14}{'files':>8}{'seconds':>10}{'files/s':>12}"
+        f"{'read MB':>10}{'written MB':>12}{'peak RSS MB':>13}"
+    )
+    for phase, result in results.items():
+        print(
+            f"{phase:<14}{result['files']:>8}{result['seconds']:>10.3f}"
+            f"{cell(result['files_per_sec']):>12}"
+            f"{cell(result['bytes_read'], 2**20):>10}"
+            f"{cell(result['bytes_written'], 2**20):>12}"
+            f"{cell(result['peak_rss_kib'], 2**10):>13}"
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=2000, help="number of files")
+    parser.add_argument("--depth", type=int, default=4, help="maximum depth")
+    parser.add_argument("--fanout", type=int, default=4, help="subdirectories")
+    parser.add_argument("--sizes", choices=SIZES, default="lognormal")
+    parser.add_argument("--kilobytes", type=float, default=8.0, help="mean size")
+    parser.add_argument("--marked", type=float, default=0.5, help="fraction marked")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="worker threads")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per phase")
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--no-compare", dest="compare", action="store_false")
+    parser.add_argument("--tolerance", type=float, default=0.5)
+    parser.add_argument("--json", type=Path, help="write the results to JSON")
+    parser.add_argument("--run-phase", nargs=2, metavar=("PHASE", "ROOT"))
+    args = parser.parse_args()
+
+    if args.run_phase:  # in the child process, see `spawn_phase`
+        phase, root = args.run_phase
+        print(json.dumps(run_phase(phase, Path(root), args.jobs)))
+        return 0
+
+    tree = {key: getattr(args, key) for key in TREE_OPTIONS}
+    runs: Dict[str, List[Dict[str, Any]]] = {phase: [] for phase in PHASES}
+    for _ in range(max(args.repeat, 1)):
+        with tempfile.TemporaryDirectory() as tmp:
+            size = make_tree(Path(tmp), **tree)
+            for phase in PHASES:  # in order, each on the tree the last one left
+                runs[phase].append(spawn_phase(phase, Path(tmp), args.jobs))
+
+    results = {phase: best(phase_runs) for phase, phase_runs in runs.items()}
+    print(f"{args.files} files, {size / 2**20:.1f} MB, {tree}, jobs={args.jobs}")
+    print_results(results)
+
+    document = {"tree": tree, "jobs": args.jobs, "results": results}
+    if args.json is not None:
+        args.json.write_text(json.dumps(document, indent=2) + "\n")
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(document, indent=2) + "\n")
+        print(f"Saved the baseline to {args.baseline}")
+        return 0
+    if not args.compare or not args.baseline.is_file():
+        return 0
+
+    baseline = json.loads(args.baseline.read_text())
+    if (baseline.get("tree"), baseline.get("jobs")) != (tree, args.jobs):
+        print(f"Not compared: the tree or jobs differ from {args.baseline}")
+        return 0
+
+    regressions = compare(results, baseline["results"], args.tolerance)
+    if regressions:
+        print(f"REGRESSION: more than {args.tolerance:.0%} worse than the baseline:")
+        for message in regressions:
+            print(f"  {message}")
+        return 1
+    print(f"No regression beyond {args.tolerance:.0%} of the baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+
+"""
+Copyright 2023 Sandia National Laboratories
+
+Notice: This computer software was prepared by National Technology and Engineering Solutions of
+Sandia, LLC, hereinafter the Contractor, under Contract DE-NA0003525 with the Department of Energy
+(DOE). All rights in the computer software are reserved by DOE on behalf of the United States
+Government and the Contractor as provided in the Contract. You are authorized to use this computer
+software for Governmental purposes but it is not to be released or distributed to the public.
+NEITHER THE U.S. GOVERNMENT NOR THE CONTRACTOR MAKES ANY WARRANTY, EXPRESS OR IMPLIED, OR ASSUMES
+ANY LIABILITY FOR THE USE OF THIS SOFTWARE. This notice including this sentence must appear on any
+copies of this computer software. Export of this data may require a license from the United States
+Government.
+"""
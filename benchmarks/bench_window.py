@@ -0,0 +1,78 @@
+"""This script benchmarks `copyright-status` over a tree of large generated
+modules, searching whole files versus only a window at the head and the tail.
+
+To run
+cd ~/snlcopyright
+python benchmarks/bench_window.py
+python benchmarks/bench_window.py --files 50 --megabytes 8 --window 4096
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import snlcopyright.copyright_crud as cr
+
+
+def make_tree(root: Path, n_files: int, megabytes: int) -> None:
+    """Writes `n_files` modules of about `megabytes` each, the first half with
+    the copyright block appended and the second half without."""
+    table = "DATA = [\n" + "    0.0,\n" * (megabytes * 2**20 // 9) + "]\n"
+    for ii in range(n_files):
+        text = table
+        if ii < n_files // 2:
+            text += "\n\n" + cr.text_block() + "\n"
+        root.joinpath(f"table_{ii}.py").write_text(text)
+
+
+def measure(name: str, window) -> None:
+    """Runs `copyright-status` with stdout suppressed and prints the time."""
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        cr.copyright_status(window=window)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<24} {elapsed:8.3f} s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=20, help="number of files")
+    parser.add_argument("--megabytes", type=int, default=4, help="size of each file")
+    parser.add_argument("--window", type=int, default=4096, help="window in bytes")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        make_tree(root, args.files, args.megabytes)
+
+        original_path = Path.cwd()
+        os.chdir(root)
+        try:
+            print(f"{args.files} files of {args.megabytes} MB")
+            measure("whole file", window=None)
+            measure(f"window of {args.window} bytes", window=args.window)
+        finally:
+            os.chdir(original_path)
+
+
+if __name__ == "__main__":
+    main()
+
+
+"""
+Copyright 2023 Sandia National Laboratories
+
+Notice: This computer software was prepared by National Technology and Engineering Solutions of
+Sandia, LLC, hereinafter the Contractor, under Contract DE-NA0003525 with the Department of Energy
+(DOE). All rights in the computer software are reserved by DOE on behalf of the United States
+Government and the Contractor as provided in the Contract. You are authorized to use this computer
+software for Governmental purposes but it is not to be released or distributed to the public.
+NEITHER THE U.S. GOVERNMENT NOR THE CONTRACTOR MAKES ANY WARRANTY, EXPRESS OR IMPLIED, OR ASSUMES
+ANY LIABILITY FOR THE USE OF THIS SOFTWARE. This notice including this sentence must appear on any
+copies of this computer software. Export of this data may require a license from the United States
+Government.
+"""
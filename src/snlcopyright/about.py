@@ -0,0 +1,85 @@
+"""This module describes the installed distribution, for the `copyright-info`
+and `copyright-version` commands.
+
+The metadata is read with `importlib.metadata`, or its backport on Python
+3.7, rather than `pkg_resources`, whose import alone takes longer than a
+typical run of the commands.
+"""
+
+import re
+from typing import Dict
+
+try:
+    from importlib import metadata
+except ImportError:  # Python 3.7
+    import importlib_metadata as metadata  # type: ignore
+
+module_name: str = "snlcopyright"  # the name of the distribution
+
+# The name at the start of a requirement, e.g., `pyyaml` in `pyyaml>=5.1`.
+REQUIREMENT_NAME = re.compile(r"[A-Za-z0-9][A-Za-z0-9._-]*")
+
+
+def dependencies(name: str) -> Dict[str, str]:
+    """Returns `name version` for the installed distribution `name` and,
+    recursively, for each of its installed dependencies, keyed by the
+    lower case name.  The requirements of extras are skipped, as are the
+    requirements that are not installed, e.g., for another Python version."""
+    stack: Dict[str, str] = {}
+    names = [name]
+    while names:
+        item = names.pop()
+        try:
+            dist = metadata.distribution(item)
+        except metadata.PackageNotFoundError:
+            continue
+        key = dist.metadata["Name"].lower()
+        if key in stack:
+            continue
+        stack[key] = f"{dist.metadata['Name']} {dist.version}"
+
+        for requirement in dist.requires or []:
+            _, _, marker = requirement.partition(";")
+            if "extra" in marker:
+                continue
+            match = REQUIREMENT_NAME.match(requirement)
+            if match is not None:
+                names.append(match.group())
+    return stack
+
+
+def copyright_info() -> bool:  # This is a an entry point in pyproject.toml
+    """Echos the installation details and dependencies."""
+    dist = metadata.distribution(module_name)
+    print(f"{module_name} installation details and dependencies:")
+
+    print(f"module name: {dist.metadata['Name']}")
+    print(f"location: {dist.locate_file('')}")
+    print(f"version: {dist.version}")
+
+    print("full stack:")
+    for _, item in sorted(dependencies(module_name).items()):
+        print(f"- {item}")
+
+    return True
+
+
+def copyright_version() -> str:  # This is a an entry point in pyproject.toml
+    """Echos version details of the copyright module."""
+    print(f"{module_name} version:")
+    return metadata.version(module_name)
+
+
+"""
+Copyright 2023 Sandia National Laboratories
+
+Notice: This computer software was prepared by National Technology and Engineering Solutions of
+Sandia, LLC, hereinafter the Contractor, under Contract DE-NA0003525 with the Department of Energy
+(DOE). All rights in the computer software are reserved by DOE on behalf of the United States
+Government and the Contractor as provided in the Contract. You are authorized to use this computer
+software for Governmental purposes but it is not to be released or distributed to the public.
+NEITHER THE U.S. GOVERNMENT NOR THE CONTRACTOR MAKES ANY WARRANTY, EXPRESS OR IMPLIED, OR ASSUMES
+ANY LIABILITY FOR THE USE OF THIS SOFTWARE. This notice including this sentence must appear on any
+copies of this computer software. Export of this data may require a license from the United States
+Government.
+"""
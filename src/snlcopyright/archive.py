@@ -0,0 +1,109 @@
+"""This module checks the files inside built archives, e.g., sdists, wheels
+and tarballs, for the copyright text block, without extracting them.
+
+The members are streamed out of the archive with `tarfile` or `zipfile` and
+searched as the files of the run are, with its variants and configuration,
+so nothing is written to disk; see `copyright_crud.archive_results`.  Tar
+archives, compressed or not, are read in a single sequential pass.
+
+Each member is reported as `<archive>!<member>`, e.g.,
+`dist/pkg-1.0.tar.gz!pkg-1.0/src/pkg/module.py`.
+"""
+
+from pathlib import Path
+from typing import IO, Callable, Iterable, Iterator, Optional, Sequence, Tuple
+
+from snlcopyright.languages import Language, classifier, select
+
+# Whether a member, given as an open stream and its language, contains the
+# block, and the name of the variant found, if any.
+Search = Callable[[IO[bytes], Language], Tuple[bool, Optional[str]]]
+
+SUFFIXES: Tuple[str, ...] = (
+    ".tar",
+    ".tar.gz",
+    ".tgz",
+    ".tar.bz2",
+    ".tbz2",
+    ".tar.xz",
+    ".txz",
+    ".zip",
+    ".whl",
+)
+
+
+def is_archive(path: Path) -> bool:
+    """Returns True if the file at `path` is named as one of the archives
+    that can be checked, by its suffix."""
+    return str(path).lower().endswith(SUFFIXES)
+
+
+def iter_members(path: Path) -> Iterator[Tuple[str, IO[bytes]]]:
+    """Yields the name and an open binary stream of each regular file in the
+    archive at `path`, in archive order.  Each stream is valid only until the
+    next member is yielded.  Raises OSError, tarfile.TarError or
+    zipfile.BadZipFile for an archive that cannot be read."""
+    import tarfile  # imported only when an archive is checked
+    import zipfile
+
+    name = str(path).lower()
+    if name.endswith((".zip", ".whl")):
+        with zipfile.ZipFile(str(path)) as archive:
+            for info in archive.infolist():
+                if not info.is_dir():
+                    with archive.open(info) as stream:
+                        yield info.filename, stream
+        return
+
+    # `r|*` reads the tar stream in one pass, without seeking back.
+    with tarfile.open(str(path), mode="r|*") as archive:
+        for member in archive:
+            if member.isfile():
+                stream = archive.extractfile(member)
+                if stream is not None:
+                    yield member.name, stream
+
+
+def member_status(
+    path: Path,
+    search: Search,
+    *,
+    languages: Optional[Sequence[str]] = None,
+) -> Iterator[Tuple[str, bool, Optional[str]]]:
+    """Yields the name of each source file in the archive at `path`, whether
+    the copyright block is found in it by `search`, and the name of the
+    variant found, if any.  The source files are those of the `languages`
+    given, or Python only."""
+    classify = classifier(select(languages))
+    for name, stream in iter_members(path):
+        language: Optional[Language] = classify(name.rsplit("/", 1)[-1])
+        if language is not None:
+            yield (name, *search(stream, language))
+
+
+def member_path(path: Path, name: str) -> Path:
+    """Returns the path that names the member `name` of the archive at `path`
+    in reports."""
+    return Path(f"{path}!{name}")
+
+
+def archive_paths(paths: Iterable[Path]) -> Tuple[Path, ...]:
+    """Returns those of the `paths` that are archive files."""
+    return tuple(
+        Path(item) for item in paths if is_archive(item) and Path(item).is_file()
+    )
+
+
+"""
+Copyright 2023 Sandia National Laboratories
+
+Notice: This computer software was prepared by National Technology and Engineering Solutions of
+Sandia, LLC, hereinafter the Contractor, under Contract DE-NA0003525 with the Department of Energy
+(DOE). All rights in the computer software are reserved by DOE on behalf of the United States
+Government and the Contractor as provided in the Contract. You are authorized to use this computer
+software for Governmental purposes but it is not to be released or distributed to the public.
+NEITHER THE U.S. GOVERNMENT NOR THE CONTRACTOR MAKES ANY WARRANTY, EXPRESS OR IMPLIED, OR ASSUMES
+ANY LIABILITY FOR THE USE OF THIS SOFTWARE. This notice including this sentence must appear on any
+copies of this computer software. Export of this data may require a license from the United States
+Government.
+"""
@@ -0,0 +1,130 @@
+"""This module provides an on-disk cache of the copyright status of files.
+
+The cache records, for each file, its size, its modification time, whether the
+copyright text block was found in it, and which variant of the block was
+found, if any; see `matcher.NoticeMatcher`.  A later run reads a file
+again only if its size or modification time has changed.  The cache also
+records a hash of the copyright text block, and of the mode in which files
+were searched, and all entries are dropped when either changes.  Entries
+are keyed by absolute path.  Each run drops the entries of the files under
+the paths it walked that it did not look up, i.e., the files since removed,
+renamed, or no longer processed, and keeps the entries of the other files.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+
+CACHE_VERSION: int = 3  # bump when the on-disk format changes
+
+# Files modified less than this long before the run started are not cached,
+# since a second modification within the same timestamp tick would go unseen.
+RACY_WINDOW_NS: int = 2 * 10**9
+
+
+def notice_digest(text: str, mode: str = "") -> str:
+    """Returns the hash that identifies the copyright text block, and the `mode`
+    in which files were searched for it, in the cache."""
+    return hashlib.sha256((mode + "\0" + text).encode("utf-8")).hexdigest()
+
+
+class StatusCache:
+    """Maps file paths to their copyright status, keyed by the size and the
+    modification time of the file and by the hash of the text block.  The
+    cache may be used by several worker threads at once."""
+
+    def __init__(self, path: Path, notice_text: str, mode: str = ""):
+        self.path = Path(path)
+        self.digest = notice_digest(notice_text, mode)
+        self.entries: Dict[str, List] = {}  # path: [size, mtime_ns, found, variant]
+        self.hits = 0
+        self.misses = 0
+        self._seen: Set[str] = set()  # the paths looked up in this run
+        self._lock = threading.Lock()
+        self._started_ns = time.time_ns()
+
+        try:
+            with open(self.path, mode="r") as fin:
+                data = json.load(fin)
+        except (OSError, ValueError):
+            return  # no cache yet, or an unreadable one: start empty
+
+        if (
+            isinstance(data, dict)
+            and data.get("version") == CACHE_VERSION
+            and data.get("notice") == self.digest
+        ):
+            self.entries = data.get("files", {})
+
+    def lookup(self, path: Path, stat: os.stat_result) -> Optional[bool]:
+        """Returns the cached status of the file at `path`, or None if the file
+        is not in the cache or has changed since it was cached."""
+        name = os.path.abspath(path)
+        entry = self.entries.get(name)
+        hit = entry is not None and entry[:2] == [stat.st_size, stat.st_mtime_ns]
+        with self._lock:
+            self._seen.add(name)
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return bool(entry[2]) if hit else None
+
+    def variant(self, path: Path) -> Optional[str]:
+        """Returns the cached name of the variant found in the file at `path`,
+        if any; see `lookup`."""
+        entry = self.entries.get(os.path.abspath(path))
+        return None if entry is None else entry[3]
+
+    def record(
+        self,
+        path: Path,
+        stat: os.stat_result,
+        found: bool,
+        variant: Optional[str] = None,
+    ) -> None:
+        """Records the status of the file at `path`, as of `stat`, and the name
+        of the `variant` found in it, if any."""
+        name = os.path.abspath(path)
+        if stat.st_mtime_ns >= self._started_ns - RACY_WINDOW_NS:
+            self.entries.pop(name, None)
+            return
+        self.entries[name] = [stat.st_size, stat.st_mtime_ns, found, variant]
+
+    def save(self, roots: Iterable[Path] = ()) -> None:
+        """Writes the cache to disk, replacing the previous cache file, without
+        the entries of the files under the `roots` walked in this run that
+        were not looked up in it."""
+        prefixes = tuple(os.path.join(os.path.abspath(root), "") for root in roots)
+        with self._lock:
+            self.entries = {
+                name: entry
+                for name, entry in self.entries.items()
+                if name in self._seen
+                or not (name.startswith(prefixes) or name + os.sep in prefixes)
+            }
+        data = {"version": CACHE_VERSION, "notice": self.digest, "files": self.entries}
+        path_temp = Path(str(self.path) + ".temp")
+        with open(path_temp, mode="w") as fout:
+            json.dump(data, fout, separators=(",", ":"))
+        os.replace(path_temp, self.path)
+
+
+"""
+Copyright 2023 Sandia National Laboratories
+
+Notice: This computer software was prepared by National Technology and Engineering Solutions of
+Sandia, LLC, hereinafter the Contractor, under Contract DE-NA0003525 with the Department of Energy
+(DOE). All rights in the computer software are reserved by DOE on behalf of the United States
+Government and the Contractor as provided in the Contract. You are authorized to use this computer
+software for Governmental purposes but it is not to be released or distributed to the public.
+NEITHER THE U.S. GOVERNMENT NOR THE CONTRACTOR MAKES ANY WARRANTY, EXPRESS OR IMPLIED, OR ASSUMES
+ANY LIABILITY FOR THE USE OF THIS SOFTWARE. This notice including this sentence must appear on any
+copies of this computer software. Export of this data may require a license from the United States
+Government.
+"""
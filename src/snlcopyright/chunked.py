@@ -0,0 +1,166 @@
+"""This module searches and rewrites files as streams of fixed-size chunks, so
+that the memory used does not grow with the size of the file.
+
+Each chunk starts with the end of the one before it, as many bytes as the
+longest text searched for, less one, so that a match that straddles the
+boundary between two chunks is found too.  A rewrite copies the file through
+one such buffer to a new file, replacing each match on the way; see
+`replace`.  Its memory use is of the order of the chunk size plus the length
+of the copyright block, whatever the size of the file.
+"""
+
+import re
+from typing import IO, AnyStr, Iterator, Optional, Pattern, Sequence, Tuple
+
+CHUNK_SIZE: int = 2**20  # bytes read at a time
+
+# The encoding declaration of a Python file, on its first or second line, as
+# in PEP 263, e.g., `# -*- coding: latin-1 -*-`.
+_COOKIE: Pattern[bytes] = re.compile(rb"[ \t\f]*#.*?coding[:=][ \t]*[-\w.]+")
+_TEXT_COOKIE: Pattern[str] = re.compile(r"[ \t\f]*#.*?coding[:=][ \t]*[-\w.]+")
+
+
+def chunks(
+    stream: IO[bytes], overlap: int = 0, chunk_size: int = CHUNK_SIZE
+) -> Iterator[bytes]:
+    """Yields the contents of the `stream`, `chunk_size` bytes at a time, each
+    chunk after the first starting with the last `overlap` bytes of the one
+    before it."""
+    tail = b""
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            return
+        data = tail + chunk
+        yield data
+        tail = data[-overlap:] if overlap > 0 else b""
+
+
+def contains(
+    stream: IO[bytes], needles: Sequence[bytes], chunk_size: int = CHUNK_SIZE
+) -> bool:
+    """Returns True if any of the `needles` is found in the `stream`, which is
+    read `chunk_size` bytes at a time; see `chunks`."""
+    overlap = max(len(needle) for needle in needles) - 1
+    return any(
+        needle in data
+        for data in chunks(stream, overlap, chunk_size)
+        for needle in needles
+    )
+
+
+def _first(
+    data: bytes, pairs: Sequence[Tuple[bytes, bytes]], start: int
+) -> Tuple[int, Optional[Tuple[bytes, bytes]]]:
+    """Returns the index of the first match in `data` from `start` of any of
+    the old texts of the `pairs`, and the pair, or -1 and None."""
+    best, found = -1, None
+    for pair in pairs:
+        index = data.find(pair[0], start)
+        if index >= 0 and (best < 0 or index < best):
+            best, found = index, pair
+    return best, found
+
+
+def replace(
+    fin: IO[bytes],
+    fout: IO[bytes],
+    pairs: Sequence[Tuple[bytes, bytes]],
+    chunk_size: int = CHUNK_SIZE,
+) -> int:
+    """Copies the stream `fin` to the stream `fout`, replacing each of the old
+    texts of the `pairs` by its new text, and returns the number of texts
+    replaced.  No more than `chunk_size` bytes, plus the longest old text, are
+    held in memory at once."""
+    keep = max(len(old) for old, _ in pairs) - 1  # may start a match
+    count = 0
+    data = b""
+    while True:
+        chunk = fin.read(chunk_size)
+        data += chunk
+        # A match that starts in the last `keep` bytes is left for the next
+        # chunk, since a longer match may start there too.
+        limit = len(data) - keep if chunk else len(data)
+        start = 0
+        while True:
+            index, pair = _first(data, pairs, start)
+            if pair is None or index >= limit:
+                break
+            fout.write(data[start:index])
+            fout.write(pair[1])
+            start = index + len(pair[0])
+            count += 1
+        if not chunk:
+            fout.write(data[start:])
+            return count
+        end = max(start, limit)
+        fout.write(data[start:end])
+        data = data[end:]
+
+
+def header_offset(head: AnyStr) -> int:
+    """Returns the offset in `head`, the start of a file, at which a header
+    is inserted: after a `#!` line, and after a Python encoding declaration,
+    if the file starts with either, or else 0.  The end of `head` ends its
+    last line, e.g., a file that is only a `#!` line."""
+    if isinstance(head, str):
+        newline, shebang, cookie = "\n", "#!", _TEXT_COOKIE
+    else:
+        newline, shebang, cookie = b"\n", b"#!", _COOKIE  # type: ignore
+    offset = 0
+    for number in range(2):
+        end = head.find(newline, offset)  # type: ignore
+        line = head[offset:] if end < 0 else head[offset:end]
+        if not ((number == 0 and line.startswith(shebang)) or cookie.match(line)):  # type: ignore
+            break
+        if end < 0:
+            return len(head)
+        offset = end + 1
+    return offset
+
+
+def with_header(head: AnyStr, block: AnyStr, newline: AnyStr) -> AnyStr:
+    """Returns `head`, the start of a file, with the `block` inserted at the
+    offset given by `header_offset`.  A `#!` line or encoding declaration
+    that ends the file without a line ending is ended with `newline` first."""
+    offset = header_offset(head)
+    if offset and not head[:offset].endswith(newline[-1:]):
+        block = newline + block
+    return head[:offset] + block + head[offset:]
+
+
+def insert(
+    fin: IO[bytes],
+    fout: IO[bytes],
+    block: bytes,
+    chunk_size: int = CHUNK_SIZE,
+    newline: bytes = b"\n",
+) -> None:
+    """Copies the stream `fin` to the stream `fout`, `chunk_size` bytes at a
+    time, with the `block` inserted after the `#!` line and the encoding
+    declaration, if any; see `with_header`.  The first two lines are read
+    whole if the file starts with a comment, which they may be."""
+    head = fin.read(chunk_size)
+    while head.lstrip(b" \t\f").startswith(b"#") and head.count(b"\n") < 2:
+        more = fin.read(chunk_size)
+        if not more:
+            break
+        head += more
+    fout.write(with_header(head, block, newline))
+    for chunk in chunks(fin, 0, chunk_size):
+        fout.write(chunk)
+
+
+"""
+Copyright 2023 Sandia National Laboratories
+
+Notice: This computer software was prepared by National Technology and Engineering Solutions of
+Sandia, LLC, hereinafter the Contractor, under Contract DE-NA0003525 with the Department of Energy
+(DOE). All rights in the computer software are reserved by DOE on behalf of the United States
+Government and the Contractor as provided in the Contract. You are authorized to use this computer
+software for Governmental purposes but it is not to be released or distributed to the public.
+NEITHER THE U.S. GOVERNMENT NOR THE CONTRACTOR MAKES ANY WARRANTY, EXPRESS OR IMPLIED, OR ASSUMES
+ANY LIABILITY FOR THE USE OF THIS SOFTWARE. This notice including this sentence must appear on any
+copies of this computer software. Export of this data may require a license from the United States
+Government.
+"""
@@ -0,0 +1,132 @@
+"""This module is the `snlcopyright` command, which runs one of the other
+commands as a subcommand, e.g.,
+
+    snlcopyright status --check --quiet
+    snlcopyright create --staged
+    snlcopyright version
+
+Only the module of the chosen subcommand is imported, and only once it is
+chosen, so that the command starts quickly, e.g., when a pre-commit hook runs
+it once per batch of files.  This module therefore imports nothing else from
+the package, and no more of the standard library than it needs.
+"""
+
+import importlib
+import sys
+from typing import List, NamedTuple, Optional
+
+
+class Subcommand(NamedTuple):
+    """A subcommand, and the function that runs it, imported on demand."""
+
+    target: str  # `module:function`
+    help: str
+    takes_args: bool = True  # True if the function parses the arguments
+
+
+SUBCOMMANDS = {
+    "create": Subcommand(
+        "snlcopyright.command_line:copyright_cli",
+        "Appends contents of `copyright.txt` to .py files (`copyright`).",
+    ),
+    "delete": Subcommand(
+        "snlcopyright.command_line:copyright_delete_cli",
+        "Deletes contents of `copyright.txt` from .py files (`copyright-delete`).",
+    ),
+    "status": Subcommand(
+        "snlcopyright.command_line:copyright_status_cli",
+        "Shows whether the copyright block is in .py files (`copyright-status`).",
+    ),
+    "watch": Subcommand(
+        "snlcopyright.command_line:copyright_watch_cli",
+        "Serves the live status of .py files to `status` (`copyright-watch`).",
+    ),
+    "show": Subcommand(
+        "snlcopyright.copyright_crud:text_block",
+        "Echos the `copyright.txt` contents (`copyright-show`).",
+        takes_args=False,
+    ),
+    "info": Subcommand(
+        "snlcopyright.about:copyright_info",
+        "Describes the installation details (`copyright-info`).",
+        takes_args=False,
+    ),
+    "version": Subcommand(
+        "snlcopyright.about:copyright_version",
+        "Prints the semantic version of the installation (`copyright-version`).",
+        takes_args=False,
+    ),
+    "commands": Subcommand(
+        "snlcopyright.command_line:commands",
+        "Lists the commands and their options (`commands`).",
+        takes_args=False,
+    ),
+}
+
+
+def usage() -> str:
+    """Returns the help message of the `snlcopyright` command."""
+    lines = [
+        "usage: snlcopyright SUBCOMMAND [ARGUMENTS ...]",
+        "",
+        "subcommands:",
+    ]
+    for name, subcommand in SUBCOMMANDS.items():
+        lines.append(f"  {name:<10} {subcommand.help}")
+    lines += ["", "Run `snlcopyright SUBCOMMAND --help` for the arguments of create,"]
+    lines += ["delete, status, and watch."]
+    return "\n".join(lines)
+
+
+def exit_status(value: object) -> int:
+    """Returns the exit status for the value returned by a subcommand: an int
+    is the status itself, False is 1, and anything else is 0.  A str, e.g.,
+    the version, is printed first."""
+    if isinstance(value, bool):
+        return 0 if value else 1
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        print(value)
+    return 0
+
+
+def main(
+    argv: Optional[List[str]] = None,
+) -> int:  # This is an entry point in pyproject.toml
+    """The `snlcopyright` command.  Runs the subcommand named by the first of
+    the `argv` arguments, which default to the command line, with the rest
+    of them.  Returns the exit status."""
+    args = sys.argv[1:] if argv is None else list(argv)
+    if not args or args[0] in ("-h", "--help"):
+        print(usage())
+        return 0 if args else 2
+
+    name, rest = args[0], args[1:]
+    subcommand = SUBCOMMANDS.get(name)
+    if subcommand is None:
+        print(usage(), file=sys.stderr)
+        print(f"snlcopyright: error: unknown subcommand `{name}`", file=sys.stderr)
+        return 2
+    if rest and not subcommand.takes_args:
+        print(f"snlcopyright: error: `{name}` takes no arguments", file=sys.stderr)
+        return 2
+
+    module_name, _, function_name = subcommand.target.partition(":")
+    function = getattr(importlib.import_module(module_name), function_name)
+    return exit_status(function(rest) if subcommand.takes_args else function())
+
+
+"""
+Copyright 2023 Sandia National Laboratories
+
+Notice: This computer software was prepared by National Technology and Engineering Solutions of
+Sandia, LLC, hereinafter the Contractor, under Contract DE-NA0003525 with the Department of Energy
+(DOE). All rights in the computer software are reserved by DOE on behalf of the United States
+Government and the Contractor as provided in the Contract. You are authorized to use this computer
+software for Governmental purposes but it is not to be released or distributed to the public.
+NEITHER THE U.S. GOVERNMENT NOR THE CONTRACTOR MAKES ANY WARRANTY, EXPRESS OR IMPLIED, OR ASSUMES
+ANY LIABILITY FOR THE USE OF THIS SOFTWARE. This notice including this sentence must appear on any
+copies of this computer software. Export of this data may require a license from the United States
+Government.
+"""
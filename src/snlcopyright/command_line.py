@@ -1,15 +1,29 @@
-import pkg_resources  # part of setup tools
+import argparse
+import contextlib
+import os
+import sys
 from itertools import repeat
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
 
-# from typing import Final
+from snlcopyright import config as cfg
+from snlcopyright import copyright_crud as crud
+from snlcopyright import stats, throttle, vcs
+from snlcopyright.about import copyright_info, copyright_version  # noqa: F401
+from snlcopyright.about import module_name
+from snlcopyright.languages import ALL, LANGUAGES, patterns, select
+from snlcopyright.matcher import NoticeMatcher
+from snlcopyright.report import FORMATS, is_failure, make_report
+from snlcopyright.walk import DEFAULT_EXCLUDES
 
 # Reference:
 # https://setuptools.pypa.io/en/latest/userguide
 
 
-# module_name: Final[str] = "snlcopyright"  # postpone Final until 3.9 is required
-module_name: str = "snlcopyright"  # be D.R.Y.
 underline: str = "".join(repeat("-", len(module_name)))
+CACHE_FILE: str = ".snlcopyright-cache.json"  # default for `--cache`
+SOCKET_FILE: str = ".copyright-watch.sock"  # default for `--socket`, `--daemon`
+JOURNAL_FILE: str = ".snlcopyright-journal.jsonl"  # default for `--journal`
 
 
 def commands() -> bool:  # This is a an entry point in pyproject.toml
@@ -34,41 +48,725 @@ def commands() -> bool:  # This is a an entry point in pyproject.toml
         "copyright-status   Shows whether or not the copyright block was found in a .py file in the cwd, recursively."
     )
     print("copyright-version  Prints the semantic verison of the current installation.")
+    print(
+        "copyright-watch    Serves the copyright status of .py files in the cwd, kept live."
+    )
+    print(
+        "snlcopyright CMD   Runs CMD: create, delete, status, watch, show, info, or version."
+    )
+    print(
+        "Arguments and options for copyright, copyright-delete, and copyright-status:"
+    )
+    print("PATH ...           Files and directories to process (default: the cwd).")
+    print(
+        "                   Archives, e.g., .whl or .tar.gz, are checked, not marked."
+    )
+    print("--paths-from FILE  Processes the paths listed in FILE too, one per line.")
+    print("--changed          Processes only files git reports changed since HEAD.")
+    print("--base REV         Processes only files git reports changed since REV.")
+    print("--staged           Processes only files staged for commit in git.")
+    print("-j N, --jobs N     Processes files with N worker threads (0: one per CPU).")
+    print("-e P, --exclude P  Skips files and directories matching the pattern P.")
+    print("--format F         Writes results as text, json, jsonl, or a summary.")
+    print("-q, --quiet        Writes only files missing the block or in error.")
+    print("--no-gitignore     Does not skip the files listed in .gitignore files.")
+    print("--stats [N]        Writes the time per phase and the N slowest files.")
+    print("--profile FILE     Dumps a cProfile profile of the run to FILE.")
+    print("--bwlimit RATE     Reads and writes at most RATE bytes/s, e.g., 50M.")
+    print("--iops N           Processes at most N files per second.")
+    print("--nice             Runs at low CPU and, on Linux, low I/O priority.")
+    print("--stdin            Filters the standard input to the standard output.")
+    print("--stdin-filename N Names the --stdin file, for its comment style.")
+    print(
+        "-l L, --language L Processes files of language L, e.g., c, or all, in place of Python."
+    )
+    print(
+        "--variant FILE     Also finds the legacy copyright block in FILE (repeatable)."
+    )
+    print("--tolerant         Finds blocks with any whitespace and any years.")
+    print("--config FILE      Takes the blocks and excludes of each subtree from FILE.")
+    print("Options for copyright and copyright-delete:")
+    print("--fsync            Flushes each modified file to disk before moving on.")
+    print("--journal [FILE]   Records the files done in FILE, to resume from.")
+    print("--resume           Skips the files done by an interrupted --journal run.")
+    print("Options for copyright:")
+    print(
+        "--migrate          Replaces the --variant blocks found with `copyright.txt`."
+    )
+    print("--header           Inserts the block at the top, after any #! line.")
+    print("--years            Sets the years of each block from one git log pass.")
+    print("Options for copyright and copyright-status:")
+    print("--window BYTES     Searches only the first and last BYTES of each file.")
+    print("--check            Modifies no files; exits with 1 if any lack the block.")
+    print("Options for copyright-status:")
+    print("--cache [FILE]     Reads only files changed since the last run, per FILE.")
+    print(
+        "--daemon [SOCKET]  Asks the copyright-watch on SOCKET, if any, for the status."
+    )
+    print("Options for copyright-watch:")
+    print("--socket SOCKET    Serves the status on the Unix socket SOCKET.")
+    print("--poll [SECONDS]   Scans every SECONDS, rather than waiting for inotify.")
+    print("--create           Appends the block to new files that lack it.")
+    print("--config FILE      Takes the blocks and excludes of each subtree from FILE.")
 
     return True
 
 
-def copyright_info() -> bool:  # This is a an entry point in pyproject.toml
-    """Echos the installation details and dependencies."""
-    dist_info = pkg_resources.require(module_name)  # distribution information
-    print(f"{module_name} installation details and dependencies:")
+def _parser(description: str) -> argparse.ArgumentParser:
+    """Returns the argument parser shared by the commands that process files."""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        type=Path,
+        metavar="PATH",
+        help="files to process, and directories to process recursively "
+        "(default: the current working directory); archives, e.g., wheels, "
+        "are checked without being extracted or marked",
+    )
+    parser.add_argument(
+        "--paths-from",
+        type=Path,
+        metavar="FILE",
+        help="also process the paths listed in FILE, one per line, e.g., the "
+        "checkouts of many repositories, in one run ('-': the standard input); "
+        "blank lines and lines starting with # are skipped; with more than one "
+        "path, the totals of each are reported too",
+    )
+    parser.add_argument(
+        "--changed",
+        action="store_true",
+        help="process only the files that git reports as changed relative to the "
+        "--base revision, along with untracked files",
+    )
+    parser.add_argument(
+        "--base",
+        metavar="REV",
+        help="the git revision for --changed, e.g., origin/main (default: HEAD); "
+        "implies --changed",
+    )
+    parser.add_argument(
+        "--staged",
+        action="store_true",
+        help="process only the files that are staged for commit in git",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="process files with N worker threads (0: one per CPU, default: 1)",
+    )
+    parser.add_argument(
+        "--format",
+        choices=FORMATS,
+        default="text",
+        help="write the results as text messages (default), as one JSON "
+        "document, as one JSON object per line, or as a summary only",
+    )
+    parser.add_argument(
+        "-q",
+        "--quiet",
+        action="store_true",
+        help="write only the files missing the copyright block or in error",
+    )
+    parser.add_argument(
+        "-e",
+        "--exclude",
+        action="append",
+        default=[],
+        metavar="PATTERN",
+        help="skip files and directories matching the .gitignore-style PATTERN, "
+        "in addition to the default excludes (repeatable)",
+    )
+    parser.add_argument(
+        "--no-gitignore",
+        dest="gitignore",
+        action="store_false",
+        help="do not skip the files listed in .gitignore files",
+    )
+    parser.add_argument(
+        "--stats",
+        nargs="?",
+        const=10,
+        type=int,
+        metavar="N",
+        help="write the counters and the time spent in each phase (walk, read, "
+        "match, write), and the N slowest files (default: 10), to the "
+        "standard error",
+    )
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        metavar="FILE",
+        help="profile the run with cProfile, in the main thread only, and dump "
+        "the profile to FILE, e.g., for `python -m pstats FILE`",
+    )
+    parser.add_argument(
+        "--bwlimit",
+        type=throttle.rate,
+        metavar="RATE",
+        help="read and write at most RATE bytes per second, over all the "
+        "workers, e.g., 512K, 50M, or 1G",
+    )
+    parser.add_argument(
+        "--iops",
+        type=throttle.rate,
+        metavar="N",
+        help="process at most N files per second, over all the workers",
+    )
+    parser.add_argument(
+        "--nice",
+        action="store_true",
+        help="run at a low CPU priority and, on Linux, the lowest best-effort "
+        "I/O priority, as `nice ionice -c 2 -n 7` does",
+    )
+    parser.add_argument(
+        "--stdin",
+        action="store_true",
+        help="process the contents read from the standard input, instead of "
+        "files, and write the result to the standard output",
+    )
+    parser.add_argument(
+        "--stdin-filename",
+        metavar="NAME",
+        help="the name of the file read with --stdin, which selects the "
+        "comment style of its language (default: Python)",
+    )
+    parser.add_argument(
+        "-l",
+        "--language",
+        action="append",
+        default=[],
+        choices=tuple(LANGUAGES) + (ALL,),
+        metavar="NAME",
+        help="process the files of the language NAME, in its comment style, "
+        f"instead of the Python files only (repeatable; `{ALL}` for every "
+        f"language): {', '.join(LANGUAGES)}",
+    )
+    parser.add_argument(
+        "--variant",
+        action="append",
+        default=[],
+        type=Path,
+        metavar="FILE",
+        help="also find the legacy or variant copyright block contained in FILE "
+        "(repeatable)",
+    )
+    parser.add_argument(
+        "--tolerant",
+        action="store_true",
+        help="find the copyright blocks with any whitespace between words and "
+        "with any year or span of years",
+    )
+    _add_config_option(parser)
+    return parser
+
+
+def _add_config_option(parser: argparse.ArgumentParser) -> None:
+    """Adds the `--config` option to the commands that select the block of
+    each file."""
+    parser.add_argument(
+        "--config",
+        type=Path,
+        metavar="FILE",
+        help="take the copyright block of each subtree, and the subtrees to "
+        "leave out, from the rules in FILE, a YAML file or a pyproject.toml "
+        f"file (default: {cfg.CONFIG_FILE}, or a pyproject.toml file with a "
+        "[tool.snlcopyright] table, in the directory of each path or the "
+        "nearest of its parents, up to the root of its repository, if any)",
+    )
+
 
-    da = dist_info[0]  # distribution attributes of the module
+def _add_window_option(parser: argparse.ArgumentParser) -> None:
+    """Adds the `--window` option to the commands that search for the block."""
+    parser.add_argument(
+        "--window",
+        type=int,
+        metavar="BYTES",
+        help="search only the first and the last BYTES of each file for the "
+        "copyright block, instead of the whole file",
+    )
 
-    print(f"module name: {da.project_name}")
-    print(f"location: {da.location}")
-    print(f"version: {da.version}")
 
-    def project_attribute(attribute):
-        return attribute.project_name.lower()
+def _add_fsync_option(parser: argparse.ArgumentParser) -> None:
+    """Adds the `--fsync` option to the commands that modify files."""
+    parser.add_argument(
+        "--fsync",
+        action="store_true",
+        help="flush each modified file to disk before moving on",
+    )
 
-    # Now sort the dist_info list in place
-    dist_info.sort(key=project_attribute)  # TODO: sort appears to be deprecated
 
-    print("full stack:")
-    for item in dist_info:
-        print(f"- {item}")
+def _add_journal_options(parser: argparse.ArgumentParser) -> None:
+    """Adds the `--journal` and `--resume` options to the commands that modify
+    files."""
+    parser.add_argument(
+        "--journal",
+        nargs="?",
+        const=Path(JOURNAL_FILE),
+        type=Path,
+        metavar="FILE",
+        help="record the files done in FILE as the run proceeds (default: "
+        f"{JOURNAL_FILE}), so that an interrupted run can be resumed; FILE "
+        "is removed when the run completes",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="skip the files done by the interrupted run recorded in the "
+        "--journal, and remove the temporary .snlcopyright-*.temp files it "
+        "left behind",
+    )
+
+
+def _journal(args: argparse.Namespace) -> Dict[str, Any]:
+    """Returns the keyword arguments for the `--journal` and `--resume`
+    options, where `--resume` implies the default `--journal`."""
+    journal = args.journal
+    if journal is None and args.resume:
+        journal = Path(JOURNAL_FILE)
+    return dict(journal=journal, resume=args.resume)
+
+
+def _add_check_option(parser: argparse.ArgumentParser) -> None:
+    """Adds the `--check` option to the commands that search for the block."""
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="modify no files, and exit with status 1 if any file is missing "
+        "the copyright block",
+    )
+
+
+def _changed_files(
+    parser: argparse.ArgumentParser,
+    args: argparse.Namespace,
+    paths: Optional[List[Path]],
+    languages: Optional[List[str]],
+) -> List[Path]:
+    """Returns the files that git reports as changed within the `paths`, or
+    the current directory, each asked of the repository that contains it, so
+    that roots in different repositories are each compared to their own
+    HEAD, or `--base` revision."""
+    roots = [item.resolve() for item in paths or [Path.cwd()]]
+    by_repo: Dict[Path, List[Path]] = {}  # the roots within each repository
+    try:
+        for root in roots:
+            directory = root if root.is_dir() else root.parent
+            by_repo.setdefault(vcs.git_root(directory), []).append(root)
+        changed: List[Path] = []
+        for repo, repo_roots in by_repo.items():
+            changed.extend(
+                item
+                for item in vcs.changed_files(
+                    repo,
+                    base=args.base,
+                    staged=args.staged,
+                    suffixes=patterns(select(languages)),
+                )
+                if any(root == item or root in item.parents for root in repo_roots)
+            )
+    except RuntimeError as error:
+        parser.error(str(error))
+        raise  # not reached, parser.error exits
+    return changed
 
-    return True
 
+def _options(
+    parser: argparse.ArgumentParser,
+    args: argparse.Namespace,
+    only_found: bool = False,
+) -> Dict[str, Any]:
+    """Returns the keyword arguments that select and walk the files to process,
+    and report the results."""
+    paths = roots = args.paths + _paths_from(parser, args.paths_from) or None
+    languages = args.language or None
+    if args.staged or args.changed or args.base is not None:
+        paths = _changed_files(parser, args, paths, languages)
+
+    return dict(
+        languages=languages,
+        matcher=_matcher(parser, args),
+        config=_config(parser, args, roots),
+        paths=paths,
+        jobs=_jobs(args.jobs),
+        exclude=DEFAULT_EXCLUDES + tuple(args.exclude),
+        gitignore=args.gitignore,
+        report=make_report(
+            args.format, quiet=args.quiet, only_found=only_found, roots=roots
+        ),
+    )
+
+
+def _paths_from(
+    parser: argparse.ArgumentParser, manifest: Optional[Path]
+) -> List[Path]:
+    """Returns the paths listed in the `manifest` file, if any, one per line,
+    skipping blank lines and comments."""
+    if manifest is None:
+        return []
+    try:
+        if str(manifest) == "-":
+            lines = sys.stdin.read().splitlines()
+        else:
+            lines = manifest.read_text().splitlines()
+    except OSError as error:
+        parser.error(str(error))
+    return [
+        Path(line.strip())
+        for line in lines
+        if line.strip() and not line.lstrip().startswith("#")
+    ]
+
+
+def _matcher(
+    parser: argparse.ArgumentParser, args: argparse.Namespace
+) -> Optional[NoticeMatcher]:
+    """Returns the matcher for the `--variant` and `--tolerant` options, if any
+    of them is given."""
+    if not (args.variant or args.tolerant):
+        return None
+    try:
+        return NoticeMatcher.from_files(
+            crud.notice_template().text, args.variant, tolerant=args.tolerant
+        )
+    except OSError as error:
+        parser.error(str(error))
+        raise  # not reached, parser.error exits
+
+
+def _config(
+    parser: argparse.ArgumentParser,
+    args: argparse.Namespace,
+    paths: Optional[List[Path]] = None,
+) -> Optional[cfg.NoticeIndex]:
+    """Returns the index of the blocks of each subtree, from the `--config`
+    file, or else from the ones found for the `paths`, by default the current
+    working directory, if any; see `config.find_config`."""
+    try:
+        if args.config is not None:
+            return cfg.load_config(args.config)
+        return cfg.find_configs(paths or [Path.cwd()])
+    except (OSError, ValueError) as error:
+        parser.error(str(error))
+        raise  # not reached, parser.error exits
+
+
+def _years(
+    parser: argparse.ArgumentParser,
+    args: argparse.Namespace,
+    paths: Optional[List[Path]],
+) -> vcs.FileYears:
+    """Returns the years in which each file under the `paths`, by default the
+    current working directory, was changed, as of the git history."""
+    try:
+        return vcs.FileYears(paths or [Path.cwd()])
+    except RuntimeError as error:
+        parser.error(str(error))
+        raise  # not reached, parser.error exits
+
+
+def _filter_stdin(
+    parser: argparse.ArgumentParser,
+    args: argparse.Namespace,
+    operation: str,
+    migrate: bool = False,
+    header: bool = False,
+) -> int:
+    """Performs the `operation` on the contents of the standard input, writes
+    the new contents, or the same contents for status, to the standard output,
+    and the result to the standard error.  Returns the exit status."""
+    selected = args.paths or args.paths_from or args.changed or args.staged
+    if selected or args.base is not None:
+        parser.error(
+            "--stdin takes no PATH, --paths-from, --changed, --base, or --staged"
+        )
+
+    contents = sys.stdin.buffer.read()
+    result = crud.process_buffer(
+        contents,
+        operation,
+        matcher=_matcher(parser, args),
+        migrate=migrate,
+        header=header,
+        filename=args.stdin_filename,
+    )
+    sys.stdout.buffer.write(result.contents)
+    sys.stdout.flush()
+
+    file_result = crud.FileResult(
+        path=Path(args.stdin_filename or "<stdin>"),
+        found=result.found,
+        action=result.action,
+        variant=result.variant,
+    )
+    if not args.quiet or is_failure(file_result):
+        crud.print_result(file_result, file=sys.stderr)
+
+    check = getattr(args, "check", False)
+    return 1 if check and not result.found else 0
+
+
+def _run(args: argparse.Namespace, command: Callable[..., bool], **kwargs) -> bool:
+    """Runs the `command` with the keyword arguments, recording the `--stats`
+    and the `--profile`, and within the `--bwlimit` and `--iops` limits, at the
+    `--nice` priority, if asked for.  Returns what the command returns."""
+    recorder = None if args.stats is None else stats.Stats(slowest=args.stats)
+    limits = None
+    if args.bwlimit is not None or args.iops is not None:
+        limits = throttle.Throttle(
+            bytes_per_second=args.bwlimit, files_per_second=args.iops
+        )
+    if args.nice:
+        throttle.lower_priority()  # before the worker threads are started
+    profiler = None
+    if args.profile is not None:
+        import cProfile  # only when asked for, to keep the startup fast
+
+        profiler = cProfile.Profile()
+
+    with contextlib.ExitStack() as stack:
+        if recorder is not None:
+            stack.enter_context(stats.recording(recorder))
+        if limits is not None:
+            stack.enter_context(throttle.throttling(limits))
+        if profiler is not None:
+            profiler.enable()
+            stack.callback(profiler.dump_stats, str(args.profile))
+            stack.callback(profiler.disable)
+        success = command(**kwargs)
+
+    if recorder is not None:
+        for line in recorder.lines():
+            print(line, file=sys.stderr)
+    return success
+
+
+def _jobs(jobs: int) -> int:
+    """Resolves the `--jobs` option, where 0 means one worker per CPU."""
+    return (os.cpu_count() or 1) if jobs == 0 else max(jobs, 1)
+
+
+def copyright_cli(argv: Optional[List[str]] = None) -> int:
+    """The `copyright` command.  Returns the exit status."""
+    description = (
+        "Appends contents of `copyright.txt` to .py files in the cwd, recursively."
+    )
+    parser = _parser(description)
+    _add_window_option(parser)
+    _add_fsync_option(parser)
+    _add_journal_options(parser)
+    _add_check_option(parser)
+    parser.add_argument(
+        "--migrate",
+        action="store_true",
+        help="replace the --variant blocks found with the contents of "
+        "`copyright.txt`, instead of leaving those files unmarked",
+    )
+    parser.add_argument(
+        "--header",
+        action="store_true",
+        help="insert the block at the top of each file, after any #! line and "
+        "encoding declaration, instead of appending it",
+    )
+    parser.add_argument(
+        "--years",
+        action="store_true",
+        help="mark each file with the years in which it was changed, e.g., "
+        "2019-2026, read from the local git history in one pass, replacing "
+        "the block found with other years; files changed since the last "
+        "commit were changed this year, and files not in git are left as "
+        "they are",
+    )
+    args = parser.parse_args(argv)
+    if args.stdin:
+        op = crud.Operation()
+        operation = op.status if args.check else op.create
+        return _filter_stdin(
+            parser, args, operation, migrate=args.migrate, header=args.header
+        )
+    options = _options(parser, args)
+    success = _run(
+        args,
+        crud.copyright,
+        window=args.window,
+        fsync=args.fsync,
+        check=args.check,
+        migrate=args.migrate,
+        header=args.header,
+        years=_years(parser, args, options["paths"]) if args.years else None,
+        **_journal(args),
+        **options,
+    )
+    return 0 if success else 1
+
+
+def copyright_delete_cli(argv: Optional[List[str]] = None) -> int:
+    """The `copyright-delete` command.  Returns the exit status."""
+    description = (
+        "Deletes contents of `copyright.txt` from .py files in cwd, recursively."
+    )
+    parser = _parser(description)
+    _add_fsync_option(parser)
+    _add_journal_options(parser)
+    args = parser.parse_args(argv)
+    if args.stdin:
+        return _filter_stdin(parser, args, crud.Operation().delete)
+    options = _options(parser, args, only_found=True)
+    options.update(_journal(args))
+    success = _run(args, crud.copyright_delete, fsync=args.fsync, **options)
+    return 0 if success else 1
+
+
+def copyright_status_cli(argv: Optional[List[str]] = None) -> int:
+    """The `copyright-status` command.  Returns the exit status."""
+    description = "Shows whether or not the copyright block was found in a .py file in the cwd, recursively."
+    parser = _parser(description)
+    parser.add_argument(
+        "--cache",
+        nargs="?",
+        const=CACHE_FILE,
+        type=Path,
+        metavar="FILE",
+        help="read only the files changed since the last run, remembering the "
+        f"status of each file in FILE (default: {CACHE_FILE})",
+    )
+    parser.add_argument(
+        "--daemon",
+        nargs="?",
+        const=Path(SOCKET_FILE),
+        type=Path,
+        metavar="SOCKET",
+        help="take the status from the copyright-watch process serving on the "
+        f"Unix socket SOCKET (default: {SOCKET_FILE}), rather than reading the "
+        "files, if it answers",
+    )
+    _add_window_option(parser)
+    _add_check_option(parser)
+    args = parser.parse_args(argv)
+    if args.stdin:
+        return _filter_stdin(parser, args, crud.Operation().status)
+    success = _run(
+        args,
+        crud.copyright_status,
+        cache=args.cache,
+        window=args.window,
+        check=args.check,
+        daemon=args.daemon,
+        **_options(parser, args),
+    )
+    return 0 if success else 1
+
+
+def copyright_watch_cli(argv: Optional[List[str]] = None) -> int:
+    """The `copyright-watch` command.  Returns the exit status."""
+    description = (
+        "Watches the .py files in the cwd, recursively, and serves the status "
+        "of the copyright block in each to `copyright-status --daemon`."
+    )
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        type=Path,
+        metavar="DIRECTORY",
+        help="directories to watch recursively (default: the current working "
+        "directory)",
+    )
+    parser.add_argument(
+        "--socket",
+        type=Path,
+        default=Path(SOCKET_FILE),
+        metavar="SOCKET",
+        help=f"the Unix socket to serve the status on (default: {SOCKET_FILE})",
+    )
+    parser.add_argument(
+        "--poll",
+        nargs="?",
+        const=2.0,
+        type=float,
+        metavar="SECONDS",
+        help="scan every directory every SECONDS (default: 2), rather than "
+        "waiting for inotify to report changes",
+    )
+    parser.add_argument(
+        "--create",
+        action="store_true",
+        help="append the copyright block to each new file that lacks it",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="process files with N worker threads (0: one per CPU, default: 1)",
+    )
+    parser.add_argument(
+        "-e",
+        "--exclude",
+        action="append",
+        default=[],
+        metavar="PATTERN",
+        help="skip files and directories matching the .gitignore-style PATTERN, "
+        "in addition to the default excludes (repeatable)",
+    )
+    parser.add_argument(
+        "--no-gitignore",
+        dest="gitignore",
+        action="store_false",
+        help="do not skip the files listed in .gitignore files",
+    )
+    parser.add_argument(
+        "-l",
+        "--language",
+        action="append",
+        default=[],
+        choices=tuple(LANGUAGES) + (ALL,),
+        metavar="NAME",
+        help="watch the files of the language NAME instead of the Python "
+        f"files only (repeatable; `{ALL}` for every language)",
+    )
+    parser.add_argument(
+        "--variant",
+        action="append",
+        default=[],
+        type=Path,
+        metavar="FILE",
+        help="also find the legacy or variant copyright block contained in FILE "
+        "(repeatable)",
+    )
+    parser.add_argument(
+        "--tolerant",
+        action="store_true",
+        help="find the copyright blocks with any whitespace between words and "
+        "with any year or span of years",
+    )
+    _add_config_option(parser)
+    _add_fsync_option(parser)
+    args = parser.parse_args(argv)
 
-def copyright_version() -> str:  # This is a an entry point in pyproject.toml
-    """Echos version details of the copyright module."""
-    da = pkg_resources.require(module_name)[0]  # dist_info_distribution
+    from snlcopyright import watch  # only here: Unix sockets, ctypes
 
-    print(f"{module_name} version:")
-    ver = da.version
-    return ver
+    try:
+        success = watch.watch(
+            args.paths or None,
+            socket_path=args.socket,
+            poll=args.poll,
+            languages=args.language or None,
+            exclude=DEFAULT_EXCLUDES + tuple(args.exclude),
+            gitignore=args.gitignore,
+            matcher=_matcher(parser, args),
+            config=_config(parser, args, args.paths),
+            create=args.create,
+            fsync=args.fsync,
+            jobs=_jobs(args.jobs),
+        )
+    except OSError as error:
+        parser.error(str(error))
+    return 0 if success else 1
 
 
 """
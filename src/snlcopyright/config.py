@@ -0,0 +1,330 @@
+"""This module reads the configuration that gives different subtrees different
+copyright text blocks, or leaves them out, e.g., for other contract numbers,
+other years, or third-party code.
+
+The configuration is read from a `.snlcopyright.yml` file, or from the
+`[tool.snlcopyright]` table of a `pyproject.toml` file, found in the
+directory of the files or the nearest of its parents, up to the root of its
+repository, as git and black find theirs, e.g.,
+
+    notice: copyright.txt          # the default block (default: the bundled one)
+    rules:
+      - path: vendor               # a directory prefix: every file under it
+        exclude: true
+      - path: src/legacy
+        notice: notices/legacy.txt
+      - path: "**/*_pb2.py"        # a glob, as in `.gitignore` files
+        exclude: true
+
+The paths of the rules and of the notices are relative to the directory of
+the configuration file.  The last rule that matches a file applies to it, as
+in `.gitignore` files, and a file that no rule matches takes the default
+block.
+
+The rules are compiled into a trie keyed by path components, with each glob
+attached to the node of the components before its first wildcard, so that
+the block of a file is resolved in time proportional to the depth of its
+path rather than to the number of rules.  Each `copyright.txt` file is
+loaded once; see `copyright_crud.notice_template`.
+"""
+
+import hashlib
+import importlib.util
+import os
+import re
+from pathlib import Path
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Pattern,
+    Sequence,
+    Tuple,
+)
+
+from snlcopyright.copyright_crud import NoticeTemplate, notice_template
+from snlcopyright.walk import glob_regex
+
+CONFIG_FILE: str = ".snlcopyright.yml"
+PYPROJECT_FILE: str = "pyproject.toml"
+GLOB_CHARS: str = "*?["
+VCS_DIRS: Tuple[str, ...] = (".git", ".hg")  # where the search for a config ends
+
+# The header of the `[tool.snlcopyright]` table, or of one of its subtables.
+TOOL_TABLE: Pattern = re.compile(r"^\s*\[\[?\s*tool\.snlcopyright\s*[\].]", re.M)
+
+
+class Rule(NamedTuple):
+    """One compiled rule of the configuration."""
+
+    order: int  # the position of the rule: the last rule that matches applies
+    notice: Optional[NoticeTemplate]  # None to leave the files out
+
+
+class _Node:
+    """One path component in the trie of the rules."""
+
+    __slots__ = ("children", "rule", "globs")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        self.rule: Optional[Rule] = None  # for the path ending here, and below
+        self.globs: List[Tuple[Pattern, Rule]] = []  # for the paths below
+
+
+class NoticeIndex:
+    """Maps the files under the directory `base` to the copyright text block
+    of the last of the `rules` that matches each, given as a path or glob
+    and a NoticeTemplate, or None to leave the files out, or else to the
+    `default` block, if any."""
+
+    def __init__(
+        self,
+        base: Path,
+        rules: Sequence[Tuple[str, Optional[NoticeTemplate]]] = (),
+        default: Optional[NoticeTemplate] = None,
+    ):
+        self.base = os.path.abspath(str(base))
+        self.default = default
+        self.notices: List[NoticeTemplate] = []  # each block, once
+        self._root = _Node()
+        hasher = hashlib.sha256(b"" if default is None else default.text.encode())
+        for template in [default] + [notice for _, notice in rules]:
+            if template is not None and template not in self.notices:
+                self.notices.append(template)
+        for order, (pattern, notice) in enumerate(rules):
+            self._add(pattern, Rule(order=order, notice=notice))
+            text = "\0exclude" if notice is None else "\0notice\0" + notice.text
+            hasher.update(("\0" + pattern + text).encode("utf-8"))
+        self._digest = hasher.hexdigest()
+
+    def _add(self, pattern: str, rule: Rule) -> None:
+        """Adds the `rule` for the path or glob `pattern` to the trie."""
+        parts = [part for part in pattern.strip().split("/") if part not in ("", ".")]
+        node = self._root
+        for ii, part in enumerate(parts):
+            if any(char in part for char in GLOB_CHARS):
+                # A glob matches a file, or any path below a directory.
+                regex = re.compile(glob_regex("/".join(parts[ii:])) + r"(?:/.*)?\Z")
+                node.globs.append((regex, rule))
+                return
+            node = node.children.setdefault(part, _Node())
+        node.rule = rule
+
+    def digest(self) -> str:
+        """Returns a hash that identifies the rules and their blocks, e.g.,
+        for the mode of a status cache."""
+        return self._digest
+
+    def resolve(
+        self, path: Path, default: Optional[NoticeTemplate] = None
+    ) -> Optional[NoticeTemplate]:
+        """Returns the copyright text block for the file at `path`, or None if
+        the file is left out.  A file that no rule matches, including one
+        outside the `base` directory, takes the default block of the index,
+        if any, or else the given `default`."""
+        fallback = default if self.default is None else self.default
+        relative = os.path.relpath(str(path), self.base)
+        if relative == os.pardir or relative.startswith(os.pardir + os.sep):
+            return fallback
+        parts = [] if relative == os.curdir else relative.split(os.sep)
+
+        node = self._root
+        best = node.rule
+        for depth, part in enumerate(parts):
+            for regex, rule in node.globs:
+                if best is None or rule.order > best.order:
+                    if regex.match("/".join(parts[depth:])):
+                        best = rule
+            child = node.children.get(part)
+            if child is None:
+                break
+            node = child
+            if node.rule is not None:
+                if best is None or node.rule.order > best.order:
+                    best = node.rule
+
+        return fallback if best is None else best.notice
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], base: Path) -> "NoticeIndex":
+        """Returns the NoticeIndex of the configuration `data` read from a file
+        in the directory `base`; see the module documentation.  Raises
+        ValueError if the configuration is not valid, and OSError if one of
+        its `copyright.txt` files cannot be read."""
+        if not isinstance(data, dict):
+            raise ValueError("Error: the configuration is not a table.")
+        base = Path(base)
+        default = None
+        if data.get("notice") is not None:
+            default = notice_template(base.joinpath(str(data["notice"])))
+
+        rules: List[Tuple[str, Optional[NoticeTemplate]]] = []
+        for item in data.get("rules") or []:
+            if not isinstance(item, dict) or not isinstance(item.get("path"), str):
+                raise ValueError(f"Error: the rule `{item}` has no `path`.")
+            if item.get("exclude"):
+                rules.append((item["path"], None))
+            elif item.get("notice") is not None:
+                notice = notice_template(base.joinpath(str(item["notice"])))
+                rules.append((item["path"], notice))
+            else:
+                raise ValueError(
+                    f"Error: the rule for `{item['path']}` has neither a "
+                    "`notice` nor `exclude: true`."
+                )
+        return cls(base, rules, default=default)
+
+
+class NoticeIndexes(NoticeIndex):
+    """Maps each file to the copyright text block given by the one of the
+    `indexes` with the deepest `base` directory that contains it, e.g., for
+    the configurations of several repositories processed in one run, or else
+    to the given default block."""
+
+    def __init__(self, indexes: Sequence[NoticeIndex]):
+        self.base = os.path.commonpath([index.base for index in indexes])
+        self.default = None
+        self.notices = []
+        for index in indexes:
+            self.notices.extend(
+                item for item in index.notices if item not in self.notices
+            )
+        self._indexes = [  # deepest first, each with its base as a prefix
+            (os.path.join(index.base, ""), index)
+            for index in sorted(indexes, key=lambda index: -len(index.base))
+        ]
+        hasher = hashlib.sha256()
+        for index in indexes:
+            hasher.update(("\0" + index.base + "\0" + index.digest()).encode("utf-8"))
+        self._digest = hasher.hexdigest()
+
+    def resolve(
+        self, path: Path, default: Optional[NoticeTemplate] = None
+    ) -> Optional[NoticeTemplate]:
+        """Returns the copyright text block for the file at `path`, or None if
+        the file is left out; see `NoticeIndex.resolve`."""
+        path = os.path.abspath(str(path))
+        for prefix, index in self._indexes:
+            if path == index.base or path.startswith(prefix):
+                return index.resolve(Path(path), default)
+        return default
+
+
+def find_config(directory: Path) -> Optional[Path]:
+    """Returns the configuration file of the files in the `directory`: the
+    `.snlcopyright.yml` file, or else the `pyproject.toml` file with a
+    `[tool.snlcopyright]` table, in the `directory` or in the nearest of its
+    parents that has one, up to the root of its repository, if any.  A
+    `pyproject.toml` file is passed over if neither `tomllib` nor `tomli` is
+    available to read it."""
+    directory = Path(os.path.abspath(str(directory)))
+    for item in [directory, *directory.parents]:
+        path = _config_in(item)
+        if path is not None:
+            return path
+        if any(item.joinpath(name).exists() for name in VCS_DIRS):
+            return None
+    return None
+
+
+def find_configs(paths: Iterable[Path]) -> Optional[NoticeIndex]:
+    """Returns the index of the configuration files found for the `paths`,
+    each from the directory of the path, or of the file, with each file
+    loaded once, or None if none is found; see `find_config`."""
+    found: Dict[str, Optional[Path]] = {}  # by directory
+    indexes: Dict[Path, NoticeIndex] = {}
+    for path in paths:
+        directory = os.path.abspath(str(path))
+        if not os.path.isdir(directory):
+            directory = os.path.dirname(directory)
+        if directory not in found:
+            found[directory] = find_config(Path(directory))
+        config = found[directory]
+        if config is not None and config not in indexes:
+            indexes[config] = load_config(config)
+    if not indexes:
+        return None
+    if len(indexes) == 1:
+        return next(iter(indexes.values()))
+    return NoticeIndexes(list(indexes.values()))
+
+
+def _config_in(directory: Path) -> Optional[Path]:
+    """Returns the `.snlcopyright.yml` file in the `directory`, if any, or
+    else its `pyproject.toml` file, if it has a `[tool.snlcopyright]` table
+    and can be read."""
+    path = directory.joinpath(CONFIG_FILE)
+    if path.is_file():
+        return path
+    path = directory.joinpath(PYPROJECT_FILE)
+    try:
+        with open(path, mode="r") as fin:
+            text = fin.read()
+    except (OSError, UnicodeDecodeError):
+        return None
+    if not TOOL_TABLE.search(text) or not _has_toml():
+        return None
+    return path
+
+
+def load_config(path: Path) -> NoticeIndex:
+    """Returns the NoticeIndex of the configuration file at `path`, either a
+    `pyproject.toml` file, read with `tomllib`, or `tomli` before Python
+    3.11, or else a YAML file; see `NoticeIndex.from_dict`."""
+    path = Path(path)
+    if path.name == PYPROJECT_FILE:
+        data = _read_toml(path).get("tool", {}).get("snlcopyright")
+        if data is None:
+            raise ValueError(f"Error: `{path}` has no [tool.snlcopyright] table.")
+    else:
+        import yaml  # only when a configuration file is found
+
+        with open(path, mode="r") as fin:
+            try:
+                data = yaml.safe_load(fin) or {}
+            except yaml.YAMLError as error:
+                raise ValueError(f"Error: `{path}` is not valid YAML: {error}")
+    return NoticeIndex.from_dict(data, base=path.parent)
+
+
+def _has_toml() -> bool:
+    """Returns whether a TOML parser, `tomllib` or `tomli`, is available."""
+    return any(importlib.util.find_spec(name) for name in ("tomllib", "tomli"))
+
+
+def _read_toml(path: Path) -> Dict[str, Any]:
+    """Returns the contents of the TOML file at `path`."""
+    try:
+        import tomllib  # type: ignore  # Python 3.11 and later
+    except ImportError:
+        try:
+            import tomli as tomllib  # type: ignore
+        except ImportError:
+            raise ValueError(
+                f"Error: reading `{path}` needs Python 3.11 or later, or the "
+                "`tomli` package."
+            )
+    with open(path, mode="rb") as fin:
+        try:
+            return tomllib.load(fin)
+        except tomllib.TOMLDecodeError as error:
+            raise ValueError(f"Error: `{path}` is not valid TOML: {error}")
+
+
+"""
+Copyright 2023 Sandia National Laboratories
+
+Notice: This computer software was prepared by National Technology and Engineering Solutions of
+Sandia, LLC, hereinafter the Contractor, under Contract DE-NA0003525 with the Department of Energy
+(DOE). All rights in the computer software are reserved by DOE on behalf of the United States
+Government and the Contractor as provided in the Contract. You are authorized to use this computer
+software for Governmental purposes but it is not to be released or distributed to the public.
+NEITHER THE U.S. GOVERNMENT NOR THE CONTRACTOR MAKES ANY WARRANTY, EXPRESS OR IMPLIED, OR ASSUMES
+ANY LIABILITY FOR THE USE OF THIS SOFTWARE. This notice including this sentence must appear on any
+copies of this computer software. Export of this data may require a license from the United States
+Government.
+"""
@@ -1,8 +1,57 @@
 """This module provides Sandia National Laboratories copyright assertion functionality."""
 
+import contextlib
+import glob
+import os
+import re
+import tempfile
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from itertools import chain
 from pathlib import Path
-from shutil import copyfile
-from typing import List, NamedTuple
+from stat import S_IMODE
+from typing import (
+    Any,
+    AnyStr,
+    BinaryIO,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    TextIO,
+    Tuple,
+    TYPE_CHECKING,
+)
+
+from snlcopyright import archive, chunked, stats, throttle
+from snlcopyright.cache import StatusCache
+from snlcopyright.matcher import CURRENT, NoticeMatcher, Variant, with_years
+from snlcopyright.languages import PYTHON, Language, classifier, language_of
+from snlcopyright.languages import needles, render, select
+from snlcopyright.walk import DEFAULT_EXCLUDES, iter_modules, iter_sources
+
+if TYPE_CHECKING:
+    from snlcopyright.config import NoticeIndex
+    from snlcopyright.dedupe import ContentMemo
+    from snlcopyright.journal import Journal
+    from snlcopyright.report import Report
+    from snlcopyright.vcs import FileYears
+
+# Files larger than this many bytes are searched and rewritten a chunk at a
+# time, rather than held in memory whole; see `chunked`.
+STREAM_SIZE: int = 2**24
+
+# The name of a temporary file written by `_replacing`,
+# `.snlcopyright-<name>.<random>.temp`, which no other tool writes.
+TEMP_PREFIX: str = ".snlcopyright-"
+TEMP_NAME = re.compile(re.escape(TEMP_PREFIX) + r".+\.[a-z0-9_]{8}\.temp\Z")
 
 
 """
@@ -35,188 +84,1782 @@ class FoundString(NamedTuple):
     not_found: str = "copyright was not found"
 
 
-def text_block() -> str:  # This is a an entry point in pyproject.toml
-    """The copyright.txt file is the one and only place for definition of
-    the Sandia National Laboratories copyright test block.
-    Updates to the test block should be directly to the copyright.txt file.
+class Operation(NamedTuple):
+    """Define the operations that `process_file` performs on a file."""
 
-    The copyright assertion block exists as a stand-alone text file
-    named `copyright.txt` and located in the same path as this module.
+    status: str = "status"  # read: is the copyright block present
+    create: str = "create"  # append the copyright block, if absent
+    update: str = "update"  # replace the copyright block with a new one
+    delete: str = "delete"  # remove the copyright block
 
-    When used from the command line via an entry point, this function will
-    read the contents of the copyright.txt file and echo it to the terminal
+
+class Action(NamedTuple):
+    """Define the action that `process_file` took on a file."""
+
+    created: str = "created"
+    updated: str = "updated"
+    deleted: str = "deleted"
+    unchanged: str = "unchanged"
+    error: str = "error"
+
+
+class FileResult(NamedTuple):
+    """The result of one operation on one file; see `process_file`."""
+
+    path: Path
+    found: bool  # True if the copyright block was found, before any change
+    action: str  # one of the `Action` strings
+    error: Optional[Exception] = None  # the error, if the action is `error`
+    variant: Optional[str] = None  # the variant found, if a matcher was used
+
+
+class BufferResult(NamedTuple):
+    """The result of one operation on the contents of one file held in memory;
+    see `process_buffer`."""
+
+    contents: Any  # the new contents, as `str` or `bytes` like the old ones
+    found: bool  # True if the copyright block was found, before any change
+    action: str  # one of the `Action` strings
+    variant: Optional[str] = None  # the variant found, if a matcher was used
+
+
+class NoticeTemplate(NamedTuple):
+    """The copyright text block as loaded from a `copyright.txt` file.
+
+    A NoticeTemplate is read and validated once, then handed to each of the
+    CRUD functions, so that checking many files does not re-read the
+    `copyright.txt` file once per file.
     """
 
-    # Default to error, unless a successful file read overwrites contents.
-    contents = "Error: The `copyright.txt` file could not be read."
+    text: str  # the copyright text block
+    source: Path  # the file the text block was read from
+    mtime_ns: int  # modification time of `source` at the time of reading
 
-    ff = Path(__file__).parent.joinpath("copyright.txt")
-    with open(str(ff), mode="r") as fin:
-        contents = fin.read()  # overwrite if successful
 
-    return contents
+# One NoticeTemplate per source file, loaded on first use in this process.
+_notice_templates: Dict[Path, NoticeTemplate] = {}
 
 
-def modules_list(path: Path) -> List[Path]:
-    """Finds all Python files in the given path and in all subdirectories."""
+def notice_path() -> Path:
+    """Returns the path to the `copyright.txt` file bundled with this module."""
+    return Path(__file__).parent.joinpath("copyright.txt")
 
-    # Reference: https://docs.python.org/3/library/pathlib.html#pathlib.Path.glob
-    # Patterns are the same as for fnmatch, with the addition of "**" which
-    # means "this directory and all subdirectories, recursively". In other words,
-    # it enables recursive globbing.
-    return list(path.glob("**/*.py"))
 
+def notice_template(
+    path: Optional[Path] = None, *, check_mtime: bool = False
+) -> NoticeTemplate:
+    """Returns the NoticeTemplate for the `copyright.txt` file at `path`,
+    defaulting to the file bundled with this module.
 
-def copyright_exists(path: Path) -> bool:
-    """Given a single python file as a Path, returns True if the copyright
-    block is contained in the Python file, returns False otherwise.
+    The file is read and validated the first time it is requested, and the
+    same NoticeTemplate is returned on every later call.  If `check_mtime` is
+    True, the file is stat'ed and is re-read only if it was modified since
+    it was last loaded.
+
+    Raises ValueError if the file does not contain a copyright text block.
     """
-    copyright_exists = False
+    source = notice_path() if path is None else Path(path)
+
+    cached = _notice_templates.get(source)
+    if cached is not None and not check_mtime:
+        return cached
+
+    mtime_ns = source.stat().st_mtime_ns
+    if cached is not None and cached.mtime_ns == mtime_ns:
+        return cached
 
-    with open(path, mode="r") as fin:
+    with open(str(source), mode="r") as fin:
         contents = fin.read()
-        if text_block() in contents:
-            copyright_exists = True  # overwrite
 
-    return copyright_exists
+    if not contents.strip():
+        raise ValueError(f"Error: The `{source}` file contains no text block.")
 
+    template = NoticeTemplate(text=contents, source=source, mtime_ns=mtime_ns)
+    _notice_templates[source] = template
 
-def copyright_create(path: Path, text_block=text_block()) -> bool:
-    """Given a Path to a .py file, appends the copyright `text_block` to the end
-    of the file.  Returns True if the append operation was successful or if the
-    copyright already exists (avoid duplicate copyright blocks); False otherwise.
+    return template
+
+
+def text_block() -> str:  # This is a an entry point in pyproject.toml
+    """The copyright.txt file is the one and only place for definition of
+    the Sandia National Laboratories copyright test block.
+    Updates to the test block should be directly to the copyright.txt file.
+
+    The copyright assertion block exists as a stand-alone text file
+    named `copyright.txt` and located in the same path as this module.
+
+    When used from the command line via an entry point, this function will
+    read the contents of the copyright.txt file and echo it to the terminal.
+    The file is read once per process; see `notice_template`.
+    """
+    return notice_template().text
+
+
+def modules_list(
+    path: Path,
+    *,
+    exclude: Iterable[str] = DEFAULT_EXCLUDES,
+    gitignore: bool = True,
+    languages: Optional[Sequence[str]] = None,
+) -> List[Path]:
+    """Finds all Python files in the given path and in all subdirectories,
+    skipping the directories matched by `exclude` or by `.gitignore` files.
+    See `walk.iter_modules`, which yields the same files lazily.
+
+    If the names of `languages` are given, the files of those languages are
+    found instead, in the same single walk; see `languages.select`."""
+    if languages is None:
+        return list(iter_modules(path, exclude=exclude, gitignore=gitignore))
+    classify = classifier(select(languages))
+    items = iter_sources(path, classify, exclude=exclude, gitignore=gitignore)
+    return [item for item, _ in items]
+
+
+def source_files(
+    paths: Iterable[Path],
+    *,
+    exclude: Iterable[str] = DEFAULT_EXCLUDES,
+    gitignore: bool = True,
+) -> Iterator[Path]:
+    """Yields the files to process for the given `paths`: each path that is a
+    file, as is, and the Python files found in each path that is a directory,
+    as found by `walk.iter_modules` with the `exclude` and `gitignore` options.
     """
-    created = False  # default first state, copyright not created yet
+    for path, _ in classified_files(paths, exclude=exclude, gitignore=gitignore):
+        yield path
+
+
+def classified_files(
+    paths: Iterable[Path],
+    *,
+    languages: Optional[Sequence[str]] = None,
+    exclude: Iterable[str] = DEFAULT_EXCLUDES,
+    gitignore: bool = True,
+) -> Iterator[Tuple[Path, Language]]:
+    """Yields the files to process for the given `paths`, as `source_files`
+    does, along with the language of each, for the names of the `languages`
+    given, or Python only; see `languages.select`.  Each file is classified
+    once, as it is found in the walk.
+
+    With no `languages` given, each path that is a file is yielded as Python,
+    whatever its name.  Otherwise, it is yielded only if it is a file of one
+    of the `languages`.  Archives, e.g., wheels, are never yielded, since they
+    cannot be marked; see `archive_results`.
+    """
+    classify = classifier(select(languages))
+    for path in paths:
+        path = Path(path)
+        if path.is_dir():
+            yield from iter_sources(
+                path, classify, exclude=exclude, gitignore=gitignore
+            )
+        elif archive.is_archive(path):
+            continue
+        elif languages is None:
+            yield path, PYTHON
+        else:
+            language = classify(path.name)
+            if language is not None:
+                yield path, language
+
+
+def language_notice(
+    path: Path, notice: Optional[NoticeTemplate] = None
+) -> NoticeTemplate:
+    """Returns the `notice`, defaulting to the bundled `copyright.txt` file,
+    with its text rendered in the comment style of the language of the file at
+    `path`, or as is for Python; see `languages.render`."""
+    if notice is None:
+        notice = notice_template()
+    style = language_of(Path(path).name).style
+    return notice._replace(text=render(notice.text, style))
+
+
+def _kinds(languages: Optional[Sequence[str]] = None) -> str:
+    """Returns the kinds of files processed, for the messages of a run."""
+    if languages is None:
+        return "`*.py` files"
+    return ", ".join(language.name for language in select(languages)) + " files"
+
+
+def _processing_message(paths: Sequence[Path]) -> str:
+    """Returns the message that names the given `paths` being processed."""
+    if len(paths) == 1:
+        return f"Processing path: {paths[0]}"
+    return f"Processing {len(paths)} paths."
+
+
+def copyright_exists(
+    path: Path,
+    notice: Optional[NoticeTemplate] = None,
+    *,
+    window: Optional[int] = None,
+) -> bool:
+    """Given a single python file as a Path, returns True if the copyright
+    block is contained in the Python file, returns False otherwise.
 
-    print(f"Processing path: {path}")
+    The copyright block is taken from `notice`, defaulting to the bundled
+    `copyright.txt` file, in the comment style of the file's language; see
+    `language_notice`.
 
-    if copyright_exists(path=path):
-        return True
+    By default the whole file is read.  If a `window` size in bytes is given,
+    only the first and the last `window` bytes of the file are read, and the
+    copyright block must lie entirely within one of them; see `_read_window`.
 
-    path_temp = Path(str(path) + ".temp")
+    The file is read as bytes, and searched for the block encoded as UTF-8,
+    with either `\n` or `\r\n` line endings, so that nothing is decoded and
+    a file in any ASCII-compatible encoding can be checked; see
+    `languages.needles`.  A file larger than `STREAM_SIZE` is read one chunk
+    at a time; see `_read_chunks`.
+    """
+    text = (language_notice(path) if notice is None else notice).text
+    encoded = needles(text)
 
-    with open(path, mode="r") as fin:
-        contents = fin.read()
-        contents_new = contents + "\n\n" + text_block + "\n"
-        with open(path_temp, mode="w") as fout:
-            fout.write(contents_new)
+    if window is not None:
+        chunks: Iterable[bytes] = _read_window(path, window, len(encoded[-1]))
+    else:
+        chunks = _read_chunks(path, len(encoded[-1]) - 1)
 
-        # overwrite old original file with new temp file
-        copyfile(src=path_temp, dst=path)
+    return any(_contains(chunk, encoded) for chunk in chunks)
 
-        # remove the new temp file
-        path_temp.unlink()
 
-        created = True  # overwrite
+@stats.phase("match")
+def _contains(chunk: bytes, encoded: Sequence[bytes]) -> bool:
+    """Returns True if the `chunk` contains any of the `encoded` blocks.  Only
+    the search is timed as the match phase: the chunks are read lazily, and
+    their reads are timed as the read phase; see `_read_chunks`."""
+    return any(needle in chunk for needle in encoded)
 
-    return created
 
+def _transferred(counter: str, n: int) -> None:
+    """Counts the `n` bytes read or written, as the `counter`, and waits, if
+    throttling, to keep within the limits; see `throttle`."""
+    stats.count(counter, n)
+    throttle.transfer(n)
 
-def copyright_update(path: Path, *, new: str, old=text_block()) -> bool:
-    """Given a Path to a .py file, replaces the old copyright text block with
-    the `new` copyright text block.  Returns True if the append operation was
-    successful; False otherwise.
 
-    For example, we may want to update the year, or year span, or contract
-    number, etc.  The entire old string is removed from the module, and the
-    entire new string is inserted in its place.
-    """
-    if old == new:
-        # Do not update if the new string is identical to old string.
-        # Return False to indicate no update occurred.
-        return False
+class _Metered:
+    """Wraps an open binary file, e.g., one copied a chunk at a time, and
+    counts each read and each write as it happens, waiting, if throttling,
+    to keep within the limits; see `_transferred`."""
+
+    def __init__(self, file: BinaryIO):
+        self._file = file
 
-    path_temp = Path(str(path) + ".temp")
+    def read(self, size: int = -1) -> bytes:
+        data = self._file.read(size)
+        _transferred("bytes_read", len(data))
+        return data
 
-    with open(path, mode="r") as fin:
+    def write(self, data: bytes) -> int:
+        _transferred("bytes_written", len(data))
+        return self._file.write(data)
+
+
+@stats.phase("read")
+def _read_bytes(path: Path) -> bytes:
+    """Returns the contents of the file at `path`."""
+    with open(path, mode="rb") as fin:
         contents = fin.read()
-        contents_new = contents.replace(old, new)
+    _transferred("bytes_read", len(contents))
+    return contents
 
-        with open(path_temp, mode="w") as fout:
-            fout.write(contents_new)
 
-        # overwrite old original file with new temp file
-        copyfile(src=path_temp, dst=path)
+def _read_chunks(path: Path, overlap: int) -> Iterator[bytes]:
+    """Yields the contents of the file at `path` whole, or, if the file is
+    larger than `STREAM_SIZE`, one chunk at a time, each chunk starting with
+    the last `overlap` bytes of the one before it; see `_stream_chunks`."""
+    with open(path, mode="rb") as fin:
+        if os.fstat(fin.fileno()).st_size <= STREAM_SIZE:
+            yield _read_stream(fin)
+            return
+        yield from _stream_chunks(fin, overlap)
+
+
+def _stream_chunks(fin: BinaryIO, overlap: int) -> Iterator[bytes]:
+    """Yields the rest of the open stream `fin` one chunk at a time, each chunk
+    starting with the last `overlap` bytes of the one before it, and times
+    and counts each read; see `chunked.chunks`."""
+    chunks = chunked.chunks(fin, overlap)
+    while True:
+        with stats.timed("read"):
+            chunk = next(chunks, None)
+        if chunk is None:
+            return
+        _transferred("bytes_read", len(chunk))
+        yield chunk
+
+
+@stats.phase("read")
+def _read_stream(fin: BinaryIO) -> bytes:
+    """Returns the rest of the open file `fin`."""
+    contents = fin.read()
+    _transferred("bytes_read", len(contents))
+    return contents
 
-        # remove the new temp file
-        path_temp.unlink()
 
-        return True  # update occurred
+def _decode(data: bytes) -> str:
+    """Returns the `data` decoded as UTF-8, with any undecodable bytes kept as
+    they are, as lone surrogates, so that `_encode` gives back the same bytes,
+    e.g., for a latin-1 file."""
+    return data.decode("utf-8", errors="surrogateescape")
+
+
+def _encode(text: str, newline: str = "\n") -> bytes:
+    """Returns the `text` encoded back to bytes, with its `\n` line endings
+    written as `newline`; see `_decode`."""
+    if newline != "\n":
+        text = text.replace("\n", newline)
+    return text.encode("utf-8", errors="surrogateescape")
+
+
+def _newline(data: bytes) -> str:
+    """Returns the line ending of the first line of `data`: `\r\n` or `\n`."""
+    end = data.find(b"\n")
+    return "\r\n" if end > 0 and data[end - 1 : end] == b"\r" else "\n"
+
+
+@stats.phase("read")
+def _read_window(path: Path, window: int, length: int) -> Tuple[bytes, ...]:
+    """Returns the first and the last `window` bytes of the file at `path`, or
+    the whole file if it is not larger than twice the `window`.  The `window`
+    is widened to the `length` of the text to be found in it, if need be."""
+    window = max(window, length)
+    with open(path, mode="rb") as fin:
+        size = os.fstat(fin.fileno()).st_size
+        if size <= 2 * window:
+            chunks: Tuple[bytes, ...] = (fin.read(),)
+        else:
+            head = fin.read(window)
+            fin.seek(size - window)
+            chunks = (head, fin.read(window))
+    _transferred("bytes_read", sum(len(chunk) for chunk in chunks))
+    return chunks
+
+
+def copyright_create(
+    path: Path,
+    text_block: Optional[str] = None,
+    *,
+    notice: Optional[NoticeTemplate] = None,
+    fsync: bool = False,
+) -> bool:
+    """Given a Path to a .py file, appends the copyright `text_block` to the end
+    of the file.  Returns True if the append operation was successful or if the
+    copyright already exists (avoid duplicate copyright blocks); False otherwise.
 
+    The `text_block` defaults to the text of `notice`, which in turn defaults
+    to the bundled `copyright.txt` file, in the comment style of the file's
+    language; see `language_notice`.
+    """
+    print(f"Processing path: {path}")
 
-def copyright_delete() -> bool:  # This is an entry point in pyproject.toml
-    """For all .py files in the current working directory, and recursively, deletes
-    the copyright block defined in `copyright.txt` if it is found.  Returns True
-    if the function was successful, False otherwise."""
-    success = False
-    ic = Icon()
-    fs = FoundString()
+    if notice is None:
+        notice = language_notice(path)
+    if text_block is not None:
+        notice = notice._replace(text=text_block)
 
-    root_path = Path.cwd()
-    print(f"Processing path: {root_path}")
-    print("Deleting the text block contained in `copyright.txt` from all .py files.")
+    result = process_file(path, Operation().create, notice, fsync=fsync)
+    if result.error is not None:
+        raise result.error
 
-    py_files = modules_list(root_path)
+    return True
 
-    for item in py_files:
-        copyrighted = copyright_exists(item)
-        if copyrighted:
-            icon = ic.checkmark if copyrighted else ic.red_x
-            message = fs.found if copyrighted else fs.not_found
-            print(f"{item} {icon} {message}")
-            print("...attempting to update...")
-            copyright_update(path=item, new="")
-            copyrighted = copyright_exists(item)  # overwrite
-            if not copyright_exists(item):
-                icon = ic.checkmark if copyrighted else ic.red_x  # overwrite
-                message = fs.found if copyrighted else fs.not_found  # overwrite
-                print("......update successful:")
-                print(f"{item} {icon} {message}")
 
-    success = True  # overwrite
-    return success
+def copyright_update(
+    path: Path,
+    *,
+    new: str,
+    old: Optional[str] = None,
+    notice: Optional[NoticeTemplate] = None,
+    fsync: bool = False,
+) -> bool:
+    """Given a Path to a .py file, replaces the old copyright text block with
+    the `new` copyright text block.  Returns True if the update operation was
+    successful; False otherwise, including when the old block was not found.
 
+    For example, we may want to update the year, or year span, or contract
+    number, etc.  The entire old string is removed from the module, and the
+    entire new string is inserted in its place.  The `old` string defaults to
+    the text of `notice`, which in turn defaults to the bundled `copyright.txt`.
+    The file is replaced atomically; see `replace_contents`.
 
-def copyright_status() -> bool:  # This is an entry point in pyproject.toml
-    """For a .py file in the current working directory, and recursively, prints to
-    the command line the status (present or not found) of the copyright text block.
-    Returns True if the function was successful, False otherwise."""
-    success = False
+    Both blocks are given as in `copyright.txt`, and are rendered in the
+    comment style of the file's language; see `language_notice`.
+    """
+    if notice is None:
+        notice = notice_template()
+    if old is not None:
+        notice = notice._replace(text=old)
+    notice = language_notice(path, notice)
+    new = render(new, language_of(Path(path).name).style)
+
+    if notice.text == new:
+        # Do not update if the new string is identical to old string.
+        # Return False to indicate no update occurred.
+        return False
+
+    result = process_file(path, Operation().update, notice, new=new, fsync=fsync)
+    if result.error is not None:
+        raise result.error
+
+    return result.action == Action().updated
+
+
+def process_file(
+    path: Path,
+    operation: str,
+    notice: NoticeTemplate,
+    *,
+    new: str = "",
+    window: Optional[int] = None,
+    fsync: bool = False,
+    cache: Optional[StatusCache] = None,
+    matcher: Optional[NoticeMatcher] = None,
+    migrate: bool = False,
+    header: bool = False,
+    memo: Optional["ContentMemo"] = None,
+) -> FileResult:
+    """Performs one of the `Operation`s on the file at `path`, with the text of
+    `notice` as the copyright block, and returns the FileResult.
+
+    The file is read at most once, and written at most once:
+
+    * status: reads the file, within the `window` if given.  If a `cache` is
+      given, the file is read only if it changed since it was cached.
+    * create: reads the file, within the `window` if given, and appends the
+      block if it was not found; see `append_contents`.  If `header` is True,
+      the block is inserted at the top of the file instead, after any `#!`
+      line and encoding declaration; see `_insert_header`.
+    * update: reads the whole file, and replaces the block with `new` if it
+      was found; see `replace_contents`.  A file larger than `STREAM_SIZE` is
+      searched, then rewritten, one chunk at a time; see `_replace_streamed`.
+    * delete: as update, with an empty `new` block.
+
+    If a `matcher` is given, any of its variants of the block is searched for,
+    instead of the text of `notice` only, and the name of the variant found is
+    returned in the FileResult; update and delete then replace every variant
+    found.  If `migrate` is also True, create replaces the variants found with
+    the text of `notice`, reading the whole file, so that legacy blocks are
+    migrated in the same run in which unmarked files are marked.  If a `memo`
+    is also given, status and create take the variant found in contents
+    already searched from it; see `dedupe.ContentMemo`.
+
+    The file is read and written as bytes.  It is decoded only if a `matcher`
+    is given, or if the block is found and is to be replaced, and the bytes
+    that are not UTF-8 are written back as they were read.  The block is
+    written with the line endings of the first line of the file; see
+    `_process_bytes`.
+
+    Errors reading or writing the file are returned in the FileResult rather
+    than raised, so one bad file does not stop a run over many files.
+    """
+    op = Operation()
+    act = Action()
+
+    try:
+        if operation == op.status:
+            found, variant = _status(
+                path, notice, cache=cache, window=window, matcher=matcher, memo=memo
+            )
+            return FileResult(
+                path=path, found=found, action=act.unchanged, variant=variant
+            )
+
+        if operation == op.create and not (migrate and matcher is not None):
+            found, variant = _search(
+                path, notice, window=window, matcher=matcher, memo=memo
+            )
+            if found:
+                return FileResult(
+                    path=path, found=found, action=act.unchanged, variant=variant
+                )
+            if header:
+                _insert_header(path, notice.text + "\n\n", fsync=fsync)
+            else:
+                append_contents(path, "\n\n" + notice.text + "\n", fsync=fsync)
+            return FileResult(path=path, found=found, action=act.created)
+
+        if (
+            operation in (op.update, op.delete)
+            and matcher is None
+            and os.stat(path).st_size > STREAM_SIZE
+        ):
+            return _replace_streamed(path, operation, notice, new=new, fsync=fsync)
+
+        contents = _read_bytes(path)
+        with stats.timed("match"):
+            result = _process_bytes(
+                contents,
+                operation,
+                notice,
+                new=new,
+                matcher=matcher,
+                migrate=migrate,
+                header=header,
+            )
+        if result.action == act.created and not header:
+            append_contents(path, result.contents[len(contents) :], fsync=fsync)
+        elif result.action != act.unchanged:
+            # atomically replace the old original file with the new contents
+            replace_contents(path, result.contents, fsync=fsync)
+
+        return FileResult(
+            path=path,
+            found=result.found,
+            action=result.action,
+            variant=result.variant,
+        )
+
+    except (OSError, ValueError) as error:  # e.g., unreadable, undecodable
+        return FileResult(path=path, found=False, action=act.error, error=error)
+
+
+def process_text(
+    contents: str,
+    operation: str,
+    notice: NoticeTemplate,
+    *,
+    new: str = "",
+    matcher: Optional[NoticeMatcher] = None,
+    migrate: bool = False,
+    header: bool = False,
+    newline: str = "\n",
+) -> BufferResult:
+    """Performs one of the `Operation`s on the `contents` of a file, with the
+    text of `notice` as the copyright block, and returns the BufferResult,
+    with the new contents.  Nothing is read or written; see `process_file`
+    for the same operations on a file, and `process_buffer` for bytes.
+
+    If a `matcher` is given, any of its variants of the block is searched for,
+    and replaced by update and delete, or by create if `migrate` is True.
+    Create appends the block, or, if `header` is True, inserts it at the top;
+    see `chunked.with_header`.  The blocks are searched for and written
+    with the `newline` line endings, e.g., `\r\n`.
+
+    Raises ValueError for an unknown operation.
+    """
+    op = Operation()
+    act = Action()
+
+    if operation not in op:
+        raise ValueError(f"Error: unknown operation `{operation}`.")
+    if newline != "\n":
+        notice = notice._replace(text=notice.text.replace("\n", newline))
+        new = new.replace("\n", newline)
+        if matcher is not None:
+            matcher = matcher.with_newline(newline)
+    if operation == op.delete:
+        new = ""
+    elif operation == op.create:
+        new = notice.text  # only replaces the variants when migrating
+
+    replace = operation in (op.update, op.delete) or (
+        operation == op.create and migrate and matcher is not None
+    )
+    variant = None
+    replaced = contents
+    if matcher is None:
+        found = notice.text in contents
+        if found and replace:
+            replaced = contents.replace(notice.text, new)
+    elif replace:
+        replaced, matches = matcher.sub(new, contents)
+        found = bool(matches)
+        variant = matches[0].variant if found else None
+    else:
+        match = matcher.search(contents)
+        found = match is not None
+        variant = None if match is None else match.variant
+
+    if operation == op.create and not found:
+        if header:
+            block = notice.text + newline * 2
+            created = chunked.with_header(contents, block, newline)
+        else:
+            created = contents + newline * 2 + notice.text + newline
+        return BufferResult(contents=created, found=found, action=act.created)
+
+    if replaced == contents:
+        return BufferResult(
+            contents=contents, found=found, action=act.unchanged, variant=variant
+        )
+
+    action = act.deleted if operation == op.delete else act.updated
+    return BufferResult(contents=replaced, found=found, action=action, variant=variant)
+
+
+def process_buffer(
+    contents: AnyStr,
+    operation: str,
+    notice: Optional[NoticeTemplate] = None,
+    *,
+    new: str = "",
+    matcher: Optional[NoticeMatcher] = None,
+    migrate: bool = False,
+    header: bool = False,
+    filename: Optional[str] = None,
+) -> BufferResult:
+    """Performs one of the `Operation`s on the `contents` of a file held in
+    memory, e.g., by an editor or a code generator, as `str` or as `bytes`,
+    and returns the BufferResult, with the new contents of the same type.
+    Nothing is read or written; see `process_text`.
+
+    The `notice` defaults to the bundled `copyright.txt` file.  The `notice`,
+    the `new` block and the `matcher` are rendered in the comment style of the
+    language of the file `filename`, if given, or else of Python; see
+    `languages.render`.  Bytes are handled as `process_file` handles the
+    contents of a file; see `_process_bytes`.
+    """
+    if notice is None:
+        notice = notice_template()
+    style = PYTHON.style if filename is None else language_of(filename).style
+    notice = notice._replace(text=render(notice.text, style))
+    new = render(new, style)
+    if matcher is not None:
+        matcher = matcher.rendered(style)
+
+    process = _process_bytes if isinstance(contents, bytes) else process_text
+    return process(
+        contents,  # type: ignore
+        operation,
+        notice,
+        new=new,
+        matcher=matcher,
+        migrate=migrate,
+        header=header,
+    )
+
+
+def _process_bytes(
+    data: bytes,
+    operation: str,
+    notice: NoticeTemplate,
+    *,
+    new: str = "",
+    matcher: Optional[NoticeMatcher] = None,
+    migrate: bool = False,
+    header: bool = False,
+) -> BufferResult:
+    """Performs one of the `Operation`s on the contents of a file as `data`
+    bytes, as `process_text` does on text, and returns the BufferResult, with
+    the new contents as bytes.
+
+    The line endings of the first line, `\n` or `\r\n`, are detected, and
+    the blocks are searched for and written with the same; see `_newline`.
+    Without a `matcher`, the encoded blocks are searched for and replaced as
+    bytes, and nothing is decoded.  With one, the `data` is decoded for the
+    search, and the bytes that are not UTF-8 are written back as they were
+    read; see `_decode`.  The lines the operation does not change are left
+    as they are, whatever their line endings.
+    """
+    newline = _newline(data)
+    if matcher is None:
+        return _process_encoded(
+            data, operation, notice, new=new, header=header, newline=newline
+        )
+
+    result = process_text(
+        _decode(data),
+        operation,
+        notice,
+        new=new,
+        matcher=matcher,
+        migrate=migrate,
+        header=header,
+        newline=newline,
+    )
+    if result.action == Action().unchanged:
+        return result._replace(contents=data)
+    return result._replace(contents=_encode(result.contents))
+
+
+def _process_encoded(
+    data: bytes,
+    operation: str,
+    notice: NoticeTemplate,
+    *,
+    new: str = "",
+    header: bool = False,
+    newline: str = "\n",
+) -> BufferResult:
+    """Performs one of the `Operation`s on the `data` bytes, as `process_text`
+    does without a matcher, with the block and the `new` block encoded with
+    the `newline` line endings."""
+    op = Operation()
+    act = Action()
+
+    if operation not in op:
+        raise ValueError(f"Error: unknown operation `{operation}`.")
+    block = _encode(notice.text, newline)
+    found = block in data
+    if operation == op.status or found == (operation == op.create):
+        return BufferResult(contents=data, found=found, action=act.unchanged)
+
+    if operation == op.create:
+        if header:
+            block = _encode(notice.text + "\n\n", newline)
+            created = chunked.with_header(data, block, _encode("\n", newline))
+        else:
+            created = data + _encode("\n\n" + notice.text + "\n", newline)
+        return BufferResult(contents=created, found=found, action=act.created)
+
+    new = "" if operation == op.delete else new
+    replaced = data.replace(block, _encode(new, newline))
+    if replaced == data:
+        return BufferResult(contents=data, found=found, action=act.unchanged)
+    action = act.deleted if operation == op.delete else act.updated
+    return BufferResult(contents=replaced, found=found, action=action)
+
+
+def _search(
+    path: Path,
+    notice: NoticeTemplate,
+    *,
+    window: Optional[int] = None,
+    matcher: Optional[NoticeMatcher] = None,
+    memo: Optional["ContentMemo"] = None,
+) -> Tuple[bool, Optional[str]]:
+    """Returns whether the file at `path` contains the block, within the
+    `window` if given, and the name of the variant found by the `matcher`, if
+    one is given; see `copyright_exists`.  The status of the whole contents
+    is taken from the `memo`, if given, when they were searched before."""
+    if matcher is None:
+        return copyright_exists(path, notice=notice, window=window), None
+
+    if window is not None:
+        # Room for a `\r` at the end of each line of the longest variant.
+        raw = _read_window(path, window, 2 * matcher.max_length)
+        return _match_chunks(raw, matcher)
+
+    return _match_data(_read_bytes(path), matcher, memo)
+
+
+def _search_stream(
+    fin: BinaryIO,
+    notice: NoticeTemplate,
+    *,
+    matcher: Optional[NoticeMatcher] = None,
+) -> Tuple[bool, Optional[str]]:
+    """Returns whether the rest of the open stream `fin`, e.g., a member of an
+    archive, contains the block, and the name of the variant found by the
+    `matcher`, if one is given, as `_search` does for a file.  Without a
+    `matcher`, the stream is searched one chunk at a time."""
+    if matcher is None:
+        encoded = needles(notice.text)
+        chunks = _stream_chunks(fin, len(encoded[-1]) - 1)
+        return any(_contains(chunk, encoded) for chunk in chunks), None
+    return _match_data(_read_stream(fin), matcher)
+
+
+def _match_data(
+    data: bytes, matcher: NoticeMatcher, memo: Optional["ContentMemo"] = None
+) -> Tuple[bool, Optional[str]]:
+    """Returns whether the `data` contains a variant of the block, and the
+    name of the variant found by the `matcher`, taken from the `memo`, if
+    given, when the same contents were searched before."""
+    if memo is None:
+        return _match_chunks((data,), matcher)
+    key = memo.key(data)
+    status = memo.get(key)
+    if status is None:
+        status = _match_chunks((data,), matcher)
+        memo.put(key, status)
+    return status
+
+
+def _match_chunks(
+    raw: Iterable[bytes], matcher: NoticeMatcher
+) -> Tuple[bool, Optional[str]]:
+    """Returns whether any of the `raw` chunks contains a variant of the block,
+    and the name of the variant found by the `matcher`."""
+    for chunk in raw:
+        with stats.timed("match"):
+            match = matcher.search(_decode(chunk).replace("\r\n", "\n"))
+        if match is not None:
+            return True, match.variant
+    return False, None
+
+
+def _status(
+    path: Path,
+    notice: NoticeTemplate,
+    cache: Optional[StatusCache] = None,
+    window: Optional[int] = None,
+    matcher: Optional[NoticeMatcher] = None,
+    memo: Optional["ContentMemo"] = None,
+) -> Tuple[bool, Optional[str]]:
+    """Returns whether the file at `path` contains the block, and the variant
+    found, as `_search` does, taking the answer from the `cache` if the file
+    has not changed since it was cached."""
+    if cache is None:
+        return _search(path, notice, window=window, matcher=matcher, memo=memo)
+
+    stat = os.stat(path)
+    found = cache.lookup(path, stat)
+    if found is not None:
+        return found, cache.variant(path)
+
+    found, variant = _search(path, notice, window=window, matcher=matcher, memo=memo)
+    cache.record(path, stat, found, variant)
+    return found, variant
+
+
+@stats.phase("write")
+def append_contents(path: Path, contents: AnyStr, *, fsync: bool = False) -> None:
+    """Appends `contents`, as bytes or as text, to the file at `path`.  Text is
+    encoded as UTF-8, with the line endings of the first line of the file; see
+    `_newline`.
+
+    The file is opened in append mode, so its existing contents are neither
+    read nor rewritten, but for the first line.  If `fsync` is True, the data
+    is flushed to disk before returning."""
+    with open(path, mode="a+b") as fout:
+        if isinstance(contents, bytes):
+            data = contents
+        else:
+            fout.seek(0)
+            data = _encode(contents, _newline(fout.readline()))
+        _transferred("bytes_written", len(data))
+        fout.write(data)
+        if fsync:
+            fout.flush()
+            os.fsync(fout.fileno())
+
+
+@stats.phase("write")
+def replace_contents(path: Path, contents: AnyStr, *, fsync: bool = False) -> None:
+    """Replaces the contents of the file at `path` with `contents`, as bytes or
+    as text encoded as UTF-8; see `_replacing`."""
+    data = contents if isinstance(contents, bytes) else _encode(contents)
+    with _replacing(path, fsync=fsync) as fout:
+        fout.write(data)
+
+
+@contextlib.contextmanager
+def _replacing(path: Path, *, fsync: bool = False) -> Iterator[BinaryIO]:
+    """Yields a binary file to write the new contents of the file at `path`
+    to, which replace its contents at the end of the block.  Each write is
+    counted, and throttled, as it happens; see `_Metered`.
+
+    The new contents are written to a temporary file in the same directory,
+    `.snlcopyright-<name>.<random>.temp`, which is then renamed over the
+    original with `os.replace`, so the file is never seen half written.  The
+    mode and the ownership of the original are kept.  If `fsync` is True, the
+    new contents and the rename are flushed to disk.  If the block raises,
+    the original is left as it was.
+
+    A symbolic link is followed and its target replaced.  A file with several
+    hard links, or whose ownership cannot be kept, is instead rewritten in
+    place from the temporary file, which keeps the links and the ownership
+    but is not atomic.
+    """
+    target = os.path.realpath(path)
+    stat = os.stat(target)
+
+    directory, name = os.path.split(target)
+    fd, path_temp = tempfile.mkstemp(
+        dir=directory, prefix=TEMP_PREFIX + name + ".", suffix=".temp"
+    )
+    try:
+        with os.fdopen(fd, mode="w+b") as fout:
+            yield _Metered(fout)  # type: ignore
+            fout.flush()
+            if stat.st_nlink > 1:
+                _write_in_place(target, fout, fsync=fsync)
+                os.unlink(path_temp)
+                return
+            if fsync:
+                os.fsync(fout.fileno())
+        os.chmod(path_temp, S_IMODE(stat.st_mode))
+        if hasattr(os, "chown") and (stat.st_uid, stat.st_gid) != _owner(path_temp):
+            try:
+                os.chown(path_temp, stat.st_uid, stat.st_gid)
+            except PermissionError:
+                with open(path_temp, mode="rb") as fin:
+                    _write_in_place(target, fin, fsync=fsync)
+                os.unlink(path_temp)
+                return
+        os.replace(path_temp, target)
+    except BaseException:
+        if os.path.exists(path_temp):
+            os.unlink(path_temp)
+        raise
+
+    if fsync and hasattr(os, "O_DIRECTORY"):
+        dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)  # make the rename itself durable
+        finally:
+            os.close(dir_fd)
+
+
+def _owner(path: str) -> Tuple[int, int]:
+    """Returns the user and group ids of the file at `path`."""
+    stat = os.stat(path)
+    return stat.st_uid, stat.st_gid
+
+
+def _write_in_place(path: str, source: BinaryIO, *, fsync: bool = False) -> None:
+    """Truncates the file at `path` and copies the contents of the `source`
+    file to it, one chunk at a time, counting each chunk read and written."""
+    source.seek(0)
+    with open(path, mode="wb") as fout:
+        for chunk in chunked.chunks(_Metered(source)):  # type: ignore
+            _transferred("bytes_written", len(chunk))
+            fout.write(chunk)
+        if fsync:
+            fout.flush()
+            os.fsync(fout.fileno())
+
+
+def _replace_streamed(
+    path: Path,
+    operation: str,
+    notice: NoticeTemplate,
+    *,
+    new: str = "",
+    fsync: bool = False,
+) -> FileResult:
+    """Performs the update or delete `operation` on the file at `path`, as
+    `process_file` does, without holding the file in memory: the file is
+    searched for the block one chunk at a time, and, if it is found, copied
+    to its replacement one chunk at a time, with each block replaced by `new`
+    in the same line endings; see `chunked.replace`."""
+    op = Operation()
+    act = Action()
+
+    if operation == op.delete:
+        new = ""
+    if not copyright_exists(path, notice=notice):
+        return FileResult(path=path, found=False, action=act.unchanged)
+    if new == notice.text:
+        return FileResult(path=path, found=True, action=act.unchanged)
+
+    pairs = list(zip(needles(notice.text), needles(new)))
+    with stats.timed("write"):
+        with open(path, mode="rb") as fin, _replacing(path, fsync=fsync) as fout:
+            chunked.replace(_Metered(fin), fout, pairs)  # type: ignore
+
+    action = act.deleted if operation == op.delete else act.updated
+    return FileResult(path=path, found=True, action=action)
+
+
+@stats.phase("write")
+def _insert_header(path: Path, block: str, *, fsync: bool = False) -> None:
+    """Inserts the `block` at the top of the file at `path`, after any `#!`
+    line and encoding declaration, in the line endings of the first line,
+    copying the file to its replacement one chunk at a time; see
+    `chunked.insert`."""
+    with open(path, mode="rb") as fin, _replacing(path, fsync=fsync) as fout:
+        newline = _newline(fin.readline())
+        fin.seek(0)
+        chunked.insert(
+            _Metered(fin),  # type: ignore
+            fout,
+            _encode(block, newline),
+            newline=_encode("\n", newline),
+        )
+
+
+def map_files(
+    func: Callable[[Path], Any], paths: Iterable[Path], jobs: int = 1
+) -> Iterator[Any]:
+    """Calls `func` on each of the `paths` and yields the return values in the
+    same order as `paths`.
+
+    With `jobs` greater than one, the calls are spread across a pool of that
+    many worker threads.  Reading and writing files spends most of its time
+    waiting on I/O, so the threads overlap that waiting.  At most a few calls
+    per worker are in flight at once, so `paths` may be a lazy iterator.
+    """
+    if jobs <= 1:
+        for path in paths:
+            yield func(path)
+        return
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        pending: Deque[Future] = deque()
+        for path in paths:
+            pending.append(executor.submit(func, path))
+            if len(pending) >= 4 * jobs:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def process_files(
+    operation: str,
+    notice: NoticeTemplate,
+    *,
+    paths: Optional[Sequence[Path]] = None,
+    jobs: int = 1,
+    exclude: Iterable[str] = DEFAULT_EXCLUDES,
+    gitignore: bool = True,
+    new: str = "",
+    window: Optional[int] = None,
+    fsync: bool = False,
+    cache: Optional[StatusCache] = None,
+    matcher: Optional[NoticeMatcher] = None,
+    migrate: bool = False,
+    header: bool = False,
+    languages: Optional[Sequence[str]] = None,
+    skip: Optional[Set[str]] = None,
+    config: Optional["NoticeIndex"] = None,
+    years: Optional["FileYears"] = None,
+) -> Iterator[FileResult]:
+    """Performs the `operation` on each of the files found for the `paths` and
+    yields each FileResult in turn; see `process_file`.  The files whose
+    absolute paths are in `skip`, e.g., those done by an interrupted run, are
+    left out; see `journal.Journal`.
+
+    The `paths` default to the current working directory; see `source_files`.
+    The files are processed by `jobs` worker threads; see `map_files`.  The
+    directories matched by `exclude` or by `.gitignore` files are skipped; see
+    `walk.iter_modules`.
+
+    If the names of `languages` are given, the files of those languages are
+    processed, in a single walk, instead of the Python files only; see
+    `classified_files`.  The `notice`, the `new` block and the `matcher` are
+    then rendered once for each comment style in use, rather than once per
+    file; see `languages.render`.
+
+    A file reached by more than one path, through hard or symbolic links, is
+    read and written once, and the contents of vendored copies are searched
+    with the `matcher` once; see `dedupe`.
+
+    If a `config` is given, each file takes the copyright block of the subtree
+    it is in, in place of the `notice`, and the files it leaves out are
+    skipped; see `config.NoticeIndex`.  If `years` are given, each file takes
+    the block with the years in which it was changed; see `file_processor`.
+    """
+    if paths is None:
+        paths = [Path.cwd()]
+
+    func = file_processor(
+        operation,
+        notice,
+        new=new,
+        window=window,
+        fsync=fsync,
+        cache=cache,
+        matcher=matcher,
+        migrate=migrate,
+        header=header,
+        languages=languages,
+        dedupe=True,
+        config=config,
+        years=years,
+    )
+    files = classified_files(
+        paths, languages=languages, exclude=exclude, gitignore=gitignore
+    )
+    if skip:
+        files = (item for item in files if os.path.abspath(item[0]) not in skip)
+    if config is not None:
+        files = configured_files(files, config, notice)
+    return map_files(func, files, jobs=jobs)
+
+
+def configured_files(
+    files: Iterable[Tuple[Path, Language]],
+    config: "NoticeIndex",
+    notice: NoticeTemplate,
+) -> Iterator[Tuple[Path, Language, NoticeTemplate]]:
+    """Yields each of the `files`, given as a path and its language, with the
+    copyright text block of its subtree in the `config`, or the `notice` by
+    default, leaving out the files the `config` excludes.  The block of each
+    file is resolved once, here, and taken by `file_processor`."""
+    for path, language in files:
+        template = config.resolve(path, notice)
+        if template is not None:
+            yield path, language, template
+
+
+def file_processor(
+    operation: str,
+    notice: NoticeTemplate,
+    *,
+    languages: Optional[Sequence[str]] = None,
+    matcher: Optional[NoticeMatcher] = None,
+    new: str = "",
+    dedupe: bool = False,
+    config: Optional["NoticeIndex"] = None,
+    years: Optional["FileYears"] = None,
+    **kwargs: Any,
+) -> Callable[[Tuple[Any, ...]], FileResult]:
+    """Returns a function that performs the `operation` on one file, given as
+    a path and its language among the `languages`, and returns the FileResult;
+    see `process_file`, which takes the other keyword arguments.  The
+    `notice`, the `new` block and the `matcher` are rendered here, once for
+    each comment style in use, and for each of the blocks of the `config`, if
+    given, which selects the block of each file; see `config.NoticeIndex`.
+
+    If `years` are given, each file takes the block with the years in which
+    it was changed in place of those of the block, and the years of the
+    other files are left as they are, by searching them only; see
+    `vcs.FileYears` and `matcher.with_years`.  A file whose block does not
+    have those years is marked with the years up to this one, as it is
+    changed now, so that marking it again leaves it as it is.
+
+    If `dedupe` is True, the function is for one run only: each file reached
+    through another path already processed takes the result of that path,
+    and the status of contents searched with the `matcher` is memoized; see
+    `dedupe.SeenFiles`.
+
+    A file may be given with its block as a third item, as resolved by
+    `configured_files`, so that the `config` is not searched for it again."""
+    seen = None
+    if dedupe:
+        from snlcopyright.dedupe import ContentMemo, SeenFiles  # imports this
+
+        seen = SeenFiles()
+
+    # One function per operation, comment style and text of the block, made
+    # when first needed, since the years of the block vary from file to file.
+    funcs: Dict[Tuple[str, str, str, bool], Callable[[Path], FileResult]] = {}
+
+    def processor(
+        kind: str, style: str, template: NoticeTemplate, exact: bool = False
+    ) -> Callable[[Path], FileResult]:
+        key = (kind, style, template.text, exact)
+        process = funcs.get(key)
+        if process is None:
+            variants = None if exact else matcher
+            if variants is not None and template.text != notice.text:
+                variants = variants.with_current(template.text)
+            memo = None
+            if dedupe and variants is not None:
+                memo = ContentMemo()
+            process = funcs[key] = partial(
+                process_file,
+                operation=kind,
+                notice=template._replace(text=render(template.text, style)),
+                new=render(new, style),
+                matcher=None if variants is None else variants.rendered(style),
+                memo=memo,
+                **kwargs,
+            )
+        return process
+
+    def marker(
+        path: Path, style: str, template: NoticeTemplate
+    ) -> Callable[[Path], FileResult]:
+        # The file is left as it is if its block has the years in which it
+        # was changed, or else marked with the years up to this one, as it is
+        # changed now; see `vcs.FileYears.span`.
+        op = Operation()
+        assert years is not None
+        span = years.span(path)
+        if span is None:
+            return processor(op.status, style, template)
+        current = template._replace(text=with_years(template.text, span))
+        if operation == op.status:
+            return processor(op.status, style, current)
+        search = processor(op.status, style, current, exact=True)
+        written = years.span(path, written=True) or span
+        mark = processor(
+            operation, style, template._replace(text=with_years(template.text, written))
+        )
+
+        def process(path: Path) -> FileResult:
+            result = search(path)
+            if result.found or result.action == Action().error:
+                return result
+            return mark(path)
+
+        return process
+
+    def func(item: Tuple[Any, ...]) -> FileResult:
+        path, language = item[0], item[1]
+        if len(item) > 2:
+            template = item[2]
+        elif config is not None:
+            template = config.resolve(path, notice) or notice
+        else:
+            template = notice
+        process = processor(operation, language.style, template)
+        if years is not None:
+            process = marker(path, language.style, template)
+        throttle.file()
+        with stats.file_timer(path):
+            if seen is not None:
+                return seen.process(path, process)
+            return process(path)
+
+    return func
+
+
+def archive_results(
+    paths: Iterable[Path],
+    notice: NoticeTemplate,
+    *,
+    languages: Optional[Sequence[str]] = None,
+    matcher: Optional[NoticeMatcher] = None,
+    config: Optional["NoticeIndex"] = None,
+) -> Iterator[FileResult]:
+    """Yields the status of each source file inside each of the `paths` that
+    is an archive, e.g., an sdist or a wheel, without extracting it; see
+    `archive.member_status`.  An archive that cannot be read is yielded as an
+    error result.
+
+    The members are searched as files are, for the block, or for any of the
+    variants of the `matcher`, if given, in the comment style of each; see
+    `_search_stream`.  If a `config` is given, the members of an archive take
+    the block of the subtree the archive is in, and the archives it leaves
+    out are skipped; see `config.NoticeIndex`."""
+    act = Action()
+    for path in archive.archive_paths(paths):
+        template = notice if config is None else config.resolve(path, notice)
+        if template is None:
+            continue
+        variants = matcher
+        if variants is not None and template.text != notice.text:
+            variants = variants.with_current(template.text)
+        search = _member_search(template, variants)
+        try:
+            for name, found, variant in archive.member_status(
+                path, search, languages=languages
+            ):
+                yield FileResult(
+                    path=archive.member_path(path, name),
+                    found=found,
+                    action=act.unchanged,
+                    variant=variant,
+                )
+        except Exception as error:  # e.g., OSError, TarError, BadZipFile
+            yield FileResult(path=path, found=False, action=act.error, error=error)
+
+
+def _member_search(
+    notice: NoticeTemplate, matcher: Optional[NoticeMatcher]
+) -> Callable[[BinaryIO, Language], Tuple[bool, Optional[str]]]:
+    """Returns a function that searches a member of an archive, given as an
+    open stream and its language, for the `notice`, or for the variants of
+    the `matcher`, rendered once for each comment style in use.  Each member
+    is throttled as a file is, and its reads as those of a file are."""
+    rendered: Dict[str, Tuple[NoticeTemplate, Optional[NoticeMatcher]]] = {}
+
+    def search(fin: BinaryIO, language: Language) -> Tuple[bool, Optional[str]]:
+        style = language.style
+        if style not in rendered:
+            rendered[style] = (
+                notice._replace(text=render(notice.text, style)),
+                None if matcher is None else matcher.rendered(style),
+            )
+        template, variants = rendered[style]
+        throttle.file()
+        return _search_stream(fin, template, matcher=variants)
+
+    return search
+
+
+def remove_stale_temp_files(
+    paths: Iterable[Path],
+    *,
+    exclude: Iterable[str] = DEFAULT_EXCLUDES,
+    gitignore: bool = True,
+) -> List[Path]:
+    """Removes the temporary `.snlcopyright-<name>.<random>.temp` files left
+    next to the files found for the `paths` by rewrites that were interrupted,
+    e.g., by a run that was killed, and returns their paths; see `_replacing`.
+    Only call this when no other run is rewriting the same files."""
+
+    def classify(name: str) -> Optional[bool]:
+        return True if TEMP_NAME.match(name) else None
+
+    removed = []
+    for path in paths:
+        path = Path(path)
+        if path.is_dir():
+            found: Iterable[Path] = (
+                item
+                for item, _ in iter_sources(
+                    path, classify, exclude=exclude, gitignore=gitignore
+                )
+            )
+        else:
+            pattern = TEMP_PREFIX + glob.escape(path.name) + ".*.temp"
+            found = [item for item in path.parent.glob(pattern) if classify(item.name)]
+        for item in found:
+            try:
+                os.unlink(item)
+            except OSError:
+                continue
+            removed.append(item)
+    return removed
+
+
+def _open_journal(
+    path: Optional[Path],
+    operation: str,
+    notice: NoticeTemplate,
+    report: "Report",
+    *,
+    mode: str,
+    resume: bool,
+    fsync: bool,
+    paths: Sequence[Path],
+    exclude: Iterable[str],
+    gitignore: bool,
+) -> Optional["Journal"]:
+    """Returns the journal at `path` of a run of the `operation`, if a `path`
+    is given.  If `resume` is True, the files done by the interrupted run are
+    read from it, and the temporary files it left are removed; see
+    `remove_stale_temp_files`."""
+    if path is None:
+        return None
+    from snlcopyright.journal import Journal  # journal imports this module
+
+    run = Journal(path, operation, notice.text, mode=mode, resume=resume, fsync=fsync)
+    if resume:
+        removed = remove_stale_temp_files(paths, exclude=exclude, gitignore=gitignore)
+        report.note(
+            f"Resuming from {path}: {len(run.done)} file(s) already done, "
+            f"{len(removed)} stale temporary file(s) removed."
+        )
+    return run
+
+
+def _write_results(
+    report: "Report", results: Iterable[FileResult], run: Optional["Journal"]
+) -> None:
+    """Writes each of the `results` to the `report`, and records it in the
+    journal of the `run`, if any, which is removed once all are written."""
+    if run is None:
+        for result in results:
+            report.write(result)
+        return
+
+    try:
+        for result in results:
+            report.write(result)
+            run.record(result)
+    except BaseException:
+        run.close()  # keep the journal, to resume from
+        raise
+    run.close(complete=True)
+
+
+def print_result(result: FileResult, file: Optional[TextIO] = None) -> None:
+    """Prints the command line message for one FileResult to `file`, which
+    defaults to the standard output."""
     ic = Icon()
     fs = FoundString()
+    act = Action()
+
+    if result.action == act.error:
+        print(f"{result.path} {ic.red_x} {result.error}", file=file)
+        return
+
+    icon = ic.checkmark if result.found else ic.red_x
+    message = fs.found if result.found else fs.not_found
+    if result.variant not in (None, CURRENT):
+        message += f" ({result.variant})"
+    print(f"{result.path} {icon} {message}", file=file)
+
+    if result.action == act.created:
+        print("...copyright created", file=file)
+    elif result.action in (act.updated, act.deleted):
+        print(f"...copyright {result.action}", file=file)
+
+
+def _report(report: Optional["Report"], only_found: bool = False) -> "Report":
+    """Returns the given `report`, or the default command line text report."""
+    if report is not None:
+        return report
+    from snlcopyright.report import TextReport  # report imports this module
+
+    return TextReport(only_found=only_found)
+
+
+def copyright_delete(
+    notice: Optional[NoticeTemplate] = None,
+    *,
+    paths: Optional[Sequence[Path]] = None,
+    jobs: int = 1,
+    exclude: Iterable[str] = DEFAULT_EXCLUDES,
+    gitignore: bool = True,
+    fsync: bool = False,
+    matcher: Optional[NoticeMatcher] = None,
+    languages: Optional[Sequence[str]] = None,
+    report: Optional["Report"] = None,
+    journal: Optional[Path] = None,
+    resume: bool = False,
+    config: Optional["NoticeIndex"] = None,
+) -> bool:  # This is an entry point in pyproject.toml
+    """For all .py files in the current working directory, and recursively, deletes
+    the copyright block defined in `copyright.txt` if it is found.  Returns True
+    if the function was successful, False otherwise.
 
-    root_path = Path.cwd()
-    print(f"Processing path: {root_path}")
-    print("Checking all `*.py` files for the text block contained in `copyright.txt`.")
-
-    py_files = modules_list(root_path)
-
-    for item in py_files:
-        copyrighted = copyright_exists(item)
-        icon = ic.checkmark if copyrighted else ic.red_x
-        message = fs.found if copyrighted else fs.not_found
-        print(f"{item} {icon} {message}")
+    Instead of the current working directory, the given `paths` are processed,
+    by `jobs` worker threads, skipping the `exclude` patterns and, if
+    `gitignore` is True, the `.gitignore` patterns; see `process_files`.  If
+    `fsync` is True, each modified file is flushed to disk.  If a `matcher` is
+    given, every variant of the block it finds is deleted.  The results are
+    written to the `report`, which defaults to command line messages for the
+    files in which the copyright block was found; see `report.make_report`.
 
-    success = True  # overwrite
-    return success
+    If the names of `languages` are given, the files of those languages are
+    processed instead of the Python files only; see `process_files`.
 
+    If a `journal` file is given, the files done are recorded in it as the
+    run proceeds, and, if `resume` is True, the files recorded by an
+    interrupted run are skipped; see `journal.Journal`.
 
-def copyright() -> bool:  # This is a an entry point in pyproject.toml
+    If a `config` is given, the block of each file is deleted, as given for
+    its subtree, and the files it leaves out are skipped; see `process_files`.
+    """
+    if notice is None:
+        notice = notice_template()  # loaded once for all files
+
+    if paths is None:
+        paths = [Path.cwd()]
+    report = _report(report, only_found=True)
+    report.start(
+        _processing_message(paths),
+        f"Deleting the text block contained in `copyright.txt` from all {_kinds(languages)}.",
+    )
+
+    run = _open_journal(
+        journal,
+        Operation().delete,
+        notice,
+        report,
+        mode=_mode(matcher=matcher, config=config),
+        resume=resume,
+        fsync=fsync,
+        paths=paths,
+        exclude=exclude,
+        gitignore=gitignore,
+    )
+    results = process_files(
+        Operation().delete,
+        notice,
+        paths=paths,
+        jobs=jobs,
+        exclude=exclude,
+        gitignore=gitignore,
+        fsync=fsync,
+        matcher=matcher,
+        languages=languages,
+        skip=None if run is None else run.done,
+        config=config,
+    )
+    _write_results(report, results, run)
+
+    report.finish()
+    return not report.errors
+
+
+def _mode(**options: Any) -> str:
+    """Returns the mode of a run, for its status cache or its journal, from
+    the `options` that change the outcome for a file, leaving out those that
+    are not given."""
+    parts = []
+    for name, value in options.items():
+        if value is None:
+            continue
+        if hasattr(value, "digest"):
+            value = value.digest()  # a NoticeMatcher or a NoticeIndex
+        parts.append(f"{name}={value}")
+    return ";".join(parts)
+
+
+def copyright_status(
+    notice: Optional[NoticeTemplate] = None,
+    *,
+    paths: Optional[Sequence[Path]] = None,
+    jobs: int = 1,
+    exclude: Iterable[str] = DEFAULT_EXCLUDES,
+    gitignore: bool = True,
+    window: Optional[int] = None,
+    cache: Optional[Path] = None,
+    check: bool = False,
+    matcher: Optional[NoticeMatcher] = None,
+    languages: Optional[Sequence[str]] = None,
+    report: Optional["Report"] = None,
+    daemon: Optional[Path] = None,
+    config: Optional["NoticeIndex"] = None,
+) -> bool:  # This is an entry point in pyproject.toml
+    """For a .py file in the current working directory, and recursively, prints to
+    the command line the status (present or not found) of the copyright text block.
+    Returns True if the function was successful, False otherwise.  If `check` is
+    True, also returns False if the block was not found in any of the files.
+
+    Instead of the current working directory, the given `paths` are processed,
+    by `jobs` worker threads, skipping the `exclude` patterns and, if
+    `gitignore` is True, the `.gitignore` patterns; see `process_files`.  If a
+    `window` size is given, only the head and the tail of each file are
+    searched; see `copyright_exists`.  If a `cache` file is given, only the
+    files that changed since the status was cached are read; see
+    `cache.StatusCache`.  If a `matcher` is given, any of its variants of the
+    block is searched for, and the variant found is reported.  The results are
+    written to the `report`, which defaults to command line messages; see
+    `report.make_report`.
+
+    If the names of `languages` are given, the files of those languages are
+    processed instead of the Python files only; see `process_files`.  The source
+    files inside archives among the `paths`, e.g., wheels, are checked too;
+    see `archive_results`.
+
+    If the Unix socket of a `copyright-watch` process is given as `daemon`,
+    the status of the files under the `paths` is taken from its index instead
+    of reading the files; see `watch.query`.  If no watcher answers, or if it
+    does not watch all of the `paths`, or was started with other languages,
+    variants, excludes, or `config`, or without the `window`, the files are
+    read.
+
+    If a `config` is given, each file is searched for the block of its
+    subtree, and the files it leaves out are skipped; see `process_files`.
+    """
+    if notice is None:
+        notice = notice_template()  # loaded once for all files
+
+    if paths is None:
+        paths = [Path.cwd()]
+    report = _report(report)
+    report.start(
+        _processing_message(paths),
+        f"Checking all {_kinds(languages)} for the text block contained in `copyright.txt`.",
+    )
+
+    status_cache = None
+    if cache is not None:
+        mode = _mode(window=window, matcher=matcher, config=config)
+        status_cache = StatusCache(cache, notice.text, mode=mode)
+
+    results: Optional[Iterable[FileResult]] = None
+    if daemon is not None:
+        results = _watched_results(
+            daemon,
+            paths,
+            report,
+            notice=notice,
+            languages=languages,
+            exclude=exclude,
+            gitignore=gitignore,
+            matcher=matcher,
+            config=config,
+            window=window,
+        )
+    if results is not None:
+        status_cache = None  # no file looked up, so the cache stays as it is
+    else:
+        results = _status_results(
+            notice,
+            paths=paths,
+            jobs=jobs,
+            exclude=exclude,
+            gitignore=gitignore,
+            window=window,
+            cache=status_cache,
+            matcher=matcher,
+            languages=languages,
+            config=config,
+        )
+    for result in results:
+        report.write(result)
+
+    if status_cache is not None:
+        status_cache.save(roots=paths)
+        report.note(
+            f"Status cache: {status_cache.hits} file(s) unchanged, "
+            f"{status_cache.misses} file(s) read."
+        )
+
+    report.finish()
+    return not report.errors and not (check and report.totals["missing"])
+
+
+def _status_results(
+    notice: NoticeTemplate,
+    *,
+    paths: Sequence[Path],
+    languages: Optional[Sequence[str]] = None,
+    **kwargs: Any,
+) -> Iterator[FileResult]:
+    """Yields the status of each file found for the `paths`, and of the
+    source files inside the archives among them; see `copyright_status`."""
+    results = process_files(
+        Operation().status, notice, paths=paths, languages=languages, **kwargs
+    )
+    archives = archive_results(
+        paths,
+        notice,
+        languages=languages,
+        matcher=kwargs.get("matcher"),
+        config=kwargs.get("config"),
+    )
+    return chain(results, archives)
+
+
+def _watched_results(
+    daemon: Path,
+    paths: Sequence[Path],
+    report: "Report",
+    notice: NoticeTemplate,
+    *,
+    languages: Optional[Sequence[str]] = None,
+    **options: Any,
+) -> Optional[Iterator[FileResult]]:
+    """Returns the status of the files under the `paths` from the watcher on
+    the Unix socket `daemon`, and of the source files inside the archives
+    among them, or None if no watcher answers, or if the watcher does not
+    watch all of the `paths`, or does not share the `languages` and the other
+    `options` of the run; see `watch.settings`."""
+    from snlcopyright import watch  # watch imports this module
+
+    settings = watch.settings(notice, languages=languages, **options)
+    try:
+        results = watch.query(daemon, paths, settings=settings)
+    except OSError as error:
+        report.note(f"No answer from a watcher on {daemon} ({error}); reading files.")
+        return None
+    report.note(f"Status of {len(results)} file(s) from the watcher on {daemon}.")
+    archives = archive_results(
+        paths,
+        notice,
+        languages=languages,
+        matcher=options.get("matcher"),
+        config=options.get("config"),
+    )
+    return chain(results, archives)
+
+
+def copyright(
+    notice: Optional[NoticeTemplate] = None,
+    *,
+    paths: Optional[Sequence[Path]] = None,
+    jobs: int = 1,
+    exclude: Iterable[str] = DEFAULT_EXCLUDES,
+    gitignore: bool = True,
+    fsync: bool = False,
+    window: Optional[int] = None,
+    check: bool = False,
+    matcher: Optional[NoticeMatcher] = None,
+    migrate: bool = False,
+    header: bool = False,
+    languages: Optional[Sequence[str]] = None,
+    report: Optional["Report"] = None,
+    journal: Optional[Path] = None,
+    resume: bool = False,
+    config: Optional["NoticeIndex"] = None,
+    years: Optional["FileYears"] = None,
+) -> bool:  # This is a an entry point in pyproject.toml
     """Appends the copyright block all .py files in the current folder and,
     recursively, in subfolders.  Returns True if function was successful, False
-    otherwise."""
-    success = False
-    root_path = Path.cwd()
-    print(f"Processing path: {root_path}")
-    print("Marking all `*.py` files with the text block contained in `copyright.txt`.")
-
-    py_files = modules_list(root_path)
-
-    for item in py_files:
-        copyright_create(item)
-
-    success = True  # overwrite
-    return success
+    otherwise.
+
+    If `check` is True, no file is modified (a dry run): the files that would
+    be marked are reported instead, and False is returned if there are any.
+
+    Instead of the current working directory, the given `paths` are processed,
+    by `jobs` worker threads, skipping the `exclude` patterns and, if
+    `gitignore` is True, the `.gitignore` patterns; see `process_files`.  If a
+    `window` size is given, only the head and the tail of each file are
+    searched; see `copyright_exists`.  If `fsync` is True, each modified file is
+    flushed to disk.  If a `matcher` is given, files with any of its variants
+    of the block are left unmarked, or, if `migrate` is True, the variants are
+    replaced with the current block; see `process_file`.  If `header` is
+    True, the block is inserted at the top of each file, after any `#!` line
+    and encoding declaration, rather than appended.  The results are
+    written to the `report`, which defaults to command line messages; see
+    `report.make_report`.
+
+    If a `journal` file is given, the files done are recorded in it as the
+    run proceeds, and, if `resume` is True, the files recorded by an
+    interrupted run are skipped; see `journal.Journal`.
+
+    If the names of `languages` are given, the files of those languages are
+    processed instead of the Python files only; see `process_files`.  With
+    `check`, the source files inside archives among the `paths`, e.g., wheels,
+    are checked too; see `archive_results`.
+
+    If a `config` is given, each file is marked with the block of its
+    subtree, and the files it leaves out are skipped; see `process_files`.
+
+    If `years` are given, e.g., from one pass over the git history, each file
+    is marked with the block with the years in which it was changed, e.g.,
+    `2019-2026`, and the block found in it with other years, or as one of the
+    variants of the `matcher`, is replaced with it; with `check`, the files
+    whose block has other years are reported as missing it.  The files that
+    are not in the history are left as they are; see `vcs.FileYears`."""
+    op = Operation()
+
+    if notice is None:
+        notice = notice_template()  # loaded once for all files
+    if paths is None:
+        paths = [Path.cwd()]
+    report = _report(report)
+    if check:
+        report.start(
+            _processing_message(paths),
+            f"Checking, without marking, all {_kinds(languages)} for the text "
+            "block contained in `copyright.txt`.",
+        )
+    else:
+        report.start(
+            _processing_message(paths),
+            f"Marking all {_kinds(languages)} with the text block contained in `copyright.txt`.",
+        )
+
+    operation = op.status if check else op.create
+    if years is not None:
+        # Find the block with any years, to replace them, unless checking.
+        if check:
+            matcher = None
+        elif matcher is None:
+            matcher = NoticeMatcher([Variant(CURRENT, notice.text)], tolerant=True)
+        else:
+            matcher = NoticeMatcher(matcher.variants, tolerant=True)
+        migrate = True
+    mode = _mode(
+        window=window,
+        migrate=migrate,
+        header=header,
+        matcher=matcher,
+        config=config,
+        years=None if years is None else True,
+    )
+    run = _open_journal(
+        journal,
+        operation,
+        notice,
+        report,
+        mode=mode,
+        resume=resume,
+        fsync=fsync,
+        paths=paths,
+        exclude=exclude,
+        gitignore=gitignore,
+    )
+    results = process_files(
+        operation,
+        notice,
+        paths=paths,
+        jobs=jobs,
+        exclude=exclude,
+        gitignore=gitignore,
+        window=window,
+        fsync=fsync,
+        matcher=matcher,
+        migrate=migrate and not check,
+        header=header,
+        languages=languages,
+        skip=None if run is None else run.done,
+        config=config,
+        years=years,
+    )
+    if check:
+        archives = archive_results(
+            paths, notice, languages=languages, matcher=matcher, config=config
+        )
+        results = chain(results, archives)
+    _write_results(report, results, run)
+
+    report.finish()
+    return not report.errors and not (check and report.totals["missing"])
 
 
 """
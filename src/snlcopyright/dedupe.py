@@ -0,0 +1,124 @@
+"""This module keeps track, over one run, of the files already processed and of
+the contents already searched, so that a tree with many links to the same
+files, or many vendored copies of the same modules, is read and written no
+more than it needs to be.
+
+* A file reached by more than one path, through hard links or symbolic
+  links, is processed once, by the first of its paths, and each of the
+  others takes the outcome of the first; see `SeenFiles`.  No two paths to
+  the same file are ever processed at the same time, so the block is never
+  appended twice to it by two worker threads.
+* The status of contents already searched with a `NoticeMatcher`, which
+  decodes the contents and runs a regular expression, is taken from a memo
+  keyed by the hash of the contents; see `ContentMemo`.  The search for the
+  block as bytes, without a matcher, takes a fraction of the time it takes to
+  hash the contents, so it is not memoized.
+"""
+
+import hashlib
+import os
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Optional, Set, Tuple
+
+from snlcopyright import stats
+from snlcopyright.copyright_crud import Action, FileResult
+
+Status = Tuple[bool, Optional[str]]  # whether the block was found, the variant
+NO_PATH: Path = Path()  # the path of each outcome kept, shared
+
+
+class SeenFiles:
+    """The files processed in one run, by device and inode.
+
+    The outcome of every file is kept, without its path, since a file with a
+    single hard link may still be reached later through a symbolic link."""
+
+    def __init__(self):
+        self._lock = threading.Condition()
+        self._pending: Set[Tuple[int, int]] = set()  # being processed
+        self._done: Dict[Tuple[int, int], FileResult] = {}
+
+    def process(self, path: Path, func: Callable[[Path], FileResult]) -> FileResult:
+        """Returns `func(path)`, unless the file at `path` was processed
+        through another of its paths, in which case the outcome of that path
+        is returned for this one; see `linked_result`.  Waits for the other
+        path, if it is being processed."""
+        try:
+            info = os.stat(path)
+        except OSError:
+            return func(path)  # the error is reported by `func`
+        key = (info.st_dev, info.st_ino)
+
+        with self._lock:
+            while key in self._pending:
+                self._lock.wait()
+            first = self._done.get(key)
+            if first is None:
+                self._pending.add(key)
+        if first is not None:
+            stats.count("files_linked")
+            return linked_result(path, first)
+
+        result = None
+        try:
+            result = func(path)
+        finally:
+            with self._lock:
+                self._pending.discard(key)
+                if result is not None:
+                    self._done[key] = result._replace(path=NO_PATH)
+                self._lock.notify_all()
+        return result
+
+
+def linked_result(path: Path, first: FileResult) -> FileResult:
+    """Returns the result for the `path` to a file already processed through
+    another path, with the `first` result: the file is left unchanged, and the
+    block is found in it if it is found there now."""
+    act = Action()
+    if first.action == act.error:
+        return first._replace(path=path)
+    found = first.found
+    variant = first.variant
+    if first.action in (act.created, act.deleted):
+        found, variant = first.action == act.created, None
+    return FileResult(path=path, found=found, action=act.unchanged, variant=variant)
+
+
+class ContentMemo:
+    """The status of the contents searched in one run, by their hash."""
+
+    def __init__(self):
+        self._status: Dict[bytes, Status] = {}
+
+    @staticmethod
+    def key(data: bytes) -> bytes:
+        """Returns the key of the contents `data` in the memo."""
+        return hashlib.sha256(data).digest()
+
+    def get(self, key: bytes) -> Optional[Status]:
+        """Returns the status of the contents with the `key`, if searched."""
+        status = self._status.get(key)
+        if status is not None:
+            stats.count("files_duplicated")
+        return status
+
+    def put(self, key: bytes, status: Status) -> None:
+        """Records the `status` of the contents with the `key`."""
+        self._status[key] = status
+
+
+"""
+Copyright 2023 Sandia National Laboratories
+
+Notice: This computer software was prepared by National Technology and Engineering Solutions of
+Sandia, LLC, hereinafter the Contractor, under Contract DE-NA0003525 with the Department of Energy
+(DOE). All rights in the computer software are reserved by DOE on behalf of the United States
+Government and the Contractor as provided in the Contract. You are authorized to use this computer
+software for Governmental purposes but it is not to be released or distributed to the public.
+NEITHER THE U.S. GOVERNMENT NOR THE CONTRACTOR MAKES ANY WARRANTY, EXPRESS OR IMPLIED, OR ASSUMES
+ANY LIABILITY FOR THE USE OF THIS SOFTWARE. This notice including this sentence must appear on any
+copies of this computer software. Export of this data may require a license from the United States
+Government.
+"""
@@ -0,0 +1,127 @@
+"""This module provides an append-only journal of the files completed by a run
+that modifies files, so that an interrupted run can be resumed.
+
+The journal is a JSON Lines file.  Its first line identifies the run: the
+operation, and a hash of the copyright text block and of the mode of the run,
+as for the status cache; see `cache.notice_digest`.  Each later line records
+one file the run is done with, and what was done to it, and is flushed as
+soon as it is written, so that a run stopped by a timeout, by Ctrl-C, or by
+the loss of its node, leaves a record of its progress behind.  A file that
+could not be processed is not recorded, so that it is tried again.
+
+A run that resumes from the journal skips the files recorded by the same
+kind of run, and appends to the journal in turn.  A run that completes
+removes the journal.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import IO, Optional, Set
+
+from snlcopyright.cache import notice_digest
+from snlcopyright.copyright_crud import Action, FileResult
+
+JOURNAL_VERSION: int = 1  # bump when the on-disk format changes
+
+
+class Journal:
+    """The journal at `path` of a run of the `operation` with the copyright
+    text block `notice_text`, searched for in the given `mode`.  If `resume`
+    is True, the files recorded by an earlier run of the same kind are read
+    into `done`, and the journal is appended to; otherwise, it is started
+    anew.  If `fsync` is True, each record is flushed to disk."""
+
+    def __init__(
+        self,
+        path: Path,
+        operation: str,
+        notice_text: str,
+        *,
+        mode: str = "",
+        resume: bool = False,
+        fsync: bool = False,
+    ):
+        self.path = Path(path)
+        self.fsync = fsync
+        self.done: Set[str] = set()  # the absolute paths of the files done
+        header = {
+            "journal": JOURNAL_VERSION,
+            "operation": operation,
+            "notice": notice_digest(notice_text, mode),
+        }
+        if resume:
+            self.done = _read(self.path, header)
+
+        fresh = not self.done
+        self._file: Optional[IO[str]] = open(self.path, mode="w" if fresh else "a")
+        if fresh:
+            self._write(header)
+
+    def record(self, result: FileResult) -> None:
+        """Records that the run is done with the file of the `result`, unless
+        it could not be processed."""
+        if result.action != Action().error:
+            self._write({"path": key(result.path), "action": result.action})
+
+    def close(self, complete: bool = False) -> None:
+        """Closes the journal, and removes it if the run is `complete`."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if complete:
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+
+    def _write(self, data: dict) -> None:
+        assert self._file is not None
+        self._file.write(json.dumps(data) + "\n")
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+
+def key(path: Path) -> str:
+    """Returns the key of the file at `path` in the journal: its absolute
+    path, so that a run resumed from another directory finds it."""
+    return os.path.abspath(str(path))
+
+
+def _read(path: Path, header: dict) -> Set[str]:
+    """Returns the files recorded in the journal at `path`, if it was written
+    by a run with the same `header`, or else none.  A last line cut short by
+    the interruption is ignored."""
+    done: Set[str] = set()
+    try:
+        with open(path, mode="r") as fin:
+            lines = iter(fin)
+            try:
+                if json.loads(next(lines)) != header:
+                    return done
+            except (StopIteration, ValueError):
+                return done
+            for line in lines:
+                try:
+                    done.add(json.loads(line)["path"])
+                except (ValueError, KeyError, TypeError):
+                    continue
+    except OSError:
+        pass  # no journal yet
+    return done
+
+
+"""
+Copyright 2023 Sandia National Laboratories
+
+Notice: This computer software was prepared by National Technology and Engineering Solutions of
+Sandia, LLC, hereinafter the Contractor, under Contract DE-NA0003525 with the Department of Energy
+(DOE). All rights in the computer software are reserved by DOE on behalf of the United States
+Government and the Contractor as provided in the Contract. You are authorized to use this computer
+software for Governmental purposes but it is not to be released or distributed to the public.
+NEITHER THE U.S. GOVERNMENT NOR THE CONTRACTOR MAKES ANY WARRANTY, EXPRESS OR IMPLIED, OR ASSUMES
+ANY LIABILITY FOR THE USE OF THIS SOFTWARE. This notice including this sentence must appear on any
+copies of this computer software. Export of this data may require a license from the United States
+Government.
+"""
@@ -0,0 +1,188 @@
+"""This module maps source files to their language, and renders the copyright
+text block in the comment style of each language.
+
+The `copyright.txt` file holds the block as a Python docstring.  For the
+other languages, the lines between the quotes are rendered as a comment,
+either with a prefix on each line, e.g., `# ` or `// `, or between the start
+and end markers of a block comment, e.g., `/*` and `*/`.  Each block is
+rendered once per run, for each style in use, rather than once per file.
+
+Files are classified by their name, e.g., `CMakeLists.txt`, or else by their
+suffix, e.g., `.cpp`, with plain dictionary lookups, as they are found during
+the walk of the tree; see `walk.iter_sources`.
+"""
+
+import os
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, NamedTuple, Optional, Tuple
+
+
+class CommentStyle(NamedTuple):
+    """How a block of text is written as a comment in a language."""
+
+    name: str
+    prefix: str = ""  # the start of each line of a line comment
+    start: str = ""  # the line before a block comment
+    end: str = ""  # the line after a block comment
+
+
+class Language(NamedTuple):
+    """A language, its comment style, and the names of its files."""
+
+    name: str
+    style: str  # the name of one of the `STYLES`
+    suffixes: Tuple[str, ...]
+    filenames: Tuple[str, ...] = ()
+
+
+DOCSTRING = CommentStyle("docstring", start='"""', end='"""')  # copyright.txt
+
+STYLES: Dict[str, CommentStyle] = {
+    style.name: style
+    for style in (
+        DOCSTRING,
+        CommentStyle("hash", prefix="#"),
+        CommentStyle("slashes", prefix="//"),
+        CommentStyle("c-block", start="/*", end="*/"),
+        CommentStyle("bang", prefix="!"),
+        CommentStyle("dashes", prefix="--"),
+    )
+}
+
+PYTHON = Language("python", DOCSTRING.name, (".py",))
+
+LANGUAGES: Dict[str, Language] = {
+    language.name: language
+    for language in (
+        PYTHON,
+        Language("shell", "hash", (".sh", ".bash", ".zsh", ".ksh")),
+        Language("cmake", "hash", (".cmake",), ("CMakeLists.txt",)),
+        Language("make", "hash", (".mk",), ("Makefile", "GNUmakefile")),
+        Language("perl", "hash", (".pl", ".pm")),
+        Language("ruby", "hash", (".rb",)),
+        Language("r", "hash", (".r", ".R")),
+        Language("yaml", "hash", (".yaml", ".yml")),
+        Language("c", "c-block", (".c", ".h")),
+        Language("cpp", "slashes", (".cc", ".cpp", ".cxx", ".hh", ".hpp", ".hxx")),
+        Language("cuda", "slashes", (".cu", ".cuh")),
+        Language("java", "slashes", (".java",)),
+        Language("javascript", "slashes", (".js", ".ts")),
+        Language("go", "slashes", (".go",)),
+        Language("rust", "slashes", (".rs",)),
+        Language(
+            "fortran", "bang", (".f", ".F", ".f90", ".F90", ".f95", ".f03", ".f08")
+        ),
+        Language("sql", "dashes", (".sql",)),
+        Language("lua", "dashes", (".lua",)),
+        Language("haskell", "dashes", (".hs",)),
+        Language("ada", "dashes", (".adb", ".ads")),
+    )
+}
+
+ALL = "all"  # selects every language in `LANGUAGES`
+
+
+def select(names: Optional[Iterable[str]] = None) -> Tuple[Language, ...]:
+    """Returns the languages with the given `names`, all of them if one of the
+    names is `ALL`, or Python only if no names are given.  Raises ValueError
+    for an unknown name."""
+    if not names:
+        return (PYTHON,)
+    names = tuple(names)
+    if ALL in names:
+        return tuple(LANGUAGES.values())
+
+    unknown = [name for name in names if name not in LANGUAGES]
+    if unknown:
+        raise ValueError(f"Error: unknown language(s) {', '.join(unknown)}.")
+    return tuple(LANGUAGES[name] for name in dict.fromkeys(names))
+
+
+def classifier(
+    languages: Iterable[Language],
+) -> Callable[[str], Optional[Language]]:
+    """Returns a function that maps a file name to its language among the
+    `languages`, or to None if it is not a file of any of them."""
+    by_filename: Dict[str, Language] = {}
+    by_suffix: Dict[str, Language] = {}
+    for language in languages:
+        by_filename.update(dict.fromkeys(language.filenames, language))
+        by_suffix.update(dict.fromkeys(language.suffixes, language))
+
+    def classify(name: str) -> Optional[Language]:
+        language = by_filename.get(name)
+        if language is None:
+            language = by_suffix.get(os.path.splitext(name)[1])
+        return language
+
+    return classify
+
+
+def patterns(languages: Iterable[Language]) -> Tuple[str, ...]:
+    """Returns the suffixes and file names of the `languages`, e.g., for
+    `vcs.changed_files`, which keeps the names that end with one of them."""
+    items: Tuple[str, ...] = ()
+    for language in languages:
+        items += language.suffixes + language.filenames
+    return items
+
+
+def body(text: str) -> str:
+    """Returns the lines of the copyright block in `text` without the docstring
+    quotes of `copyright.txt`, if any."""
+    lines = text.strip("\n").split("\n")
+    if len(lines) >= 2 and lines[0] == DOCSTRING.start and lines[-1] == DOCSTRING.end:
+        lines = lines[1:-1]
+    return "\n".join(lines)
+
+
+@lru_cache(maxsize=None)
+def render(text: str, style: str) -> str:
+    """Returns the copyright block in `text`, as written in `copyright.txt`,
+    written in the comment `style` instead.  The `text` is returned as is for
+    the docstring style, and empty text, e.g., for a deletion, stays empty.
+
+    The result is cached, so each block is rendered once per style."""
+    if style == DOCSTRING.name or not text:
+        return text
+
+    comment = STYLES[style]
+    lines = body(text).split("\n")
+    if comment.prefix:
+        return "\n".join(f"{comment.prefix} {line}".rstrip() for line in lines)
+    return "\n".join([comment.start] + lines + [comment.end])
+
+
+@lru_cache(maxsize=None)
+def needles(text: str) -> Tuple[bytes, bytes]:
+    """Returns the rendered copyright block `text` encoded as UTF-8, as it is
+    found in a file with `\n` line endings, and in one with `\r\n` line
+    endings, so that files are searched as bytes, without being decoded.
+
+    The result is cached, so each block is encoded once per run."""
+    encoded = text.encode("utf-8")
+    return encoded, encoded.replace(b"\n", b"\r\n")
+
+
+_classify_any = classifier(LANGUAGES.values())
+
+
+def language_of(name: str) -> Language:
+    """Returns the language of the file `name` among all of the `LANGUAGES`,
+    or Python if it is not a file of any of them."""
+    return _classify_any(name) or PYTHON
+
+
+"""
+Copyright 2023 Sandia National Laboratories
+
+Notice: This computer software was prepared by National Technology and Engineering Solutions of
+Sandia, LLC, hereinafter the Contractor, under Contract DE-NA0003525 with the Department of Energy
+(DOE). All rights in the computer software are reserved by DOE on behalf of the United States
+Government and the Contractor as provided in the Contract. You are authorized to use this computer
+software for Governmental purposes but it is not to be released or distributed to the public.
+NEITHER THE U.S. GOVERNMENT NOR THE CONTRACTOR MAKES ANY WARRANTY, EXPRESS OR IMPLIED, OR ASSUMES
+ANY LIABILITY FOR THE USE OF THIS SOFTWARE. This notice including this sentence must appear on any
+copies of this computer software. Export of this data may require a license from the United States
+Government.
+"""
@@ -0,0 +1,178 @@
+"""This module finds any one of several variants of the copyright text block.
+
+Files may carry older versions of the copyright block, e.g., with another
+year, another contract number, or reflowed lines.  A NoticeMatcher compiles
+the known variants once into a single regular expression, so that each file
+is scanned in one pass, and reports which variant matched.
+
+In `tolerant` mode each variant also matches with any whitespace between its
+words, and with any year or year span, e.g., `2019` or `2019-2023`, in place
+of each of its years.
+"""
+
+import hashlib
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Pattern, Sequence, Tuple
+
+from snlcopyright.languages import DOCSTRING, render
+
+
+CURRENT: str = "current"  # the name of the variant that is the current block
+
+# A year, or a span of years, as written in a copyright block, but not the
+# digits of a longer number, e.g., a version or an identifier.
+YEARS: str = r"\b(?:19|20)\d\d(?:\s*[-,]\s*(?:19|20)\d\d)*\b"
+
+
+class Variant(NamedTuple):
+    """A known version of the copyright text block."""
+
+    name: str  # e.g., the file name it was read from
+    text: str
+
+
+class Match(NamedTuple):
+    """Where a variant was found in a text."""
+
+    variant: str  # the name of the variant
+    start: int
+    end: int
+
+
+def tolerant_pattern(text: str) -> str:
+    """Returns a regular expression that matches `text` with any whitespace
+    between its words, and with any year or year span in place of its years."""
+    words = []
+    for word in text.split():
+        parts = re.split(f"({YEARS})", word)
+        words.append(
+            "".join(
+                YEARS if ii % 2 else re.escape(part) for ii, part in enumerate(parts)
+            )
+        )
+    return r"\s+".join(words)
+
+
+def with_years(text: str, years: str) -> str:
+    """Returns `text` with `years`, e.g., `2019-2026`, in place of each of its
+    years or year spans, as matched in `tolerant` mode."""
+    return re.sub(YEARS, lambda match: years, text)
+
+
+class NoticeMatcher:
+    """Finds any of the `variants` of the copyright text block in a text, with a
+    single regular expression compiled once."""
+
+    def __init__(self, variants: Sequence[Variant], tolerant: bool = False):
+        if not variants:
+            raise ValueError("Error: no copyright text block variants were given.")
+        self.variants = tuple(variants)
+        self.tolerant = tolerant
+        self._newlines: Dict[str, "NoticeMatcher"] = {}  # see `with_newline`
+
+        patterns = []
+        for ii, variant in enumerate(self.variants):
+            body = (
+                tolerant_pattern(variant.text) if tolerant else re.escape(variant.text)
+            )
+            patterns.append(f"(?P<v{ii}>{body})")
+        self.regex: Pattern = re.compile("|".join(patterns))
+
+        # The longest text any variant may match, give or take whitespace.
+        self.max_length = max(len(variant.text.encode("utf-8")) for variant in variants)
+
+    @classmethod
+    def from_files(
+        cls, current: str, paths: Iterable[Path], tolerant: bool = False
+    ) -> "NoticeMatcher":
+        """Returns a NoticeMatcher for the `current` text block and for the
+        variants read from the files at `paths`, each named after its file."""
+        variants = [Variant(name=CURRENT, text=current)]
+        for path in paths:
+            with open(path, mode="r") as fin:
+                variants.append(Variant(name=Path(path).name, text=fin.read()))
+        return cls(variants, tolerant=tolerant)
+
+    def rendered(self, style: str) -> "NoticeMatcher":
+        """Returns a NoticeMatcher for the variants written in the comment
+        `style` of another language; see `languages.render`."""
+        if style == DOCSTRING.name:
+            return self
+        variants = [
+            item._replace(text=render(item.text, style)) for item in self.variants
+        ]
+        return NoticeMatcher(variants, tolerant=self.tolerant)
+
+    def with_current(self, text: str) -> "NoticeMatcher":
+        """Returns a NoticeMatcher for the same variants, but with `text` as
+        the current block, e.g., for a subtree with its own block."""
+        variants = [Variant(name=CURRENT, text=text)]
+        variants.extend(item for item in self.variants if item.name != CURRENT)
+        return NoticeMatcher(variants, tolerant=self.tolerant)
+
+    def with_newline(self, newline: str) -> "NoticeMatcher":
+        """Returns a NoticeMatcher for the same variants, but with `newline`
+        line endings, e.g., `\r\n`, made once for each line ending."""
+        if newline == "\n":
+            return self
+        matcher = self._newlines.get(newline)
+        if matcher is None:
+            variants = [
+                item._replace(text=item.text.replace("\n", newline))
+                for item in self.variants
+            ]
+            matcher = NoticeMatcher(variants, tolerant=self.tolerant)
+            self._newlines[newline] = matcher
+        return matcher
+
+    def digest(self) -> str:
+        """Returns a hash that identifies the variants and the mode."""
+        hasher = hashlib.sha256(b"tolerant" if self.tolerant else b"exact")
+        for variant in self.variants:
+            hasher.update(b"\0" + variant.text.encode("utf-8"))
+        return hasher.hexdigest()
+
+    def _match(self, match: "re.Match") -> Match:
+        name = self.variants[int(match.lastgroup[1:])].name
+        return Match(variant=name, start=match.start(), end=match.end())
+
+    def search(self, text: str) -> Optional[Match]:
+        """Returns the first variant found in `text`, or None."""
+        match = self.regex.search(text)
+        return None if match is None else self._match(match)
+
+    def find_all(self, text: str) -> List[Match]:
+        """Returns every variant found in `text`, in order."""
+        return [self._match(match) for match in self.regex.finditer(text)]
+
+    def sub(self, new: str, text: str) -> Tuple[str, List[Match]]:
+        """Replaces every variant found in `text` with `new`.  Returns the new
+        text and the matches that were replaced."""
+        matches = self.find_all(text)
+        if not matches:
+            return text, matches
+
+        pieces = []
+        position = 0
+        for match in matches:
+            pieces.append(text[position : match.start])
+            pieces.append(new)
+            position = match.end
+        pieces.append(text[position:])
+        return "".join(pieces), matches
+
+
+"""
+Copyright 2023 Sandia National Laboratories
+
+Notice: This computer software was prepared by National Technology and Engineering Solutions of
+Sandia, LLC, hereinafter the Contractor, under Contract DE-NA0003525 with the Department of Energy
+(DOE). All rights in the computer software are reserved by DOE on behalf of the United States
+Government and the Contractor as provided in the Contract. You are authorized to use this computer
+software for Governmental purposes but it is not to be released or distributed to the public.
+NEITHER THE U.S. GOVERNMENT NOR THE CONTRACTOR MAKES ANY WARRANTY, EXPRESS OR IMPLIED, OR ASSUMES
+ANY LIABILITY FOR THE USE OF THIS SOFTWARE. This notice including this sentence must appear on any
+copies of this computer software. Export of this data may require a license from the United States
+Government.
+"""
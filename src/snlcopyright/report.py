@@ -0,0 +1,304 @@
+"""This module writes the results of a run over many files as a report.
+
+Each report writes the results as they are produced, rather than collecting
+them first, and keeps running totals for a summary at the end.
+
+* text: the command line messages, one or more lines per file (the default).
+* jsonl: one JSON object per file, then one with the summary.
+* json: one JSON document, with a list of files and the summary.
+* summary: only the summary.
+
+With `quiet`, the text report writes only the files that are missing the
+copyright block or could not be processed.
+
+With more than one of the `roots` of a run, e.g., the checkouts of many
+repositories, each report also keeps the totals of each root, and ends with
+them.
+"""
+
+import json
+import os
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, TextIO
+
+from snlcopyright.copyright_crud import Action, FileResult, print_result
+
+
+FORMATS = ("text", "json", "jsonl", "summary")
+
+
+class Report:
+    """Counts the results of a run, in total and, if more than one of the
+    `roots` is given, per root.  Subclasses also write them to `stream`,
+    which defaults to the standard output."""
+
+    def __init__(
+        self,
+        stream: Optional[TextIO] = None,
+        quiet: bool = False,
+        roots: Optional[Sequence[Path]] = None,
+    ):
+        self._stream = stream
+        self.quiet = quiet
+        self.totals: Counter = Counter()
+        self.errors: List[FileResult] = []
+        self.root_totals: Dict[str, Counter] = {}  # root: totals, in order
+        self._roots: Dict[str, str] = {}  # absolute and real path: root
+        if roots is not None and len(roots) > 1:
+            self.root_totals = {str(root): Counter() for root in roots}
+            for root in roots:
+                for name in (os.path.abspath(root), os.path.realpath(root)):
+                    self._roots.setdefault(name, str(root))
+
+    @property
+    def stream(self) -> TextIO:
+        """The stream the report is written to."""
+        return sys.stdout if self._stream is None else self._stream
+
+    def start(self, *lines: str) -> None:
+        """Starts the report, with the lines that describe the run."""
+
+    def note(self, line: str) -> None:
+        """Adds a line of information about the run as a whole."""
+
+    def write(self, result: FileResult) -> None:
+        """Adds the result for one file."""
+        _count(self.totals, result)
+        if self.root_totals:
+            root = self._root(result.path)
+            if root is not None:
+                _count(self.root_totals[root], result)
+        if result.action == Action().error:
+            self.errors.append(result)
+
+    def _root(self, path: Path) -> Optional[str]:
+        """Returns the innermost of the roots that contains `path`, if any.  The
+        roots, as given, and the `path` are compared as absolute paths, or as
+        real paths, e.g., for the files reported by git."""
+        for name in _ancestors(os.path.abspath(path)):
+            root = self._roots.get(name)
+            if root is not None:
+                return root
+        return None
+
+    def finish(self) -> None:
+        """Finishes the report."""
+
+    def summary(self) -> Dict[str, int]:
+        """Returns the totals of the run, by status and by action."""
+        return _summary(self.totals)
+
+    def root_summaries(self) -> Dict[str, Dict[str, int]]:
+        """Returns the totals of each root of the run, as `summary` does, or
+        none if the run has only one root."""
+        return {root: _summary(totals) for root, totals in self.root_totals.items()}
+
+    def root_lines(self) -> Iterator[str]:
+        """Yields one line with the totals of each root of the run."""
+        for root, totals in self.root_totals.items():
+            yield (
+                f"{root}: {totals['files']} file(s), {totals['found']} found, "
+                f"{totals['missing']} missing, {totals[Action().error]} error(s)"
+            )
+
+
+def _count(totals: Counter, result: FileResult) -> None:
+    """Adds the `result` for one file to the `totals`."""
+    totals["files"] += 1
+    totals["found" if result.found else "missing"] += 1
+    totals[result.action] += 1
+
+
+def _summary(totals: Counter) -> Dict[str, int]:
+    """Returns the `totals` by status and by action."""
+    keys = ("files", "found", "missing") + tuple(Action())
+    return {key: totals[key] for key in keys}
+
+
+def _ancestors(name: str) -> Iterator[str]:
+    """Yields the path `name` and each of its parents, innermost first.  The
+    path of a file inside an archive, `<archive>!<member>`, is followed by
+    the path of the archive, and a relative path ends with `.`; see
+    `archive.member_path`."""
+    while True:
+        yield name
+        archive, mark, _ = name.partition("!")
+        parent = archive if mark else (os.path.dirname(name) or os.curdir)
+        if parent == name:
+            return
+        name = parent
+
+
+def is_failure(result: FileResult) -> bool:
+    """Returns True if the file is left without the copyright block, or could
+    not be processed."""
+    act = Action()
+    if result.action == act.error:
+        return True
+    return result.action == act.unchanged and not result.found
+
+
+class TextReport(Report):
+    """Writes the command line messages for each file, and lists the files
+    that could not be processed at the end.  If `only_found` is True, only
+    the files in which the copyright block was found are written."""
+
+    def __init__(
+        self,
+        stream: Optional[TextIO] = None,
+        quiet: bool = False,
+        only_found: bool = False,
+        roots: Optional[Sequence[Path]] = None,
+    ):
+        super().__init__(stream=stream, quiet=quiet, roots=roots)
+        self.only_found = only_found
+
+    def _print(self, line: str) -> None:
+        print(line, file=self.stream)
+
+    def start(self, *lines: str) -> None:
+        if not self.quiet:
+            for line in lines:
+                self._print(line)
+
+    def note(self, line: str) -> None:
+        if not self.quiet:
+            self._print(line)
+
+    def write(self, result: FileResult) -> None:
+        super().write(result)
+        if result.action == Action().error:
+            return  # listed at the end
+        if self.only_found and not result.found:
+            return
+        if self.quiet and not is_failure(result):
+            return
+        print_result(result, file=self.stream)
+
+    def finish(self) -> None:
+        if self.errors:
+            self._print(f"{len(self.errors)} file(s) could not be processed:")
+            for result in self.errors:
+                print_result(result, file=self.stream)
+        if self.root_totals and not self.quiet:
+            self._print(f"Totals of the {len(self.root_totals)} roots:")
+            for line in self.root_lines():
+                self._print(line)
+
+
+def result_dict(result: FileResult) -> Dict[str, Any]:
+    """Returns the JSON representation of one FileResult."""
+    return {
+        "path": str(result.path),
+        "found": result.found,
+        "action": result.action,
+        "error": None if result.error is None else str(result.error),
+        "variant": result.variant,
+    }
+
+
+def summary_dict(report: Report) -> Dict[str, Any]:
+    """Returns the JSON representation of the totals of the `report`, with
+    those of each root, if there are more than one, as `"roots"`."""
+    data: Dict[str, Any] = {"summary": report.summary()}
+    if report.root_totals:
+        data["roots"] = report.root_summaries()
+    return data
+
+
+class JsonLinesReport(Report):
+    """Writes one JSON object per line for each file, then one JSON object
+    with the summary, as `{"summary": {...}}`, and the summary of each root,
+    if there are more than one, as `"roots": {root: {...}}`."""
+
+    def _dump(self, data: Dict[str, Any]) -> None:
+        self.stream.write(json.dumps(data) + "\n")
+
+    def write(self, result: FileResult) -> None:
+        super().write(result)
+        if not self.quiet or is_failure(result):
+            self._dump(result_dict(result))
+
+    def finish(self) -> None:
+        self._dump(summary_dict(self))
+
+
+class JsonReport(Report):
+    """Writes one JSON document, `{"files": [...], "summary": {...}}`, one file
+    at a time, with the summary of each root, if there are more than one, as
+    `"roots": {root: {...}}`."""
+
+    def __init__(
+        self,
+        stream: Optional[TextIO] = None,
+        quiet: bool = False,
+        roots: Optional[Sequence[Path]] = None,
+    ):
+        super().__init__(stream=stream, quiet=quiet, roots=roots)
+        self._first = True
+
+    def start(self, *lines: str) -> None:
+        self.stream.write('{"files": [')
+
+    def write(self, result: FileResult) -> None:
+        super().write(result)
+        if self.quiet and not is_failure(result):
+            return
+        separator = "\n" if self._first else ",\n"
+        self.stream.write(separator + json.dumps(result_dict(result)))
+        self._first = False
+
+    def finish(self) -> None:
+        totals = json.dumps(summary_dict(self))[1:]  # the keys after "files"
+        self.stream.write("\n], " + totals + "\n")
+
+
+class SummaryReport(Report):
+    """Writes only the totals, at the end, then those of each root."""
+
+    def finish(self) -> None:
+        for key, value in self.summary().items():
+            print(f"{key}: {value}", file=self.stream)
+        for line in self.root_lines():
+            print(line, file=self.stream)
+
+
+def make_report(
+    format: str = "text",
+    *,
+    stream: Optional[TextIO] = None,
+    quiet: bool = False,
+    only_found: bool = False,
+    roots: Optional[Sequence[Path]] = None,
+) -> Report:
+    """Returns a report that writes the results in the given `format`, one of
+    `FORMATS`, with the totals of each of the `roots`, if more than one.  The
+    `only_found` option applies to the text format only."""
+    if format == "text":
+        return TextReport(
+            stream=stream, quiet=quiet, only_found=only_found, roots=roots
+        )
+    if format == "jsonl":
+        return JsonLinesReport(stream=stream, quiet=quiet, roots=roots)
+    if format == "json":
+        return JsonReport(stream=stream, quiet=quiet, roots=roots)
+    if format == "summary":
+        return SummaryReport(stream=stream, quiet=quiet, roots=roots)
+    raise ValueError(f"Error: unknown report format `{format}`.")
+
+
+"""
+Copyright 2023 Sandia National Laboratories
+
+Notice: This computer software was prepared by National Technology and Engineering Solutions of
+Sandia, LLC, hereinafter the Contractor, under Contract DE-NA0003525 with the Department of Energy
+(DOE). All rights in the computer software are reserved by DOE on behalf of the United States
+Government and the Contractor as provided in the Contract. You are authorized to use this computer
+software for Governmental purposes but it is not to be released or distributed to the public.
+NEITHER THE U.S. GOVERNMENT NOR THE CONTRACTOR MAKES ANY WARRANTY, EXPRESS OR IMPLIED, OR ASSUMES
+ANY LIABILITY FOR THE USE OF THIS SOFTWARE. This notice including this sentence must appear on any
+copies of this computer software. Export of this data may require a license from the United States
+Government.
+"""
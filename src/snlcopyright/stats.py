@@ -0,0 +1,193 @@
+"""This module records counters and timings for each phase of a run, so that a
+slow run can be traced to the walk, the reads, the matching or the writes.
+
+Recording is switched on for the duration of a `recording` block, e.g.,
+
+    from snlcopyright import stats
+
+    with stats.recording() as recorder:
+        copyright_crud.copyright_status(paths=[Path("src")], jobs=4)
+    for line in recorder.lines():
+        print(line)
+
+The instrumented functions call `timed`, `count` and `file_timer`, or are
+decorated with `phase`, which do nothing but check a module attribute when no
+recording is active.  With many worker threads, the time of each phase is
+summed over the threads, so it may exceed the wall time of the run.
+"""
+
+import contextlib
+import functools
+import heapq
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
+
+PHASES: Tuple[str, ...] = ("walk", "read", "match", "write")
+COUNTERS: Tuple[str, ...] = (
+    "directories",
+    "files_matched",
+    "files_processed",
+    "files_linked",
+    "files_duplicated",
+    "bytes_read",
+    "bytes_written",
+)
+
+
+class Stats:
+    """Counters and per-phase timings of one run, and the `slowest` files."""
+
+    def __init__(self, slowest: int = 10):
+        self.slowest = slowest
+        self.counters: Counter = Counter()
+        self.seconds: Dict[str, float] = dict.fromkeys(PHASES, 0.0)
+        self.wall_seconds = 0.0
+        self._files: List[Tuple[float, str]] = []  # a min-heap of the slowest
+        self._lock = threading.Lock()  # the worker threads share the stats
+
+    def add_time(self, phase: str, seconds: float) -> None:
+        """Adds the `seconds` spent in the `phase`."""
+        with self._lock:
+            self.seconds[phase] = self.seconds.get(phase, 0.0) + seconds
+
+    def add_count(self, name: str, n: int = 1) -> None:
+        """Adds `n` to the counter `name`."""
+        with self._lock:
+            self.counters[name] += n
+
+    def add_file(self, path: Path, seconds: float) -> None:
+        """Records that the file at `path` took `seconds` to process."""
+        with self._lock:
+            self.counters["files_processed"] += 1
+            item = (seconds, str(path))
+            if len(self._files) < self.slowest:
+                heapq.heappush(self._files, item)
+            elif self._files and item > self._files[0]:
+                heapq.heapreplace(self._files, item)
+
+    def slowest_files(self) -> List[Tuple[float, str]]:
+        """Returns the slowest files and their times, the slowest first."""
+        return sorted(self._files, reverse=True)
+
+    def summary(self) -> Dict[str, object]:
+        """Returns the counters, the timings and the slowest files as a dict,
+        e.g., for a JSON report."""
+        return {
+            "counters": {name: self.counters[name] for name in COUNTERS},
+            "seconds": dict(self.seconds, wall=self.wall_seconds),
+            "slowest": [
+                {"path": path, "seconds": seconds}
+                for seconds, path in self.slowest_files()
+            ],
+        }
+
+    def lines(self) -> List[str]:
+        """Returns the summary as lines of text."""
+        lines = ["Statistics:"]
+        for name in COUNTERS:
+            lines.append(f"  {name.replace('_', ' ')}: {self.counters[name]}")
+        for phase in PHASES:
+            lines.append(f"  {phase} time: {self.seconds[phase]:.3f} s")
+        lines.append(f"  wall time: {self.wall_seconds:.3f} s")
+        if self._files:
+            lines.append(f"Slowest {len(self._files)} file(s):")
+            for seconds, path in self.slowest_files():
+                lines.append(f"  {seconds:.4f} s {path}")
+        return lines
+
+
+_active: Optional[Stats] = None  # the recording in progress, if any
+
+
+@contextlib.contextmanager
+def recording(recorder: Optional[Stats] = None) -> Iterator[Stats]:
+    """Records the stats of the code run within the block into the `recorder`,
+    which defaults to a new Stats, and yields it."""
+    global _active
+    if recorder is None:
+        recorder = Stats()
+    previous, _active = _active, recorder
+    start = time.perf_counter()
+    try:
+        yield recorder
+    finally:
+        recorder.wall_seconds += time.perf_counter() - start
+        _active = previous
+
+
+@contextlib.contextmanager
+def _timer(recorder: Stats, phase: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        recorder.add_time(phase, time.perf_counter() - start)
+
+
+@contextlib.contextmanager
+def _file_timer(recorder: Stats, path: Path) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        recorder.add_file(path, time.perf_counter() - start)
+
+
+_nothing = contextlib.nullcontext()
+
+
+def timed(phase: str) -> "contextlib.AbstractContextManager":
+    """Returns a context manager that adds the time spent in its block to the
+    `phase`, one of `PHASES`, if recording."""
+    recorder = _active
+    return _nothing if recorder is None else _timer(recorder, phase)
+
+
+def file_timer(path: Path) -> "contextlib.AbstractContextManager":
+    """Returns a context manager that records the time spent in its block as
+    the time to process the file at `path`, if recording."""
+    recorder = _active
+    return _nothing if recorder is None else _file_timer(recorder, path)
+
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def phase(name: str) -> Callable[[F], F]:
+    """Returns a decorator that adds the time spent in each call of the
+    decorated function to the phase `name`, one of `PHASES`, if recording."""
+
+    def decorate(func: F) -> F:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with timed(name):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore
+
+    return decorate
+
+
+def count(name: str, n: int = 1) -> None:
+    """Adds `n` to the counter `name`, one of `COUNTERS`, if recording."""
+    recorder = _active
+    if recorder is not None:
+        recorder.add_count(name, n)
+
+
+"""
+Copyright 2023 Sandia National Laboratories
+
+Notice: This computer software was prepared by National Technology and Engineering Solutions of
+Sandia, LLC, hereinafter the Contractor, under Contract DE-NA0003525 with the Department of Energy
+(DOE). All rights in the computer software are reserved by DOE on behalf of the United States
+Government and the Contractor as provided in the Contract. You are authorized to use this computer
+software for Governmental purposes but it is not to be released or distributed to the public.
+NEITHER THE U.S. GOVERNMENT NOR THE CONTRACTOR MAKES ANY WARRANTY, EXPRESS OR IMPLIED, OR ASSUMES
+ANY LIABILITY FOR THE USE OF THIS SOFTWARE. This notice including this sentence must appear on any
+copies of this computer software. Export of this data may require a license from the United States
+Government.
+"""
@@ -0,0 +1,182 @@
+"""This module limits the rate at which a run reads and writes files, and lowers
+the priority of the process, so that a run over a large tree on a shared file
+server, e.g., NFS, leaves room for the builds of others.
+
+Throttling is switched on for the duration of a `throttling` block, e.g.,
+
+    from snlcopyright import throttle
+
+    limits = throttle.Throttle(bytes_per_second=50 * 2**20, files_per_second=500)
+    with throttle.throttling(limits):
+        copyright_crud.copyright_status(paths=[Path("src")], jobs=4)
+
+The functions that read and write files call `transfer` with the number of
+bytes moved, and each file processed calls `file`, which wait as long as
+needed to keep within the limits, shared by all the worker threads, and do
+nothing but check a module attribute when no throttling is active.
+"""
+
+import contextlib
+import ctypes
+import os
+import platform
+import sys
+import threading
+import time
+from typing import Dict, Iterator, List, Optional
+
+# The units of a rate given as, e.g., `50M`, as for `rsync --bwlimit`.
+UNITS: Dict[str, int] = {"": 1, "K": 2**10, "M": 2**20, "G": 2**30}
+
+NICE_INCREMENT: int = 10  # added to the CPU nice value by `lower_priority`
+
+# The `ioprio_set` system call number of each Linux architecture, and its
+# arguments to set the lowest priority of the best-effort class of the
+# process, as `ionice -c 2 -n 7` does.  The idle class is not used, since a
+# run in it may never finish on a busy disk.
+IOPRIO_SET: Dict[str, int] = {
+    "x86_64": 251,
+    "i686": 289,
+    "aarch64": 30,
+    "armv7l": 314,
+    "ppc64le": 273,
+    "s390x": 282,
+    "riscv64": 30,
+}
+IOPRIO_WHO_PROCESS: int = 1
+IOPRIO_CLASS_BE: int = 2
+IOPRIO_CLASS_SHIFT: int = 13
+IOPRIO_LOWEST: int = 7
+
+
+class Bucket:
+    """A token bucket, which is filled at `rate` tokens per second, up to one
+    second's worth of tokens."""
+
+    def __init__(self, rate: float):
+        if rate <= 0:
+            raise ValueError(f"Error: the rate `{rate}` is not positive.")
+        self.rate = float(rate)
+        self._tokens = self.rate
+        self._time = time.monotonic()
+        self._lock = threading.Lock()
+
+    def take(self, n: float) -> float:
+        """Takes `n` tokens, and returns the seconds to wait until the bucket
+        holds them, if it held fewer.  The tokens are taken even then, so that
+        the takers that follow wait in turn."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.rate, self._tokens + (now - self._time) * self.rate)
+            self._time = now
+            self._tokens -= n
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+
+class Throttle:
+    """Limits the bytes read and written to `bytes_per_second`, and the files
+    processed to `files_per_second`, if given, and counts the seconds spent
+    waiting for either."""
+
+    def __init__(
+        self,
+        bytes_per_second: Optional[float] = None,
+        files_per_second: Optional[float] = None,
+    ):
+        self._bytes = None if bytes_per_second is None else Bucket(bytes_per_second)
+        self._files = None if files_per_second is None else Bucket(files_per_second)
+        self.waited = 0.0
+
+    def _wait(self, seconds: float) -> None:
+        if seconds > 0:
+            self.waited += seconds
+            time.sleep(seconds)
+
+    def transfer(self, n: int) -> None:
+        """Waits, if need be, after `n` bytes were read or written."""
+        if self._bytes is not None:
+            self._wait(self._bytes.take(n))
+
+    def file(self) -> None:
+        """Waits, if need be, before a file is processed."""
+        if self._files is not None:
+            self._wait(self._files.take(1))
+
+
+_active: Optional[Throttle] = None  # the throttling in progress, if any
+
+
+@contextlib.contextmanager
+def throttling(throttle: Throttle) -> Iterator[Throttle]:
+    """Applies the limits of the `throttle` to the code run within the block,
+    and yields it."""
+    global _active
+    previous, _active = _active, throttle
+    try:
+        yield throttle
+    finally:
+        _active = previous
+
+
+def transfer(n: int) -> None:
+    """Waits, if throttling, after `n` bytes were read or written."""
+    throttle = _active
+    if throttle is not None:
+        throttle.transfer(n)
+
+
+def file() -> None:
+    """Waits, if throttling, before a file is processed."""
+    throttle = _active
+    if throttle is not None:
+        throttle.file()
+
+
+def rate(text: str) -> float:
+    """Returns the positive rate given as `text`, e.g., `500`, `512K`, `50M`,
+    or `1.5G`, in units of 1024, as for `--bwlimit` and `--iops`."""
+    text = text.strip().upper().rstrip("B")
+    unit = text[-1:] if text[-1:] in UNITS else ""
+    rate = float(text[: len(text) - len(unit)]) * UNITS[unit]
+    if rate <= 0:
+        raise ValueError(f"Error: the rate `{text}` is not positive.")
+    return rate
+
+
+def lower_priority() -> List[str]:
+    """Lowers the CPU priority of this process, as `nice` does, and, on Linux,
+    its I/O priority, as `ionice -c 2 -n 7` does, for the threads started
+    from now on.  Returns the priorities that were lowered: `cpu`, `io`."""
+    lowered = []
+    if hasattr(os, "nice"):
+        try:
+            os.nice(NICE_INCREMENT)
+            lowered.append("cpu")
+        except OSError:
+            pass
+
+    number = IOPRIO_SET.get(platform.machine())
+    if sys.platform.startswith("linux") and number is not None:
+        try:
+            libc = ctypes.CDLL(None, use_errno=True)
+            priority = IOPRIO_CLASS_BE << IOPRIO_CLASS_SHIFT | IOPRIO_LOWEST
+            if libc.syscall(number, IOPRIO_WHO_PROCESS, 0, priority) == 0:
+                lowered.append("io")
+        except (OSError, AttributeError):
+            pass  # e.g., no libc to call
+    return lowered
+
+
+"""
+Copyright 2023 Sandia National Laboratories
+
+Notice: This computer software was prepared by National Technology and Engineering Solutions of
+Sandia, LLC, hereinafter the Contractor, under Contract DE-NA0003525 with the Department of Energy
+(DOE). All rights in the computer software are reserved by DOE on behalf of the United States
+Government and the Contractor as provided in the Contract. You are authorized to use this computer
+software for Governmental purposes but it is not to be released or distributed to the public.
+NEITHER THE U.S. GOVERNMENT NOR THE CONTRACTOR MAKES ANY WARRANTY, EXPRESS OR IMPLIED, OR ASSUMES
+ANY LIABILITY FOR THE USE OF THIS SOFTWARE. This notice including this sentence must appear on any
+copies of this computer software. Export of this data may require a license from the United States
+Government.
+"""
@@ -0,0 +1,199 @@
+"""This module asks git which files have changed, so that a pre-commit hook or
+a pull request check needs to process only those files instead of the whole
+repository, and in which years each file was changed, so that the years of
+its copyright block can be brought up to date.  Only the local repository is
+consulted; no network access is needed.
+"""
+
+import functools
+import os
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+def git(args: List[str], cwd: Path) -> str:
+    """Runs `git` with the given `args` in the `cwd` directory and returns its
+    standard output.  Raises RuntimeError if git is missing or fails."""
+    try:
+        completed = subprocess.run(
+            ["git"] + args,
+            cwd=str(cwd),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            universal_newlines=True,
+            check=True,
+        )
+    except FileNotFoundError:
+        raise RuntimeError("Error: git is not installed or not on the PATH.") from None
+    except subprocess.CalledProcessError as error:
+        message = f"Error: git {' '.join(args)}: {error.stderr.strip()}"
+        raise RuntimeError(message) from None
+    return completed.stdout
+
+
+def git_root(path: Path) -> Path:
+    """Returns the top level directory of the git work tree containing `path`."""
+    return Path(git(["rev-parse", "--show-toplevel"], cwd=path).strip()).resolve()
+
+
+def changed_files(
+    path: Path,
+    *,
+    base: Optional[str] = None,
+    staged: bool = False,
+    suffixes: Tuple[str, ...] = (".py",),
+) -> List[Path]:
+    """Returns the files with one of the `suffixes` in the git work tree
+    containing `path` that were added, copied, modified, or renamed:
+
+    * if `staged` is True, in the index relative to HEAD, as for a pre-commit
+      hook;
+    * else if a `base` revision is given, in the work tree relative to `base`,
+      e.g., `origin/main`, or `origin/main...HEAD` for the committed changes
+      of a branch only;
+    * else in the work tree relative to HEAD, along with the untracked files
+      that are not ignored.
+
+    Files that are deleted in the work tree are not returned.
+    """
+    root = git_root(path)
+    diff = ["diff", "--name-only", "-z", "--diff-filter=ACMR"]
+
+    if staged:
+        output = git(diff + ["--cached"], cwd=root)
+    elif base is not None:
+        output = git(diff + [base, "--"], cwd=root)
+    else:
+        output = git(diff + ["HEAD", "--"], cwd=root)
+        output += git(["ls-files", "-z", "--others", "--exclude-standard"], cwd=root)
+
+    names = sorted(set(name for name in output.split("\0") if name))
+    files = [root.joinpath(name) for name in names if name.endswith(suffixes)]
+    return [item for item in files if item.is_file()]
+
+
+def history_years(root: Path) -> Dict[str, Tuple[int, int]]:
+    """Returns the first and the last year in which each file was changed in
+    the history of the git work tree at `root`, by its path relative to
+    `root`, with `/` separators, as of the author dates of the commits.
+
+    The whole history is read in one pass of `git log --name-only`, line by
+    line as git writes it, rather than once per file.  The errors of git go
+    to a temporary file, rather than a pipe, which git could fill and then
+    block on while the output is read."""
+    command = [
+        "git",
+        "-c",
+        "core.quotepath=off",
+        "log",
+        "--name-only",
+        "--no-renames",
+        "--format=%x00%ad",
+        "--date=format:%Y",
+    ]
+    years: Dict[str, Tuple[int, int]] = {}
+    year = 0
+    with tempfile.TemporaryFile() as errors:
+        try:
+            process = subprocess.Popen(
+                command,
+                cwd=str(root),
+                stdout=subprocess.PIPE,
+                stderr=errors,
+                universal_newlines=True,
+                errors="surrogateescape",
+            )
+        except FileNotFoundError:
+            raise RuntimeError(
+                "Error: git is not installed or not on the PATH."
+            ) from None
+
+        assert process.stdout is not None
+        with process:
+            for line in process.stdout:
+                line = line.rstrip("\n")
+                if line.startswith("\0"):
+                    year = int(line[1:])
+                elif line:
+                    first, last = years.get(line, (year, year))
+                    years[line] = (min(first, year), max(last, year))
+        errors.seek(0)
+        message = errors.read().decode("utf-8", errors="replace").strip()
+    if process.returncode:
+        raise RuntimeError(f"Error: git log: {message}")
+    return years
+
+
+class FileYears:
+    """The first and the last year in which each file in one or more git work
+    trees was changed, where the files changed since the last commit, and the
+    untracked files, were changed this year; see `history_years`."""
+
+    def __init__(self, paths: Iterable[Path]):
+        self.year = time.localtime().tm_year
+        self._trees: Dict[str, Dict[str, Tuple[int, int]]] = {}
+        roots: List[Path] = []
+        for path in paths:
+            path = Path(path).resolve()
+            if any(item == path or item in path.parents for item in roots):
+                continue  # in a work tree already read
+            root = git_root(path if path.is_dir() else path.parent)
+            if root in roots:
+                continue
+            roots.append(root)
+            years = history_years(root)
+            for item in changed_files(root, suffixes=("",)):
+                name = item.relative_to(root).as_posix()
+                first, _ = years.get(name, (self.year, self.year))
+                years[name] = (min(first, self.year), self.year)
+            self._trees[str(root)] = years
+        self._realpath = functools.lru_cache(maxsize=None)(os.path.realpath)
+
+    def get(self, path: Path) -> Optional[Tuple[int, int]]:
+        """Returns the first and the last year in which the file at `path` was
+        changed, or None if it is not in any of the work trees, or is ignored.
+        """
+        directory, name = os.path.split(os.path.abspath(str(path)))
+        directory = self._realpath(directory)
+        parts = [name]
+        while True:
+            years = self._trees.get(directory)
+            if years is not None:
+                return years.get("/".join(reversed(parts)))
+            directory, name = os.path.split(directory)
+            if not name:
+                return None
+            parts.append(name)
+
+    def span(self, path: Path, written: bool = False) -> Optional[str]:
+        """Returns the years of the file at `path` as written in a copyright
+        block, e.g., `2019-2026`, or `2026` for a file of one year, or None;
+        see `get`.  If `written` is True, the years end this year, for a file
+        to be written now, so that the years of the block it is marked with
+        do not change when it is processed again, before or after the change
+        is committed."""
+        years = self.get(path)
+        if years is None:
+            return None
+        first, last = years
+        if written:
+            last = self.year
+        return str(first) if first == last else f"{first}-{last}"
+
+
+"""
+Copyright 2023 Sandia National Laboratories
+
+Notice: This computer software was prepared by National Technology and Engineering Solutions of
+Sandia, LLC, hereinafter the Contractor, under Contract DE-NA0003525 with the Department of Energy
+(DOE). All rights in the computer software are reserved by DOE on behalf of the United States
+Government and the Contractor as provided in the Contract. You are authorized to use this computer
+software for Governmental purposes but it is not to be released or distributed to the public.
+NEITHER THE U.S. GOVERNMENT NOR THE CONTRACTOR MAKES ANY WARRANTY, EXPRESS OR IMPLIED, OR ASSUMES
+ANY LIABILITY FOR THE USE OF THIS SOFTWARE. This notice including this sentence must appear on any
+copies of this computer software. Export of this data may require a license from the United States
+Government.
+"""
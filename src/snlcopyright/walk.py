@@ -0,0 +1,257 @@
+"""This module finds source files in a directory tree, one directory at a time.
+
+The walk is built on `os.scandir` and yields the files of each directory as
+soon as the directory is scanned, so processing may start before the walk is
+complete and memory use does not grow with the size of the tree.  Directories
+that match an exclude pattern, or a pattern in a `.gitignore` file, are pruned
+before they are entered.
+
+Exclude patterns use the `.gitignore` syntax:
+
+* `name` matches a file or directory with that name at any depth.
+* `name/` matches a directory only.
+* `a/b`, `/name` contain a slash, and match relative to the root of the walk
+  (or to the directory of the `.gitignore` file).
+* `*`, `?`, `[abc]` match within one path component, and `**` matches across
+  path components.
+* `!pattern` re-includes a path excluded by an earlier pattern.
+"""
+
+import os
+import re
+from pathlib import Path
+from typing import (
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Pattern,
+    Tuple,
+    TypeVar,
+)
+
+from snlcopyright import stats
+
+T = TypeVar("T")  # the kind of file, as given by a classifier; see `iter_sources`
+
+# Directories that hold tooling, environments, or build products rather than
+# source code, and that are never walked unless asked for.
+DEFAULT_EXCLUDES: Tuple[str, ...] = (
+    ".git/",
+    ".hg/",
+    ".svn/",
+    ".venv/",
+    ".tox/",
+    ".nox/",
+    ".eggs/",
+    ".mypy_cache/",
+    ".pytest_cache/",
+    "__pycache__/",
+    "*.egg-info/",
+    "build/",
+    "node_modules/",
+)
+
+
+class IgnoreRule(NamedTuple):
+    """One compiled exclude pattern."""
+
+    regex: Pattern  # matches the path relative to `base`, with `/` separators
+    negate: bool  # True for a `!pattern` that re-includes a path
+    dir_only: bool  # True for a `pattern/` that matches directories only
+    base: str  # the directory the pattern is relative to
+
+
+def glob_regex(pattern: str) -> str:
+    """Translates one `.gitignore`-style glob into a regular expression."""
+    out = []
+    ii, nn = 0, len(pattern)
+    while ii < nn:
+        cc = pattern[ii]
+        if pattern.startswith("**/", ii):
+            out.append("(?:.*/)?")
+            ii += 3
+            continue
+        if pattern.startswith("**", ii):
+            out.append(".*")
+            ii += 2
+            continue
+        if cc == "*":
+            out.append("[^/]*")
+        elif cc == "?":
+            out.append("[^/]")
+        elif cc == "[" and pattern.find("]", ii + 1) != -1:
+            jj = pattern.find("]", ii + 1)
+            body = pattern[ii + 1 : jj].replace("\\", "\\\\")
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            out.append(f"[{body}]")
+            ii = jj
+        else:
+            out.append(re.escape(cc))
+        ii += 1
+    return "".join(out)
+
+
+def compile_rule(pattern: str, base: str) -> Optional[IgnoreRule]:
+    """Compiles one `.gitignore`-style `pattern`, relative to the `base`
+    directory.  Returns None for blank lines and comments."""
+    pattern = pattern.strip()
+    if not pattern or pattern.startswith("#"):
+        return None
+
+    negate = pattern.startswith("!")
+    if negate:
+        pattern = pattern[1:]
+    if pattern.startswith("\\"):
+        pattern = pattern[1:]  # an escaped leading `!` or `#`
+
+    dir_only = pattern.endswith("/")
+    pattern = pattern.rstrip("/")
+    anchored = "/" in pattern
+    pattern = pattern.lstrip("/")
+    if not pattern:
+        return None
+
+    body = glob_regex(pattern)
+    if not anchored:
+        body = "(?:.*/)?" + body
+
+    return IgnoreRule(
+        regex=re.compile(body + r"\Z"), negate=negate, dir_only=dir_only, base=base
+    )
+
+
+def compile_rules(patterns: Iterable[str], base: str) -> Tuple[IgnoreRule, ...]:
+    """Compiles each of the `patterns`, relative to the `base` directory."""
+    rules = (compile_rule(pattern, base) for pattern in patterns)
+    return tuple(rule for rule in rules if rule is not None)
+
+
+def gitignore_rules(directory: str) -> Tuple[IgnoreRule, ...]:
+    """Returns the rules of the `.gitignore` file in `directory`, if any."""
+    try:
+        with open(os.path.join(directory, ".gitignore"), mode="r") as fin:
+            return compile_rules(fin, base=directory)
+    except (OSError, UnicodeDecodeError):
+        return ()
+
+
+def is_ignored(path: str, is_dir: bool, rules: Iterable[IgnoreRule]) -> bool:
+    """Returns True if the last of the `rules` that matches `path` excludes it."""
+    ignored = False
+    for rule in rules:
+        if rule.dir_only and not is_dir:
+            continue
+        relative = path[len(rule.base) :].lstrip(os.sep)
+        if os.sep != "/":
+            relative = relative.replace(os.sep, "/")
+        if rule.regex.match(relative):
+            ignored = not rule.negate
+    return ignored
+
+
+def iter_modules(
+    path: Path,
+    *,
+    suffixes: Tuple[str, ...] = (".py",),
+    exclude: Iterable[str] = DEFAULT_EXCLUDES,
+    gitignore: bool = True,
+) -> Iterator[Path]:
+    """Yields the files with one of the `suffixes` in the given path and in all
+    subdirectories, except for those matched by the `exclude` patterns or, if
+    `gitignore` is True, by the patterns in `.gitignore` files along the way.
+
+    Directories are walked depth first and entries in name order, so the
+    order of the files is stable from run to run.  Symbolic links to
+    directories are not followed.
+    """
+
+    def classify(name: str) -> Optional[bool]:
+        return True if name.endswith(suffixes) else None
+
+    for item, _ in iter_sources(path, classify, exclude=exclude, gitignore=gitignore):
+        yield item
+
+
+def iter_sources(
+    path: Path,
+    classify: Callable[[str], Optional[T]],
+    *,
+    exclude: Iterable[str] = DEFAULT_EXCLUDES,
+    gitignore: bool = True,
+) -> Iterator[Tuple[Path, T]]:
+    """Yields each file in the given path and in all subdirectories for which
+    `classify` returns a kind, e.g., its language, given the file name, along
+    with that kind, so that files of many kinds are found in a single walk.
+    Files and directories are skipped and ordered as by `iter_modules`.
+    """
+    root = os.path.abspath(str(path))
+    base_rules = compile_rules(exclude, base=root)
+
+    # Directories not yet walked, and the rules that apply inside each.
+    stack: List[Tuple[str, Tuple[IgnoreRule, ...]]] = [(root, base_rules)]
+
+    while stack:
+        directory, rules = stack.pop()
+        with stats.timed("walk"):
+            files, subdirectories = scan(directory, rules, classify, gitignore)
+        stats.count("directories")
+        stats.count("files_matched", len(files))
+
+        yield from files
+        stack.extend(reversed(subdirectories))
+
+
+def scan(
+    directory: str,
+    rules: Tuple[IgnoreRule, ...],
+    classify: Callable[[str], Optional[T]],
+    gitignore: bool,
+) -> Tuple[List[Tuple[Path, T]], List[Tuple[str, Tuple[IgnoreRule, ...]]]]:
+    """Returns the classified files in one `directory`, and its subdirectories
+    along with the rules that apply inside each, given the `rules` that apply
+    to the `directory`; see `iter_sources`."""
+    if gitignore:
+        rules = rules + gitignore_rules(directory)
+
+    try:
+        with os.scandir(directory) as it:
+            entries = sorted(it, key=lambda entry: entry.name)
+    except OSError:
+        return [], []  # e.g., removed or unreadable since it was listed
+
+    files = []
+    subdirectories = []
+    for entry in entries:
+        try:
+            is_dir = entry.is_dir(follow_symlinks=False)
+        except OSError:
+            continue
+        if is_dir:
+            if not is_ignored(entry.path, True, rules):
+                subdirectories.append((entry.path, rules))
+            continue
+
+        kind = classify(entry.name)
+        if kind is not None and not is_ignored(entry.path, False, rules):
+            files.append((Path(entry.path), kind))
+
+    return files, subdirectories
+
+
+"""
+Copyright 2023 Sandia National Laboratories
+
+Notice: This computer software was prepared by National Technology and Engineering Solutions of
+Sandia, LLC, hereinafter the Contractor, under Contract DE-NA0003525 with the Department of Energy
+(DOE). All rights in the computer software are reserved by DOE on behalf of the United States
+Government and the Contractor as provided in the Contract. You are authorized to use this computer
+software for Governmental purposes but it is not to be released or distributed to the public.
+NEITHER THE U.S. GOVERNMENT NOR THE CONTRACTOR MAKES ANY WARRANTY, EXPRESS OR IMPLIED, OR ASSUMES
+ANY LIABILITY FOR THE USE OF THIS SOFTWARE. This notice including this sentence must appear on any
+copies of this computer software. Export of this data may require a license from the United States
+Government.
+"""
@@ -0,0 +1,578 @@
+"""This module keeps a live index of the copyright status of the files in a
+tree, for the `copyright-watch` command, and serves it over a Unix socket.
+
+The tree is walked once, then only the directories in which something
+changed are scanned again, and only the files in them whose size or
+modification time changed are read again.  On Linux, the changes are
+reported by inotify, through `ctypes`; elsewhere, or if inotify is not
+available, every directory is scanned again at a fixed interval instead.
+Unix sockets, and so this module, are not available on Windows.
+
+`copyright-status --daemon` then asks the running watcher for the status of
+the files, over the socket, rather than walking the tree itself.  The request
+is one JSON object on one line, e.g., `{"paths": ["/abs/src"], "settings":
+"..."}`, and the reply is one JSON object per file, as in the `jsonl` report.
+The watcher refuses a request for paths outside the directories it watches,
+or with other settings than its own, e.g., other languages or variants, or
+before its first scan is complete, with one JSON object with the reason,
+e.g., `{"error": "..."}`; see `settings`.
+"""
+
+import ctypes
+import ctypes.util
+import hashlib
+import json
+import os
+import select
+import socket
+import socketserver
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    TYPE_CHECKING,
+    Union,
+)
+
+from snlcopyright import copyright_crud as crud
+from snlcopyright import walk
+from snlcopyright.languages import classifier, select as select_languages
+from snlcopyright.matcher import NoticeMatcher
+
+if TYPE_CHECKING:
+    from snlcopyright.config import NoticeIndex
+
+POLL_SECONDS: float = 2.0  # interval between scans without inotify
+SETTLE_SECONDS: float = 0.1  # events this close together are handled at once
+
+# inotify(7) event masks
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (
+    IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+    | IN_ONLYDIR
+)
+
+_EVENT = struct.Struct("iIII")  # wd, mask, cookie, len; then the name
+
+
+class Entry(NamedTuple):
+    """The status of one file in the index, as of its size and mtime."""
+
+    found: bool
+    variant: Optional[str]
+    error: Optional[str]  # the error, if the file could not be read
+    size: int
+    mtime_ns: int
+
+
+class Inotify:
+    """The directories changed since the last call to `wait`, as reported by
+    inotify.  Raises OSError if inotify is not available."""
+
+    def __init__(self) -> None:
+        name = ctypes.util.find_library("c")
+        libc = ctypes.CDLL(name, use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError("inotify is not available")
+        self._libc = libc
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        self._directories: Dict[int, str] = {}  # by watch descriptor
+
+    def add(self, directory: str) -> None:
+        """Watches the entries of the `directory`, but not its subdirectories."""
+        wd = self._libc.inotify_add_watch(
+            self.fd, os.fsencode(directory), ctypes.c_uint32(WATCH_MASK)
+        )
+        if wd < 0:
+            return  # e.g., removed since it was scanned, or out of watches
+        self._directories[wd] = directory
+
+    def wait(self, timeout: Optional[float] = None) -> Optional[Set[str]]:
+        """Waits up to `timeout` seconds for changes, and returns the
+        directories in which entries changed, or None if events were lost and
+        every directory must be scanned again."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        time.sleep(SETTLE_SECONDS)  # let a burst of changes arrive
+
+        changed: Set[str] = set()
+        while True:
+            try:
+                data = os.read(self.fd, 1 << 16)
+            except BlockingIOError:
+                return changed
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = _EVENT.unpack_from(data, offset)
+                offset += _EVENT.size + length
+                if mask & IN_Q_OVERFLOW:
+                    return None
+                directory = self._directories.get(wd)
+                if directory is None:
+                    continue
+                if mask & IN_IGNORED:
+                    del self._directories[wd]  # the directory is gone
+                changed.add(directory)
+
+    def close(self) -> None:
+        """Stops watching."""
+        os.close(self.fd)
+
+
+class Polling:
+    """Every directory, at each interval of `seconds`, for the systems
+    without inotify."""
+
+    def __init__(self, seconds: float = POLL_SECONDS) -> None:
+        self.seconds = seconds
+        self._next = time.monotonic() + seconds
+
+    def add(self, directory: str) -> None:
+        """Does nothing: every directory in the index is scanned."""
+
+    def wait(self, timeout: Optional[float] = None) -> Optional[Set[str]]:
+        """Waits up to `timeout` seconds for the end of the interval, and
+        returns None, for every directory to be scanned again, if it ended,
+        or else no directories."""
+        remaining = self._next - time.monotonic()
+        if timeout is not None and timeout < remaining:
+            time.sleep(max(timeout, 0.0))
+            return set()
+        time.sleep(max(remaining, 0.0))
+        self._next = time.monotonic() + self.seconds
+        return None
+
+    def close(self) -> None:
+        """Does nothing."""
+
+
+class Watcher:
+    """The index of the copyright status of the files under the directories
+    `paths`, kept up to date as files are created, modified, and removed.
+
+    The files are selected as by `copyright-status`: those of the
+    `languages`, outside of the `exclude` patterns and, if `gitignore` is
+    True, of the `.gitignore` patterns; see `walk.iter_sources`.  The block is
+    searched for as by `copyright_crud.process_file`, with the `matcher` if
+    given, and with the block of its subtree in the `config`, if given, which
+    leaves out the files it excludes.  If `create` is True, the block is
+    appended to each new file that lacks it, i.e., to each file that appears
+    after the first scan.
+    """
+
+    def __init__(
+        self,
+        paths: Sequence[Path],
+        notice: Optional[crud.NoticeTemplate] = None,
+        *,
+        languages: Optional[Sequence[str]] = None,
+        exclude: Iterable[str] = walk.DEFAULT_EXCLUDES,
+        gitignore: bool = True,
+        matcher: Optional[NoticeMatcher] = None,
+        config: Optional["NoticeIndex"] = None,
+        create: bool = False,
+        fsync: bool = False,
+        jobs: int = 1,
+        backend: Optional[Union[Inotify, Polling]] = None,
+    ) -> None:
+        if notice is None:
+            notice = crud.notice_template()
+        op = crud.Operation()
+        options: Dict[str, Any] = dict(
+            languages=languages, matcher=matcher, config=config
+        )
+        self._status = crud.file_processor(op.status, notice, **options)
+        self._create = crud.file_processor(op.create, notice, fsync=fsync, **options)
+        self._classify = classifier(select_languages(languages))
+        self.notice = notice
+        self.config = config
+        self.roots = [os.path.abspath(str(path)) for path in paths]
+        self.exclude = tuple(exclude)
+        self.gitignore = gitignore
+        self.settings = settings(
+            notice, exclude=self.exclude, gitignore=gitignore, **options
+        )
+        self.create = create
+        self.jobs = jobs
+        self.backend = backend if backend is not None else _backend()
+
+        self._lock = threading.Lock()  # the server threads read the index
+        self._entries: Dict[str, Entry] = {}
+        self._files: Dict[str, Set[str]] = {}  # the indexed files, by directory
+        self._rules: Dict[str, Tuple[walk.IgnoreRule, ...]] = {}  # by directory
+        self.scanned = False  # True once the first scan is complete
+
+    def scan(self) -> None:
+        """Walks the trees under the `paths`, and indexes every file."""
+        for root in self.roots:
+            self._add_tree(root, walk.compile_rules(self.exclude, base=root))
+        self.scanned = True
+
+    def refresh(self, directories: Optional[Iterable[str]] = None) -> None:
+        """Scans the `directories` again, or every directory if None, and
+        updates the index with the files that changed in them."""
+        if directories is None:
+            directories = list(self._rules)
+        for directory in sorted(directories):
+            if directory not in self._rules:
+                continue  # e.g., removed along with its parent
+            for subdirectory, rules in self._refresh(directory):
+                if subdirectory not in self._rules:
+                    self._add_tree(subdirectory, rules)
+
+    def run(self, stop: threading.Event) -> None:
+        """Refreshes the index as changes are reported, until `stop` is set."""
+        while not stop.is_set():
+            changed = self.backend.wait(timeout=0.5)
+            if changed is None or changed:
+                self.refresh(changed)
+
+    def refusal(self, request: Dict[str, Any]) -> Optional[str]:
+        """Returns the reason to refuse the `request`, if any: its `paths` are
+        not all under the watched directories, its `settings` are not those of
+        the watcher, or the first scan is not complete."""
+        if not self.scanned:
+            return "its first scan is not complete"
+        if request.get("settings", self.settings) != self.settings:
+            return "it was started with other languages, variants, or excludes"
+        roots = tuple(self.roots)
+        for path in request.get("paths") or []:
+            if not _is_under(os.path.abspath(path), roots):
+                return f"it does not watch `{path}`"
+        return None
+
+    def results(self, paths: Optional[Iterable[str]] = None) -> List[crud.FileResult]:
+        """Returns the status of each file in the index, or only of the files
+        under the `paths`, as absolute paths, in path order."""
+        prefixes = None
+        if paths is not None:
+            prefixes = tuple(os.path.abspath(item) for item in paths)
+        with self._lock:
+            items = sorted(self._entries.items())
+        act = crud.Action()
+        return [
+            crud.FileResult(
+                path=Path(path),
+                found=entry.found,
+                action=act.unchanged if entry.error is None else act.error,
+                error=None if entry.error is None else OSError(entry.error),
+                variant=entry.variant,
+            )
+            for path, entry in items
+            if prefixes is None or _is_under(path, prefixes)
+        ]
+
+    def _add_tree(self, root: str, rules: Tuple[walk.IgnoreRule, ...]) -> None:
+        """Watches and indexes the directory `root` and its subdirectories."""
+        stack = [(root, rules)]
+        while stack:
+            directory, rules = stack.pop()
+            self._rules[directory] = rules
+            self.backend.add(directory)
+            subdirectories = self._refresh(directory)
+            stack.extend(
+                item for item in reversed(subdirectories) if item[0] not in self._rules
+            )
+
+    def _refresh(self, directory: str) -> List[Tuple[str, Tuple[walk.IgnoreRule, ...]]]:
+        """Updates the index with the files in one `directory` that changed,
+        appeared, or disappeared, and returns its subdirectories with their
+        rules; see `walk.scan`."""
+        if not os.path.isdir(directory):
+            self._remove_tree(directory)
+            return []
+
+        rules = self._rules[directory]
+        scanned, subdirectories = walk.scan(
+            directory, rules, self._classify, self.gitignore
+        )
+        files: List[Tuple[Any, ...]] = list(scanned)
+        if self.config is not None:
+            files = list(crud.configured_files(scanned, self.config, self.notice))
+        names = {str(item[0]) for item in files}
+        with self._lock:
+            for path in self._files.get(directory, set()) - names:
+                self._entries.pop(path, None)
+        self._files[directory] = names
+
+        todo: List[Tuple[Tuple[Any, ...], os.stat_result, bool]] = []
+        for item in files:
+            path = item[0]
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entry = self._entries.get(str(path))
+            if entry is None or (entry.size, entry.mtime_ns) != (
+                stat.st_size,
+                stat.st_mtime_ns,
+            ):
+                todo.append((item, stat, entry is None))
+        results = crud.map_files(self._process, todo, self.jobs)
+        for (item, _, _), result in zip(todo, results):
+            self._record(item[0], result)
+        return subdirectories
+
+    def _process(
+        self, todo: Tuple[Tuple[Any, ...], os.stat_result, bool]
+    ) -> crud.FileResult:
+        """Finds the status of one file, given as its path, its language and,
+        with a `config`, its block, and marks it if it is new, lacks the
+        block, and `create` is True."""
+        item, _, new = todo
+        result = self._status(item)
+        if self.create and self.scanned and new and not result.found:
+            if result.action != crud.Action().error:
+                result = self._create(item)
+        return result
+
+    def _record(self, path: Path, result: crud.FileResult) -> None:
+        """Records the `result` for the file at `path`, as of its stat now."""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return
+        found = result.found or result.action == crud.Action().created
+        entry = Entry(
+            found=found,
+            variant=result.variant,
+            error=None if result.error is None else str(result.error),
+            size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+        )
+        with self._lock:
+            self._entries[str(path)] = entry
+
+    def _remove_tree(self, directory: str) -> None:
+        """Drops the directory and its subdirectories from the index."""
+        prefix = directory + os.sep
+        for item in [
+            key for key in self._rules if key == directory or key.startswith(prefix)
+        ]:
+            del self._rules[item]
+            self._files.pop(item, None)
+        with self._lock:
+            for path in [key for key in self._entries if key.startswith(prefix)]:
+                del self._entries[path]
+
+
+def _is_under(path: str, prefixes: Tuple[str, ...]) -> bool:
+    """Returns True if `path` is one of the `prefixes`, or is under one."""
+    return any(path == item or path.startswith(item + os.sep) for item in prefixes)
+
+
+def _backend(seconds: Optional[float] = None) -> Union[Inotify, Polling]:
+    """Returns inotify, or, if it is not available or a polling interval of
+    `seconds` is given, polling."""
+    if seconds is None:
+        try:
+            return Inotify()
+        except (OSError, AttributeError):
+            pass
+    return Polling(POLL_SECONDS if seconds is None else seconds)
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    """Answers one request, on one connection; see the module docstring."""
+
+    server: "Server"
+
+    def handle(self) -> None:
+        from snlcopyright.report import result_dict  # report imports crud
+
+        line = self.rfile.readline()
+        request = json.loads(line.decode("utf-8")) if line.strip() else {}
+        refusal = self.server.watcher.refusal(request)
+        if refusal is not None:
+            self.wfile.write(json.dumps({"error": refusal}).encode("utf-8") + b"\n")
+            return
+        for result in self.server.watcher.results(request.get("paths")):
+            self.wfile.write(json.dumps(result_dict(result)).encode("utf-8") + b"\n")
+
+
+class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Serves the index of the `watcher` on the Unix socket at `path`, with
+    one thread per connection."""
+
+    daemon_threads = True
+
+    def __init__(self, path: Path, watcher: Watcher) -> None:
+        self.watcher = watcher
+        _remove_stale(path)
+        super().__init__(str(path), _Handler)
+
+    def server_close(self) -> None:
+        super().server_close()
+        try:
+            os.unlink(self.server_address)  # type: ignore
+        except OSError:
+            pass
+
+
+def _remove_stale(path: Path) -> None:
+    """Removes the socket file at `path`, if no watcher is listening on it.
+    Raises OSError if one is."""
+    if not os.path.exists(str(path)):
+        return
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(str(path))
+    except OSError:
+        os.unlink(str(path))  # left behind by a watcher that was killed
+        return
+    raise OSError(f"Error: a watcher is already listening on {path}.")
+
+
+def settings(
+    notice: crud.NoticeTemplate,
+    *,
+    languages: Optional[Sequence[str]] = None,
+    exclude: Iterable[str] = walk.DEFAULT_EXCLUDES,
+    gitignore: bool = True,
+    matcher: Optional[NoticeMatcher] = None,
+    config: Optional["NoticeIndex"] = None,
+    window: Optional[int] = None,
+) -> str:
+    """Returns the settings that select the files and find the block in each,
+    which a query must share with the watcher it asks; see `query`."""
+    names = sorted(language.name for language in select_languages(languages))
+    return crud._mode(
+        notice=hashlib.sha256(notice.text.encode("utf-8")).hexdigest(),
+        languages=",".join(names),
+        exclude="\0".join(exclude),
+        gitignore=gitignore,
+        matcher=matcher,
+        config=config,
+        window=window,
+    )
+
+
+def query(
+    path: Path,
+    paths: Optional[Sequence[Path]] = None,
+    timeout: float = 10.0,
+    settings: Optional[str] = None,
+) -> List[crud.FileResult]:
+    """Returns the status of the files under the `paths`, or of every file,
+    from the watcher listening on the Unix socket at `path`, which must have
+    the same `settings`, if given; see `settings`.  Raises OSError if there is
+    no watcher, or if it refuses the query."""
+    request: Dict[str, Any] = {}
+    if paths is not None:
+        request["paths"] = [os.path.abspath(str(item)) for item in paths]
+    if settings is not None:
+        request["settings"] = settings
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(str(path))
+        sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as fin:
+            return [_result(json.loads(line.decode("utf-8"))) for line in fin]
+
+
+def _result(data: Dict) -> crud.FileResult:
+    """Returns the FileResult of one line of a reply; see `report.result_dict`.
+    Raises OSError if the line is a refusal."""
+    error = data.get("error")
+    if "path" not in data:
+        raise OSError(f"the watcher refused the query: {error}")
+    return crud.FileResult(
+        path=Path(data["path"]),
+        found=data["found"],
+        action=data["action"],
+        error=None if error is None else OSError(error),
+        variant=data.get("variant"),
+    )
+
+
+def watch(
+    paths: Optional[Sequence[Path]] = None,
+    *,
+    socket_path: Path,
+    poll: Optional[float] = None,
+    stop: Optional[threading.Event] = None,
+    ready: Optional[threading.Event] = None,
+    **kwargs,
+) -> bool:
+    """Scans the `paths`, which default to the current working directory,
+    serves the index on the Unix socket at `socket_path`, and keeps it up to
+    date until `stop` is set, or until interrupted; see `Watcher`, which
+    takes the other keyword arguments.  If `poll` seconds are given, every
+    directory is scanned at that interval, rather than watched with inotify.
+    The `ready` event, if given, is set once the index is served."""
+    if paths is None:
+        paths = [Path.cwd()]
+    if stop is None:
+        stop = threading.Event()
+
+    watcher = Watcher(paths, backend=_backend(poll), **kwargs)
+    print(f"Scanning {len(paths)} path(s).", flush=True)
+    started = time.perf_counter()
+    watcher.scan()
+    print(
+        f"Indexed {len(watcher.results())} file(s) in "
+        f"{time.perf_counter() - started:.2f} s; serving on {socket_path}.",
+        flush=True,
+    )
+
+    server = Server(socket_path, watcher)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    if ready is not None:
+        ready.set()
+    try:
+        watcher.run(stop)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+        server.server_close()
+        watcher.backend.close()
+    return True
+
+
+"""
+Copyright 2023 Sandia National Laboratories
+
+Notice: This computer software was prepared by National Technology and Engineering Solutions of
+Sandia, LLC, hereinafter the Contractor, under Contract DE-NA0003525 with the Department of Energy
+(DOE). All rights in the computer software are reserved by DOE on behalf of the United States
+Government and the Contractor as provided in the Contract. You are authorized to use this computer
+software for Governmental purposes but it is not to be released or distributed to the public.
+NEITHER THE U.S. GOVERNMENT NOR THE CONTRACTOR MAKES ANY WARRANTY, EXPRESS OR IMPLIED, OR ASSUMES
+ANY LIABILITY FOR THE USE OF THIS SOFTWARE. This notice including this sentence must appear on any
+copies of this computer software. Export of this data may require a license from the United States
+Government.
+"""
@@ -0,0 +1,136 @@
+"""This module tests the archive module."""
+
+import io
+import json
+import tarfile
+import zipfile
+from pathlib import Path
+
+import snlcopyright.copyright_crud as cr
+from snlcopyright import archive, report
+from snlcopyright.config import NoticeIndex
+from snlcopyright.matcher import NoticeMatcher
+
+NOTICE = cr.notice_template()
+
+
+def members() -> dict:
+    """Returns the names and contents of the members of the test archives."""
+    return {
+        "pkg/marked.py": f"import os\n\n{NOTICE.text}\n",
+        "pkg/unmarked.py": "import os\n",
+        "pkg/crlf.py": f"import os\n\n{NOTICE.text}\n".replace("\n", "\r\n"),
+        "pkg/data.txt": "not a source file\n",
+    }
+
+
+def make_tar(path: Path) -> Path:
+    """Writes a gzipped tarball of the `members`, with a directory entry."""
+    with tarfile.open(str(path), mode="w:gz") as tar:
+        directory = tarfile.TarInfo("pkg")
+        directory.type = tarfile.DIRTYPE
+        tar.addfile(directory)
+        for name, text in members().items():
+            data = text.encode("utf-8")
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    return path
+
+
+def make_zip(path: Path) -> Path:
+    """Writes a zip file, e.g., a wheel, of the `members`."""
+    with zipfile.ZipFile(str(path), mode="w") as zf:
+        zf.writestr("pkg/", "")
+        for name, text in members().items():
+            zf.writestr(name, text.encode("utf-8"))
+    return path
+
+
+def test_member_status(tmp_path):
+    """Verify the source members of tarballs and zip files are checked."""
+    expected = [
+        ("pkg/marked.py", True),
+        ("pkg/unmarked.py", False),
+        ("pkg/crlf.py", True),
+    ]
+    search = cr._member_search(NOTICE, None)
+    for path in (make_tar(tmp_path / "a.tar.gz"), make_zip(tmp_path / "a.whl")):
+        assert archive.is_archive(path)
+        statuses = archive.member_status(path, search)
+        assert [(name, found) for name, found, _ in statuses] == expected
+
+    assert not archive.is_archive(Path("module.py"))
+    assert archive.member_path(Path("a.whl"), "pkg/x.py") == Path("a.whl!pkg/x.py")
+
+
+def test_copyright_status_archives(tmp_path):
+    """Verify archives are reported member by member, and never modified."""
+    tar = make_tar(tmp_path / "a.tar.gz")
+    whl = make_zip(tmp_path / "a.whl")
+    broken = tmp_path / "broken.zip"
+    broken.write_bytes(b"not a zip file")
+    before = {path: path.read_bytes() for path in (tar, whl)}
+
+    rr = report.make_report("summary", stream=io.StringIO())
+    assert not cr.copyright_status(paths=[tar, whl, broken], report=rr)
+    assert rr.totals["files"] == 7
+    assert rr.totals["found"] == 4
+    assert rr.totals["error"] == 1
+
+    rr = report.make_report("summary", stream=io.StringIO())
+    assert not cr.copyright(paths=[tar, whl], check=True, report=rr)
+    assert rr.totals["missing"] == 2
+
+    rr = report.make_report("summary", stream=io.StringIO())
+    assert cr.copyright(paths=[tar, whl], report=rr)
+    assert rr.totals["files"] == 0
+    assert {path: path.read_bytes() for path in (tar, whl)} == before
+
+
+def test_archive_variants(tmp_path):
+    """Verify the members are searched with the variants and the configuration
+    of the run, as files are."""
+    legacy = NOTICE.text.replace("2023", "2019")
+    with zipfile.ZipFile(str(tmp_path / "a.whl"), mode="w") as zf:
+        zf.writestr("pkg/legacy.py", f"import os\n\n{legacy}\n")
+        zf.writestr("pkg/spaced.py", "import os\n\n" + NOTICE.text.replace(" ", "  "))
+    variant = tmp_path.joinpath("old_2019.txt")
+    variant.write_text(legacy)
+
+    def statuses(**options) -> dict:
+        stream = io.StringIO()
+        rr = report.make_report("jsonl", stream=stream)
+        cr.copyright_status(paths=[tmp_path / "a.whl"], report=rr, **options)
+        items = [json.loads(line) for line in stream.getvalue().splitlines()]
+        return {
+            item["path"].rsplit("/", 1)[-1]: item["found"]
+            for item in items
+            if "path" in item
+        }
+
+    assert statuses() == {"legacy.py": False, "spaced.py": False}
+    matcher = NoticeMatcher.from_files(NOTICE.text, [variant])
+    assert statuses(matcher=matcher) == {"legacy.py": True, "spaced.py": False}
+    matcher = NoticeMatcher.from_files(NOTICE.text, [], tolerant=True)
+    assert statuses(matcher=matcher) == {"legacy.py": True, "spaced.py": True}
+
+    config = NoticeIndex(tmp_path, default=cr.notice_template(variant))
+    assert statuses(config=config) == {"legacy.py": True, "spaced.py": False}
+    config = NoticeIndex(tmp_path, [("*.whl", None)])
+    assert statuses(config=config) == {}
+
+
+"""
+Copyright 2023 Sandia National Laboratories
+
+Notice: This computer software was prepared by National Technology and Engineering Solutions of
+Sandia, LLC, hereinafter the Contractor, under Contract DE-NA0003525 with the Department of Energy
+(DOE). All rights in the computer software are reserved by DOE on behalf of the United States
+Government and the Contractor as provided in the Contract. You are authorized to use this computer
+software for Governmental purposes but it is not to be released or distributed to the public.
+NEITHER THE U.S. GOVERNMENT NOR THE CONTRACTOR MAKES ANY WARRANTY, EXPRESS OR IMPLIED, OR ASSUMES
+ANY LIABILITY FOR THE USE OF THIS SOFTWARE. This notice including this sentence must appear on any
+copies of this computer software. Export of this data may require a license from the United States
+Government.
+"""
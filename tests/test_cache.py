@@ -0,0 +1,130 @@
+"""This module tests the cache module."""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from snlcopyright import cache
+import snlcopyright.copyright_crud as cr
+
+
+def age(path, seconds: int = 60) -> os.stat_result:
+    """Sets the modification time of `path` to `seconds` ago."""
+    past = time.time() - seconds
+    os.utime(path, (past, past))
+    return os.stat(path)
+
+
+def test_status_cache(tmp_path):
+    """Verify a cached status is returned until the file or the text block
+    changes, and that the cache round trips through its file."""
+    aa = tmp_path.joinpath("a.py")
+    aa.write_text("x = 1\n")
+    stat = age(aa)
+    cache_file = tmp_path.joinpath("cache.json")
+
+    bb = cache.StatusCache(cache_file, "notice")
+    assert bb.lookup(aa, stat) is None
+    bb.record(aa, stat, True)
+    bb.save()
+
+    cc = cache.StatusCache(cache_file, "notice")
+    assert cc.lookup(aa, stat) is True
+    assert (cc.hits, cc.misses) == (1, 0)
+
+    aa.write_text("x = 12\n")
+    assert cc.lookup(aa, age(aa)) is None  # the file changed
+
+    dd = cache.StatusCache(cache_file, "another notice")
+    assert dd.entries == {}  # the text block changed
+
+
+def test_status_cache_pruned(tmp_path, monkeypatch):
+    """Verify the cache drops only the files under the paths walked that were
+    not looked up, keys files by absolute path, and counts the lookups of
+    several threads."""
+    tmp_path.joinpath("sub").mkdir()
+    names = [f"{ii}.py" for ii in range(20)] + [f"sub/{ii}.py" for ii in range(20)]
+    stats = {}
+    for name in names:
+        tmp_path.joinpath(name).write_text("x = 1\n")
+        stats[name] = age(tmp_path.joinpath(name))
+    cache_file = tmp_path.joinpath("cache.json")
+
+    bb = cache.StatusCache(cache_file, "notice")
+    for name in names:
+        bb.record(tmp_path / name, stats[name], False)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        for _ in range(10):
+            list(
+                executor.map(
+                    lambda name: bb.lookup(tmp_path / name, stats[name]), names
+                )
+            )
+    assert (bb.hits, bb.misses) == (400, 0)
+    bb.save(roots=[tmp_path])
+
+    # One file given by a relative path: the other entries are kept.
+    monkeypatch.chdir(tmp_path)
+    cc = cache.StatusCache(cache_file, "notice")
+    assert cc.lookup(Path("0.py"), stats["0.py"]) is False
+    cc.save(roots=[Path("0.py")])
+    assert len(cache.StatusCache(cache_file, "notice").entries) == 40
+
+    # A walk of sub/ that no longer finds one of its files drops it only.
+    tmp_path.joinpath("sub", "0.py").unlink()
+    dd = cache.StatusCache(cache_file, "notice")
+    for name in names[21:]:
+        assert dd.lookup(tmp_path / name, stats[name]) is False
+    dd.save(roots=[Path("sub")])
+    entries = cache.StatusCache(cache_file, "notice").entries
+    assert len(entries) == 39
+    assert str(tmp_path / "sub" / "0.py") not in entries
+
+
+def test_status_cache_racy(tmp_path):
+    """Verify a file modified just now is not cached."""
+    aa = tmp_path.joinpath("a.py")
+    aa.write_text("x = 1\n")
+    stat = os.stat(aa)
+
+    bb = cache.StatusCache(tmp_path.joinpath("cache.json"), "notice")
+    bb.record(aa, stat, False)
+    assert bb.lookup(aa, stat) is None
+
+
+def test_copyright_status_cache(tmp_path):
+    """Verify the status command reads and writes the cache."""
+    aa = tmp_path.joinpath("files")
+    aa.mkdir()
+    for name in ("a.py", "b.py"):
+        aa.joinpath(name).write_text("x = 1\n")
+        age(aa.joinpath(name))
+    cache_file = tmp_path.joinpath("cache.json")
+
+    original_path = os.getcwd()
+    os.chdir(aa)
+    try:
+        assert cr.copyright_status(cache=cache_file)
+        assert cr.copyright_status(cache=cache_file)
+    finally:
+        os.chdir(original_path)
+
+    bb = cache.StatusCache(cache_file, cr.text_block())
+    assert len(bb.entries) == 2
+
+
+"""
+Copyright 2023 Sandia National Laboratories
+
+Notice: This computer software was prepared by National Technology and Engineering Solutions of
+Sandia, LLC, hereinafter the Contractor, under Contract DE-NA0003525 with the Department of Energy
+(DOE). All rights in the computer software are reserved by DOE on behalf of the United States
+Government and the Contractor as provided in the Contract. You are authorized to use this computer
+software for Governmental purposes but it is not to be released or distributed to the public.
+NEITHER THE U.S. GOVERNMENT NOR THE CONTRACTOR MAKES ANY WARRANTY, EXPRESS OR IMPLIED, OR ASSUMES
+ANY LIABILITY FOR THE USE OF THIS SOFTWARE. This notice including this sentence must appear on any
+copies of this computer software. Export of this data may require a license from the United States
+Government.
+"""
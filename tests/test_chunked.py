@@ -0,0 +1,69 @@
+"""This module tests the chunked module."""
+
+import io
+import re
+
+from snlcopyright import chunked
+
+
+def test_contains():
+    """Verify a needle is found across chunk boundaries, and only if there."""
+    data = b"x" * 100 + b"needle" + b"y" * 100
+    for size in (1, 3, 7, 64, 1000):
+        assert chunked.contains(io.BytesIO(data), [b"needle"], size)
+        assert not chunked.contains(io.BytesIO(data), [b"needles"], size)
+    assert not chunked.contains(io.BytesIO(b""), [b"needle"])
+
+
+def test_replace():
+    """Verify matches that straddle chunk boundaries are replaced, as
+    `re.sub` replaces them in the whole data at once."""
+    pairs = [(b"ab\nab", b"X"), (b"ab\r\nab", b"YY"), (b"b", b"")]
+    pattern = re.compile(b"|".join(re.escape(old) for old, _ in pairs))
+    data = b"ab\nab\r\nab\nab\r\nab\r\nxab\nababb\n" * 3
+    expected, count = pattern.subn(lambda match: dict(pairs)[match.group()], data)
+    for size in (1, 2, 3, 5, 8, 13, 1000):
+        fout = io.BytesIO()
+        assert chunked.replace(io.BytesIO(data), fout, pairs, size) == count
+        assert fout.getvalue() == expected
+
+
+def test_insert():
+    """Verify a header is inserted after a #! line and an encoding cookie."""
+    cases = [
+        (b"x = 1\n", b"H\nx = 1\n"),
+        (b"#!/bin/sh\nls\n", b"#!/bin/sh\nH\nls\n"),
+        (
+            b"#!/usr/bin/env python\n# -*- coding: latin-1 -*-\nx = 1\n",
+            b"#!/usr/bin/env python\n# -*- coding: latin-1 -*-\nH\nx = 1\n",
+        ),
+        (b"# coding=utf-8\nx = 1\n", b"# coding=utf-8\nH\nx = 1\n"),
+        (b"x = 1\n# coding: utf-8\n", b"H\nx = 1\n# coding: utf-8\n"),
+        (b"", b"H\n"),
+        (b"#!/usr/bin/env python", b"#!/usr/bin/env python\nH\n"),
+        (b"# -*- coding: latin-1 -*-", b"# -*- coding: latin-1 -*-\nH\n"),
+        (b"#!/bin/sh\n# coding=utf-8", b"#!/bin/sh\n# coding=utf-8\nH\n"),
+    ]
+    for data, expected in cases:
+        for size in (1, 4, 1000):
+            fout = io.BytesIO()
+            chunked.insert(io.BytesIO(data), fout, b"H\n", size)
+            assert fout.getvalue() == expected
+    assert chunked.header_offset("#!/bin/sh\nls\n") == len("#!/bin/sh\n")
+    assert chunked.header_offset("#!/bin/sh") == len("#!/bin/sh")
+    assert chunked.with_header("#!/bin/sh", "H\r\n", "\r\n") == "#!/bin/sh\r\nH\r\n"
+
+
+"""
+Copyright 2023 Sandia National Laboratories
+
+Notice: This computer software was prepared by National Technology and Engineering Solutions of
+Sandia, LLC, hereinafter the Contractor, under Contract DE-NA0003525 with the Department of Energy
+(DOE). All rights in the computer software are reserved by DOE on behalf of the United States
+Government and the Contractor as provided in the Contract. You are authorized to use this computer
+software for Governmental purposes but it is not to be released or distributed to the public.
+NEITHER THE U.S. GOVERNMENT NOR THE CONTRACTOR MAKES ANY WARRANTY, EXPRESS OR IMPLIED, OR ASSUMES
+ANY LIABILITY FOR THE USE OF THIS SOFTWARE. This notice including this sentence must appear on any
+copies of this computer software. Export of this data may require a license from the United States
+Government.
+"""
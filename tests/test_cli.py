@@ -0,0 +1,70 @@
+"""This module tests the cli module."""
+
+import subprocess
+import sys
+
+from snlcopyright import cli
+
+
+def test_main(capsys):
+    """Verify the subcommands are dispatched, and their results turned into
+    exit statuses."""
+    assert cli.main(["version"]) == 0
+    assert capsys.readouterr().out.splitlines()[-1] == "0.0.12"
+
+    assert cli.main(["--help"]) == 0
+    assert "subcommands:" in capsys.readouterr().out
+    assert cli.main([]) == 2
+    assert cli.main(["unknown"]) == 2
+    assert "unknown subcommand" in capsys.readouterr().err
+    assert cli.main(["version", "extra"]) == 2
+
+
+def test_main_status(tmp_path, capsys):
+    """Verify the arguments are passed on to the subcommand."""
+    aa = tmp_path.joinpath("a.py")
+    aa.write_text("x = 1\n")
+    assert cli.main(["status", "--check", str(tmp_path)]) == 1
+    assert f"{aa} ❌ copyright was not found" in capsys.readouterr().out
+
+
+def test_exit_status():
+    """Verify the exit status for each kind of value returned."""
+    assert cli.exit_status(True) == 0
+    assert cli.exit_status(False) == 1
+    assert cli.exit_status(3) == 3
+    assert cli.exit_status(None) == 0
+
+
+def test_main_imports():
+    """Verify the version subcommand imports neither pkg_resources nor the
+    modules that process files."""
+    code = (
+        "import sys\n"
+        "from snlcopyright.cli import main\n"
+        "main(['version'])\n"
+        "print(sorted(name for name in sys.modules if name in "
+        "('pkg_resources', 'snlcopyright.copyright_crud', 'argparse')))\n"
+    )
+    completed = subprocess.run(
+        [sys.executable, "-c", code],
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    assert completed.stdout.splitlines()[-1] == "[]"
+
+
+"""
+Copyright 2023 Sandia National Laboratories
+
+Notice: This computer software was prepared by National Technology and Engineering Solutions of
+Sandia, LLC, hereinafter the Contractor, under Contract DE-NA0003525 with the Department of Energy
+(DOE). All rights in the computer software are reserved by DOE on behalf of the United States
+Government and the Contractor as provided in the Contract. You are authorized to use this computer
+software for Governmental purposes but it is not to be released or distributed to the public.
+NEITHER THE U.S. GOVERNMENT NOR THE CONTRACTOR MAKES ANY WARRANTY, EXPRESS OR IMPLIED, OR ASSUMES
+ANY LIABILITY FOR THE USE OF THIS SOFTWARE. This notice including this sentence must appear on any
+copies of this computer software. Export of this data may require a license from the United States
+Government.
+"""
@@ -1,5 +1,8 @@
 """This module tests the command_line module."""
 
+import io
+import json
+
 from snlcopyright import command_line as cl
 
 
@@ -21,6 +24,103 @@ def test_version():
     assert found == known
 
 
+def test_copyright_status_cli():
+    """Verify the `copyright-status` command parses `--jobs` and exits with 0."""
+    assert cl.copyright_status_cli(["--jobs", "2"]) == 0
+    assert cl._jobs(0) >= 1
+
+
+def test_stdin(monkeypatch, capsys):
+    """Verify `--stdin` filters the standard input to the standard output."""
+
+    def stdin(data: bytes) -> None:
+        monkeypatch.setattr("sys.stdin", io.TextIOWrapper(io.BytesIO(data)))
+
+    stdin(b"x = 1\n")
+    assert cl.copyright_cli(["--stdin"]) == 0
+    captured = capsys.readouterr()
+    assert captured.out.startswith("x = 1\n\n\n" + '"""')
+    assert "...copyright created" in captured.err
+
+    stdin(b"x = 1\n")
+    assert cl.copyright_status_cli(["--stdin", "--check", "--quiet"]) == 1
+    assert capsys.readouterr().out == "x = 1\n"
+
+    stdin(b"x = 1\n")
+    assert cl.copyright_cli(["--stdin", "--check"]) == 1
+    assert capsys.readouterr().out == "x = 1\n"
+
+
+def test_paths_from(tmp_path, monkeypatch, capsys):
+    """Verify `--paths-from` adds the listed paths to those given, and the
+    report ends with the totals of each."""
+    for name in ("one", "two"):
+        tmp_path.joinpath(name).mkdir()
+        tmp_path.joinpath(name, "a.py").write_text("a = 1\n")
+    manifest = tmp_path.joinpath("repos.txt")
+    manifest.write_text(f"# repositories\n{tmp_path / 'two'}\n\n")
+
+    argv = [str(tmp_path / "one"), "--paths-from", str(manifest)]
+    assert cl.copyright_status_cli(argv + ["--check"]) == 1
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0] == "Processing 2 paths."
+    assert lines[-3] == "Totals of the 2 roots:"
+    assert lines[-1].endswith("two: 1 file(s), 0 found, 1 missing, 0 error(s)")
+
+    monkeypatch.setattr("sys.stdin", io.StringIO(manifest.read_text()))
+    assert cl.copyright_cli(["--paths-from", "-", "--format", "summary"]) == 0
+    assert capsys.readouterr().out.splitlines()[0] == "files: 1"
+    assert cl.copyright_status_cli(["--check", str(tmp_path / "two")]) == 0
+
+
+def test_relative_roots(tmp_path, monkeypatch, capsys):
+    """Verify the totals of roots given as relative paths."""
+    for name in ("r1", "r2"):
+        tmp_path.joinpath(name).mkdir()
+    tmp_path.joinpath("r1", "a.py").write_text("a = 1\n")
+    tmp_path.joinpath("r2", "b.py").write_text("b = 1\n")
+    monkeypatch.chdir(tmp_path)
+
+    assert cl.copyright_status_cli(["--format", "json", "r1", "./r2"]) == 0
+    document = json.loads(capsys.readouterr().out)
+    assert document["summary"]["files"] == 2
+    assert {root: item["files"] for root, item in document["roots"].items()} == {
+        "r1": 1,
+        "r2": 1,
+    }
+
+
+def test_config(tmp_path, capsys):
+    """Verify `--config` leaves out the subtrees it excludes."""
+    tmp_path.joinpath("vendor").mkdir()
+    tmp_path.joinpath("vendor", "a.py").write_text("a = 1\n")
+    tmp_path.joinpath("b.py").write_text("b = 1\n")
+    rules = tmp_path.joinpath("rules.yml")
+    rules.write_text("rules:\n  - path: vendor\n    exclude: true\n")
+
+    argv = [str(tmp_path), "--format", "summary"]
+    assert cl.copyright_cli(argv + ["--config", str(rules)]) == 0
+    assert capsys.readouterr().out.splitlines()[0] == "files: 1"
+    assert tmp_path.joinpath("vendor", "a.py").read_text() == "a = 1\n"
+
+
+def test_config_found(tmp_path, monkeypatch, capsys):
+    """Verify the configuration is found in a parent of the cwd, and of each
+    path, when run from a subdirectory."""
+    tmp_path.joinpath(".git").mkdir()
+    tmp_path.joinpath("src", "vendor").mkdir(parents=True)
+    tmp_path.joinpath("src", "vendor", "a.py").write_text("a = 1\n")
+    tmp_path.joinpath("src", "b.py").write_text("b = 1\n")
+    tmp_path.joinpath(".snlcopyright.yml").write_text(
+        "rules:\n  - path: src/vendor\n    exclude: true\n"
+    )
+    monkeypatch.chdir(tmp_path / "src")
+
+    for argv in ([], ["."], [str(tmp_path / "src" / "b.py")]):
+        assert cl.copyright_status_cli(argv + ["--format", "summary"]) == 0
+        assert capsys.readouterr().out.splitlines()[0] == "files: 1"
+
+
 """
 Copyright 2023 Sandia National Laboratories
 
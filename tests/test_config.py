@@ -0,0 +1,167 @@
+"""This module tests the config module."""
+
+import io
+import sys
+
+import pytest
+
+import snlcopyright.copyright_crud as cr
+from snlcopyright import config, report
+
+LEGACY = "Copyright 2019 Sandia National Laboratories\n\nA legacy notice.\n"
+
+CONFIG = """\
+rules:
+  - path: vendor
+    exclude: true
+  - path: vendor/ours
+    notice: legacy.txt
+  - path: "**/*_pb2.py"
+    exclude: true
+  - path: src/legacy/
+    notice: legacy.txt
+"""
+
+
+def make_tree(root) -> None:
+    """Creates a tree with a subtree of its own, one to leave out, and
+    generated files, and the configuration of the tree."""
+    root.joinpath("legacy.txt").write_text(LEGACY)
+    root.joinpath(config.CONFIG_FILE).write_text(CONFIG)
+    for name in ("src/a.py", "src/legacy/b.py", "src/legacy/c_pb2.py"):
+        root.joinpath(name).parent.mkdir(parents=True, exist_ok=True)
+        root.joinpath(name).write_text("x = 1\n")
+    for name in ("vendor/lib/d.py", "vendor/ours/e.py"):
+        root.joinpath(name).parent.mkdir(parents=True, exist_ok=True)
+        root.joinpath(name).write_text("x = 1\n")
+
+
+def test_notice_index(tmp_path):
+    """Verify the last rule that matches a file gives its block."""
+    make_tree(tmp_path)
+    index = config.load_config(tmp_path / config.CONFIG_FILE)
+    default = cr.notice_template()
+
+    def resolved(name: str):
+        notice = index.resolve(tmp_path / name, default)
+        if notice is None:
+            return None
+        return "legacy" if notice.text == LEGACY else "default"
+
+    assert resolved("src/a.py") == "default"
+    assert resolved("src/legacy/b.py") == "legacy"
+    assert resolved("src/legacy/c_pb2.py") == "legacy"  # a later rule
+    assert resolved("src/c_pb2.py") is None
+    assert resolved("vendor/lib/d.py") is None
+    assert resolved("vendor/ours/e.py") == "legacy"
+    assert resolved("vendor") is None
+    assert resolved("../elsewhere.py") == "default"
+    assert [item.text for item in index.notices] == [LEGACY]
+
+    with pytest.raises(ValueError):
+        config.NoticeIndex.from_dict({"rules": [{"path": "src"}]}, base=tmp_path)
+
+
+def test_find_config(tmp_path):
+    """Verify the configuration is found in a `pyproject.toml` file with a
+    `[tool.snlcopyright]` table only."""
+    pyproject = tmp_path.joinpath("pyproject.toml")
+    pyproject.write_text('[project]\nname = "x"  # no [tool.snlcopyright]\n')
+    assert config.find_config(tmp_path) is None
+
+    tmp_path.joinpath("legacy.txt").write_text(LEGACY)
+    pyproject.write_text(
+        '[tool.snlcopyright]\nnotice = "legacy.txt"\n\n'
+        '[[tool.snlcopyright.rules]]\npath = "vendor"\nexclude = true\n'
+    )
+    assert config.find_config(tmp_path) == pyproject
+    if sys.version_info < (3, 11):
+        pytest.importorskip("tomli")
+    index = config.load_config(pyproject)
+    assert index.resolve(tmp_path / "a.py").text == LEGACY
+    assert index.resolve(tmp_path / "vendor" / "a.py") is None
+
+
+def test_find_config_upward(tmp_path, monkeypatch):
+    """Verify the configuration is found in the nearest parent up to the root
+    of the repository, and a `pyproject.toml` file is passed over if it cannot
+    be read."""
+    make_tree(tmp_path)
+    assert config.find_config(tmp_path / "src" / "legacy") == tmp_path.joinpath(
+        config.CONFIG_FILE
+    )
+    tmp_path.joinpath("src", ".git").mkdir()
+    assert config.find_config(tmp_path / "src" / "legacy") is None
+
+    repo = tmp_path.joinpath("repo")
+    repo.joinpath("sub").mkdir(parents=True)
+    repo.joinpath(".git").mkdir()
+    repo.joinpath("pyproject.toml").write_text(
+        '[[tool.snlcopyright.rules]]\npath = "sub"\nexclude = true\n'
+    )
+    monkeypatch.setattr(config, "_has_toml", lambda: False)
+    assert config.find_config(repo / "sub") is None
+
+
+def test_find_configs(tmp_path):
+    """Verify each path takes the configuration found for it."""
+    make_tree(tmp_path)
+    other = tmp_path.joinpath("other")
+    other.joinpath("vendor").mkdir(parents=True)
+    other.joinpath(config.CONFIG_FILE).write_text("notice: ../legacy.txt\n")
+    index = config.find_configs([tmp_path / "src", other, other / "vendor"])
+    assert isinstance(index, config.NoticeIndexes)
+    default = cr.notice_template()
+    assert index.resolve(tmp_path / "vendor" / "lib" / "d.py", default) is None
+    assert index.resolve(tmp_path / "src" / "legacy" / "b.py").text == LEGACY
+    assert index.resolve(other / "vendor" / "f.py", default).text == LEGACY
+    assert index.resolve(tmp_path.parent / "g.py", default) == default
+    assert {item.text for item in index.notices} == {LEGACY}
+
+
+def test_copyright_config(tmp_path, monkeypatch):
+    """Verify each file is marked, checked and unmarked with the block of its
+    subtree, which is resolved once, and the files left out are not
+    touched."""
+    make_tree(tmp_path)
+    index = config.load_config(tmp_path / config.CONFIG_FILE)
+    resolved = []
+    resolve = index.resolve
+    monkeypatch.setattr(
+        index, "resolve", lambda *args: resolved.append(args[0]) or resolve(*args)
+    )
+    rr = report.make_report("summary", stream=io.StringIO())
+    assert cr.copyright(paths=[tmp_path], config=index, report=rr)
+    assert rr.totals["created"] == 4
+    assert len(resolved) == len(set(resolved)) == 5  # the files found
+
+    assert LEGACY in tmp_path.joinpath("src", "legacy", "b.py").read_text()
+    assert LEGACY in tmp_path.joinpath("vendor", "ours", "e.py").read_text()
+    assert LEGACY not in tmp_path.joinpath("src", "a.py").read_text()
+    assert cr.copyright_exists(tmp_path / "src" / "a.py")
+    assert tmp_path.joinpath("vendor", "lib", "d.py").read_text() == "x = 1\n"
+
+    rr = report.make_report("summary", stream=io.StringIO())
+    assert cr.copyright_status(paths=[tmp_path], config=index, check=True, report=rr)
+    assert rr.totals["files"] == 4
+    assert not cr.copyright_status(paths=[tmp_path], check=True, report=rr)
+
+    rr = report.make_report("summary", stream=io.StringIO())
+    assert cr.copyright_delete(paths=[tmp_path], config=index, report=rr)
+    assert rr.totals["deleted"] == 4
+    assert LEGACY not in tmp_path.joinpath("src", "legacy", "b.py").read_text()
+
+
+"""
+Copyright 2023 Sandia National Laboratories
+
+Notice: This computer software was prepared by National Technology and Engineering Solutions of
+Sandia, LLC, hereinafter the Contractor, under Contract DE-NA0003525 with the Department of Energy
+(DOE). All rights in the computer software are reserved by DOE on behalf of the United States
+Government and the Contractor as provided in the Contract. You are authorized to use this computer
+software for Governmental purposes but it is not to be released or distributed to the public.
+NEITHER THE U.S. GOVERNMENT NOR THE CONTRACTOR MAKES ANY WARRANTY, EXPRESS OR IMPLIED, OR ASSUMES
+ANY LIABILITY FOR THE USE OF THIS SOFTWARE. This notice including this sentence must appear on any
+copies of this computer software. Export of this data may require a license from the United States
+Government.
+"""
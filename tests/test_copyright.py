@@ -7,14 +7,16 @@ pytest reli/tests/unit/test_copyright.py -v --cov=reli --cov-report term-missing
 """
 
 import os
+import time
 from pathlib import Path
 from shutil import copyfile
 
 # from typing import Final  # postpone Final until Python 3.9 is used in pyproject.toml
 
-# import pytest
+import pytest
 
 import snlcopyright.copyright_crud as cr
+from snlcopyright.matcher import CURRENT, NoticeMatcher, Variant
 
 
 def test_text_block():
@@ -32,6 +34,31 @@ def test_text_block():
     assert found
 
 
+def test_notice_template(tmp_path):
+    """Verify the copyright text block is read once, and re-read only when
+    requested and the file has been modified.
+    """
+    aa = cr.notice_template()
+    assert aa.text == cr.text_block()
+    assert cr.notice_template() is aa  # the same object, not read again
+
+    bb = tmp_path.joinpath("copyright.txt")
+    bb.write_text("Copyright 2022\n")
+    cc = cr.notice_template(bb)
+    assert cc.text == "Copyright 2022\n"
+
+    bb.write_text("Copyright 2023\n")
+    os.utime(bb, ns=(cc.mtime_ns + 10**9, cc.mtime_ns + 10**9))
+    assert cr.notice_template(bb) is cc  # stale, but no mtime check requested
+    dd = cr.notice_template(bb, check_mtime=True)
+    assert dd.text == "Copyright 2023\n"
+
+    ee = tmp_path.joinpath("empty.txt")
+    ee.write_text("\n")
+    with pytest.raises(ValueError):
+        cr.notice_template(ee)
+
+
 def test_copyright_exists():
     """Given two examplar test files, one with a copyright block and one without,
     verify that the function returns True and False, respectively.
@@ -47,6 +74,29 @@ def test_copyright_exists():
     assert not cr.copyright_exists(cc)  # assert no copyright in this file
 
 
+def test_copyright_exists_window(tmp_path):
+    """Verify the copyright block is found only within the head or the tail
+    window of a file, when a window is given."""
+    text = cr.text_block()
+    filler = "# filler\n" * 1000
+
+    aa = tmp_path.joinpath("head.py")
+    aa.write_text(text + filler)
+    bb = tmp_path.joinpath("tail.py")
+    bb.write_text(filler + "\n\n" + text + "\n")
+    cc = tmp_path.joinpath("middle.py")
+    cc.write_text(filler + text + filler)
+
+    for item in (aa, bb, cc):
+        assert cr.copyright_exists(item)
+
+    window = len(text) + 100
+    assert cr.copyright_exists(aa, window=window)
+    assert cr.copyright_exists(bb, window=window)
+    assert not cr.copyright_exists(cc, window=window)
+    assert cr.copyright_exists(cc, window=len(filler + text))  # the whole file
+
+
 def test_copyright_create():
     """Given an examplar test file without a copyright, create a temporary
     clone of that test file, append the copyright to the cloned file, verify
@@ -84,6 +134,31 @@ def test_copyright_create():
     assert not ee.is_file()
 
 
+def test_replace_contents(tmp_path):
+    """Verify the contents are replaced without leaving a temporary file, the
+    file mode is kept, and symbolic and hard links are kept intact."""
+    aa = tmp_path.joinpath("a.py")
+    aa.write_text("x = 1\n")
+    aa.chmod(0o754)
+
+    cr.replace_contents(aa, "x = 2\n", fsync=True)
+    assert aa.read_text() == "x = 2\n"
+    assert aa.stat().st_mode & 0o777 == 0o754
+    assert [item.name for item in tmp_path.iterdir()] == ["a.py"]
+
+    bb = tmp_path.joinpath("link.py")
+    bb.symlink_to(aa)
+    cr.replace_contents(bb, "x = 3\n")
+    assert bb.is_symlink()
+    assert aa.read_text() == "x = 3\n"
+
+    cc = tmp_path.joinpath("hard.py")
+    os.link(aa, cc)
+    cr.replace_contents(cc, "x = 4\n")
+    assert aa.read_text() == "x = 4\n"
+    assert os.path.samefile(aa, cc)
+
+
 def test_modules_list():
     """To test the copyright modules, we have constructed several exemplar test
     files, and this test verifies the files in the file structure are as designed.
@@ -112,6 +187,198 @@ def test_copyright_status():
 
 
 # @pytest.mark.skip("work in progress")
+def test_map_files():
+    """Verify results come back in input order from a pool of workers."""
+    aa = Path(__file__).parent.joinpath("files")
+    paths = sorted(cr.modules_list(aa))
+
+    def slow_exists(path):
+        time.sleep(0.01 * (len(paths) - paths.index(path)))  # finish out of order
+        return path, cr.copyright_exists(path)
+
+    found = list(cr.map_files(slow_exists, paths, jobs=4))
+    assert found == [(item, cr.copyright_exists(item)) for item in paths]
+
+
+def test_process_file(tmp_path, monkeypatch):
+    """Verify each operation returns the expected result, reads the file once,
+    and reports an error instead of raising it."""
+    op = cr.Operation()
+    act = cr.Action()
+    notice = cr.notice_template()
+    aa = tmp_path.joinpath("a.py")
+    aa.write_text("x = 1\n")
+
+    opened = []
+    real_open = open
+
+    def counting_open(file, *args, **kwargs):
+        opened.append(file)
+        return real_open(file, *args, **kwargs)
+
+    monkeypatch.setattr("builtins.open", counting_open)
+
+    def run(operation, **kwargs):
+        opened.clear()
+        return cr.process_file(aa, operation, notice, **kwargs)
+
+    assert run(op.status) == cr.FileResult(aa, False, act.unchanged)
+    assert len(opened) == 1
+    assert run(op.create) == cr.FileResult(aa, False, act.created)
+    assert len(opened) == 2  # one read, one append
+    assert run(op.create) == cr.FileResult(aa, True, act.unchanged)
+    assert len(opened) == 1
+
+    new = notice.text.replace("2023", "2022")
+    assert run(op.update, new=new) == cr.FileResult(aa, True, act.updated)
+    assert len(opened) == 1  # plus one temporary file, written by descriptor
+    assert aa.read_text() == "x = 1\n\n\n" + new + "\n"
+
+    assert run(op.delete) == cr.FileResult(aa, False, act.unchanged)
+    updated = notice._replace(text=new)
+    result = cr.process_file(aa, op.delete, updated)
+    assert result == cr.FileResult(aa, True, act.deleted)
+    assert aa.read_text() == "x = 1\n\n\n\n"
+
+    missing = tmp_path.joinpath("missing.py")
+    result = cr.process_file(missing, op.status, notice)
+    assert result.action == act.error
+    assert isinstance(result.error, FileNotFoundError)
+
+
+def test_process_buffer():
+    """Verify the operations on buffers in memory, as str and as bytes."""
+    op = cr.Operation()
+    act = cr.Action()
+    notice = cr.notice_template()
+
+    result = cr.process_buffer("x = 1\n", op.create)
+    assert result == cr.BufferResult(
+        "x = 1\n\n\n" + notice.text + "\n", False, act.created
+    )
+    assert cr.process_buffer(result.contents, op.status).found
+
+    new = notice.text.replace("2023", "2024")
+    updated = cr.process_buffer(result.contents, op.update, new=new)
+    assert updated.action == act.updated
+    assert updated.contents == "x = 1\n\n\n" + new + "\n"
+
+    # Bytes stay bytes, undecodable bytes included.
+    data = b"x = '\xff'\n"
+    result = cr.process_buffer(data, op.create, filename="a.sh")
+    assert result.contents.startswith(data)
+    assert result.contents.endswith(b"\n# Government.\n")
+    result = cr.process_buffer(result.contents, op.delete, filename="a.sh")
+    assert result.action == act.deleted
+    assert result.contents == data + b"\n\n\n"
+
+
+def test_process_file_bytes(tmp_path):
+    """Verify files are matched as bytes, in any encoding and with CRLF line
+    endings, and written back byte for byte."""
+    op = cr.Operation()
+    act = cr.Action()
+    notice = cr.notice_template()
+    crlf = notice.text.replace("\n", "\r\n").encode("ascii")
+
+    aa = tmp_path.joinpath("a.py")
+    aa.write_bytes(b"# caf\xe9, in latin-1\r\nx = 1\r\n")
+    assert cr.process_file(aa, op.create, notice).action == act.created
+    assert (
+        aa.read_bytes()
+        == b"# caf\xe9, in latin-1\r\nx = 1\r\n\r\n\r\n" + crlf + b"\r\n"
+    )
+    assert cr.copyright_exists(aa)
+    assert cr.copyright_exists(aa, window=len(crlf))
+    assert cr.process_file(aa, op.create, notice).action == act.unchanged
+
+    assert cr.process_file(aa, op.delete, notice).action == act.deleted
+    assert aa.read_bytes() == b"# caf\xe9, in latin-1\r\nx = 1\r\n\r\n\r\n\r\n"
+    assert cr.process_file(aa, op.delete, notice).action == act.unchanged
+
+
+def test_mixed_line_endings(tmp_path):
+    """Verify the lines of a file with mixed line endings that the operation
+    does not change are written back as they were."""
+    op = cr.Operation()
+    act = cr.Action()
+    notice = cr.notice_template()
+    crlf = notice.text.replace("\n", "\r\n").encode("ascii")
+    old = notice.text.replace("2023", "2019")
+    matcher = NoticeMatcher([Variant(CURRENT, notice.text), Variant("old", old)])
+    legacy = old.replace("\n", "\r\n").encode("ascii")
+
+    aa = tmp_path.joinpath("a.py")
+    aa.write_bytes(b"a = 1\r\nb = 2\nc = 3\n")
+    result = cr.process_file(aa, op.create, notice, matcher=matcher, migrate=True)
+    assert result.action == act.created
+    assert aa.read_bytes() == b"a = 1\r\nb = 2\nc = 3\n\r\n\r\n" + crlf + b"\r\n"
+    assert cr.process_file(aa, op.delete, notice).action == act.deleted
+    assert aa.read_bytes() == b"a = 1\r\nb = 2\nc = 3\n\r\n\r\n\r\n"
+
+    aa.write_bytes(b"a = 1\r\n" + legacy + b"\r\nb = 2\nc = 3\n")
+    result = cr.process_file(aa, op.create, notice, matcher=matcher, migrate=True)
+    assert result.action == act.updated
+    assert aa.read_bytes() == b"a = 1\r\n" + crlf + b"\r\nb = 2\nc = 3\n"
+
+
+def test_process_file_streamed(tmp_path, monkeypatch):
+    """Verify the header insertion, and the chunked search and rewrite of
+    files larger than `STREAM_SIZE`, hard links included."""
+    op = cr.Operation()
+    act = cr.Action()
+    notice = cr.notice_template()
+    monkeypatch.setattr(cr, "STREAM_SIZE", 0)
+
+    aa = tmp_path.joinpath("a.py")
+    aa.write_bytes(b"#!/usr/bin/env python\r\nx = 1\r\n")
+    bb = tmp_path.joinpath("b.py")
+    os.link(aa, bb)
+    assert cr.process_file(aa, op.create, notice, header=True).action == act.created
+    block = notice.text.replace("\n", "\r\n").encode("ascii")
+    assert (
+        aa.read_bytes() == b"#!/usr/bin/env python\r\n" + block + b"\r\n\r\nx = 1\r\n"
+    )
+    assert cr.copyright_exists(aa)
+
+    new = notice.text.replace("2023", "2024")
+    result = cr.process_file(aa, op.update, notice, new=new)
+    assert result == cr.FileResult(aa, True, act.updated)
+    assert b"2024" in bb.read_bytes()
+    assert os.path.samefile(aa, bb)
+
+    assert cr.process_file(aa, op.delete, notice).action == act.unchanged
+    notice = notice._replace(text=new)
+    assert cr.process_file(aa, op.delete, notice).action == act.deleted
+    assert aa.read_bytes() == b"#!/usr/bin/env python\r\n\r\n\r\nx = 1\r\n"
+    assert sorted(item.name for item in tmp_path.iterdir()) == ["a.py", "b.py"]
+
+
+def test_header_only_line(tmp_path, monkeypatch):
+    """Verify the header goes after a `#!` line or an encoding declaration
+    that is the whole file, without a line ending, in memory and streamed."""
+    op = cr.Operation()
+    notice = cr.notice_template()
+    for head in ("#!/usr/bin/env python", "# -*- coding: latin-1 -*-"):
+        expected = f"{head}\n{notice.text}\n\n"
+        result = cr.process_buffer(head, op.create, notice, header=True)
+        assert result.contents == expected
+        result = cr.process_buffer(head.encode(), op.create, notice, header=True)
+        assert result.contents == expected.encode()
+
+        for size in (2**24, 0):
+            monkeypatch.setattr(cr, "STREAM_SIZE", size)
+            aa = tmp_path.joinpath("a.py")
+            aa.write_text(head)
+            cr.process_file(aa, op.create, notice, header=True)
+            assert aa.read_text() == expected
+
+
+def test_copyright_status_jobs():
+    """Run the status of each .py file with a pool of workers."""
+    assert cr.copyright_status(jobs=4)
+
+
 def test_copyright_update():
     """Given a module with a copyright, test that the copyright can be updated."""
     original_text = cr.text_block()
@@ -0,0 +1,93 @@
+"""This module tests the dedupe module."""
+
+import os
+
+import pytest
+
+import snlcopyright.copyright_crud as cr
+from snlcopyright import stats
+from snlcopyright.dedupe import SeenFiles
+from snlcopyright.matcher import NoticeMatcher
+
+NOTICE = cr.notice_template()
+
+
+@pytest.mark.parametrize("jobs", [1, 4])
+def test_linked_files(tmp_path, jobs):
+    """Verify a file reached through hard and symbolic links is marked once,
+    and reported under each of its paths."""
+    original = tmp_path.joinpath("a.py")
+    original.write_text("x = 1\n")
+    for name in ("b", "c", "d"):
+        os.link(original, tmp_path.joinpath(f"{name}.py"))
+    tmp_path.joinpath("e.py").symlink_to(original)
+    tmp_path.joinpath("f.py").write_text("x = 1\n")  # a copy, not a link
+
+    with stats.recording() as recorder:
+        results = list(
+            cr.process_files(cr.Operation().create, NOTICE, paths=[tmp_path], jobs=jobs)
+        )
+    act = cr.Action()
+    actions = sorted(result.action for result in results)
+    assert actions == [act.created] * 2 + [act.unchanged] * 4
+    assert all(result.found for result in results if result.action == act.unchanged)
+    assert recorder.counters["files_linked"] == 4
+    assert original.read_text().count("Copyright") == 1
+    assert tmp_path.joinpath("f.py").read_text() == original.read_text()
+
+    # A file with a single hard link, processed by its path first, and later
+    # through a symbolic link.
+    single = tmp_path.joinpath("g.py")
+    single.write_text("x = 1\n")
+    tmp_path.joinpath("h.py").symlink_to(single)
+    seen, calls = SeenFiles(), []
+
+    def process(path):
+        calls.append(path.name)
+        return cr.FileResult(path=path, found=False, action=act.created)
+
+    assert seen.process(single, process).action == act.created
+    result = seen.process(tmp_path / "h.py", process)
+    assert (result.path.name, result.action, result.found) == (
+        "h.py",
+        act.unchanged,
+        True,
+    )
+    assert calls == ["g.py"]
+
+
+def test_duplicated_contents(tmp_path):
+    """Verify the contents of copies are searched with a matcher only once."""
+    for name in "abcd":
+        tmp_path.joinpath(f"{name}.py").write_text(f"x = 1\n\n{NOTICE.text}\n")
+    tmp_path.joinpath("e.py").write_text("x = 2\n")
+    matcher = NoticeMatcher.from_files(NOTICE.text, [], tolerant=True)
+
+    with stats.recording() as recorder:
+        results = cr.process_files(
+            cr.Operation().status, NOTICE, paths=[tmp_path], matcher=matcher
+        )
+        found = {result.path.name: result.found for result in results}
+    assert found == {
+        "a.py": True,
+        "b.py": True,
+        "c.py": True,
+        "d.py": True,
+        "e.py": False,
+    }
+    assert recorder.counters["files_duplicated"] == 3
+
+
+"""
+Copyright 2023 Sandia National Laboratories
+
+Notice: This computer software was prepared by National Technology and Engineering Solutions of
+Sandia, LLC, hereinafter the Contractor, under Contract DE-NA0003525 with the Department of Energy
+(DOE). All rights in the computer software are reserved by DOE on behalf of the United States
+Government and the Contractor as provided in the Contract. You are authorized to use this computer
+software for Governmental purposes but it is not to be released or distributed to the public.
+NEITHER THE U.S. GOVERNMENT NOR THE CONTRACTOR MAKES ANY WARRANTY, EXPRESS OR IMPLIED, OR ASSUMES
+ANY LIABILITY FOR THE USE OF THIS SOFTWARE. This notice including this sentence must appear on any
+copies of this computer software. Export of this data may require a license from the United States
+Government.
+"""
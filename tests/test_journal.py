@@ -0,0 +1,87 @@
+"""This module tests the journal module."""
+
+import io
+
+import pytest
+
+import snlcopyright.copyright_crud as cr
+from snlcopyright import journal, report
+
+
+class Interrupted(report.Report):
+    """A report that stops the run, as Ctrl-C would, after `limit` files."""
+
+    def __init__(self, limit: int):
+        super().__init__(stream=io.StringIO())
+        self.limit = limit
+        self.notes = []
+
+    def note(self, line: str) -> None:
+        self.notes.append(line)
+
+    def write(self, result: cr.FileResult) -> None:
+        if self.totals["files"] == self.limit:
+            raise KeyboardInterrupt
+        super().write(result)
+
+
+def test_journal(tmp_path):
+    """Verify a journal is resumed only by the same kind of run, and a line
+    cut short is ignored."""
+    act = cr.Action()
+    path = tmp_path.joinpath("journal.jsonl")
+    run = journal.Journal(path, "create", "text")
+    run.record(cr.FileResult(tmp_path / "a.py", False, act.created))
+    run.record(cr.FileResult(tmp_path / "b.py", False, act.error, OSError("x")))
+    run.close()
+    with open(path, mode="a") as fout:
+        fout.write('{"path": "/cut/sh')
+
+    run = journal.Journal(path, "create", "text", resume=True)
+    assert run.done == {str(tmp_path / "a.py")}
+    run.close(complete=True)
+    assert not path.exists()
+
+    journal.Journal(path, "create", "text").close()
+    assert journal.Journal(path, "delete", "text", resume=True).done == set()
+
+
+def test_copyright_resume(tmp_path):
+    """Verify an interrupted run is resumed where it stopped, and the stale
+    temporary files are removed."""
+    for name in "abcdef":
+        tmp_path.joinpath(f"{name}.py").write_text(f"{name} = 1\n")
+    path = tmp_path.joinpath("journal.jsonl")
+
+    with pytest.raises(KeyboardInterrupt):
+        cr.copyright(paths=[tmp_path], journal=path, report=Interrupted(limit=2))
+    assert len(path.read_text().splitlines()) == 3  # the header, and 2 files
+    stale = tmp_path.joinpath(".snlcopyright-c.py.k2x_9q0z.temp")
+    stale.write_text("c = ")
+    other = tmp_path.joinpath("c.py.k2x_9q0z.temp")  # not written by this tool
+    other.write_text("c = ")
+
+    rr = Interrupted(limit=100)
+    assert cr.copyright(paths=[tmp_path], journal=path, resume=True, report=rr)
+    assert rr.totals["files"] == 4
+    assert rr.totals["created"] == 3  # c.py was marked, but not recorded
+    assert "2 file(s) already done, 1 stale temporary file(s) removed" in rr.notes[0]
+    assert not path.exists()
+    assert not stale.exists()
+    assert other.exists()
+    assert all(cr.copyright_exists(item) for item in tmp_path.glob("*.py"))
+
+
+"""
+Copyright 2023 Sandia National Laboratories
+
+Notice: This computer software was prepared by National Technology and Engineering Solutions of
+Sandia, LLC, hereinafter the Contractor, under Contract DE-NA0003525 with the Department of Energy
+(DOE). All rights in the computer software are reserved by DOE on behalf of the United States
+Government and the Contractor as provided in the Contract. You are authorized to use this computer
+software for Governmental purposes but it is not to be released or distributed to the public.
+NEITHER THE U.S. GOVERNMENT NOR THE CONTRACTOR MAKES ANY WARRANTY, EXPRESS OR IMPLIED, OR ASSUMES
+ANY LIABILITY FOR THE USE OF THIS SOFTWARE. This notice including this sentence must appear on any
+copies of this computer software. Export of this data may require a license from the United States
+Government.
+"""
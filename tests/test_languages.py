@@ -0,0 +1,83 @@
+"""This module tests the languages module."""
+
+import pytest
+
+import snlcopyright.copyright_crud as cr
+from snlcopyright import languages
+
+
+NOTICE = '"""\nCopyright 2023\n\nNotice: text.\n"""'
+
+
+def test_render():
+    """Verify the block is rendered in each comment style."""
+    assert languages.render(NOTICE, "docstring") == NOTICE
+    assert languages.render(NOTICE, "hash") == "# Copyright 2023\n#\n# Notice: text."
+    assert (
+        languages.render(NOTICE, "c-block") == "/*\nCopyright 2023\n\nNotice: text.\n*/"
+    )
+    assert languages.render("", "slashes") == ""
+    assert languages.body("no quotes") == "no quotes"
+
+
+def test_select_and_classify():
+    """Verify languages are selected by name, and files classified by name."""
+    assert languages.select() == (languages.PYTHON,)
+    assert len(languages.select(["all"])) == len(languages.LANGUAGES)
+    with pytest.raises(ValueError):
+        languages.select(["cobol"])
+
+    classify = languages.classifier(languages.select(["cmake", "cpp"]))
+    assert classify("CMakeLists.txt").name == "cmake"
+    assert classify("main.cpp").name == "cpp"
+    assert classify("main.py") is None
+    assert languages.language_of("main.f90").name == "fortran"
+    assert languages.language_of("unknown.txt") == languages.PYTHON
+    assert "CMakeLists.txt" in languages.patterns(languages.select(["cmake"]))
+
+
+def test_process_files_languages(tmp_path):
+    """Verify the files of many languages are marked in one walk, each in its
+    own comment style, and that the block is then found and updated."""
+    notice = cr.notice_template()
+    for name in ("a.py", "b.sh", "c.cpp", "CMakeLists.txt", "README.md"):
+        tmp_path.joinpath(name).write_text("x\n")
+
+    names = ["python", "shell", "cpp", "cmake"]
+    files = cr.modules_list(tmp_path, languages=names)
+    assert sorted(item.name for item in files) == [
+        "CMakeLists.txt",
+        "a.py",
+        "b.sh",
+        "c.cpp",
+    ]
+
+    results = list(
+        cr.process_files(
+            cr.Operation().create, notice, paths=[tmp_path], languages=names
+        )
+    )
+    assert [result.action for result in results] == ["created"] * 4
+    assert tmp_path.joinpath("README.md").read_text() == "x\n"
+    assert tmp_path.joinpath("c.cpp").read_text().endswith("\n// Government.\n")
+    assert cr.copyright_exists(tmp_path.joinpath("b.sh"))
+    assert cr.copyright_exists(tmp_path.joinpath("a.py"))
+
+    new = notice.text.replace("2023", "2024")
+    assert cr.copyright_update(tmp_path.joinpath("b.sh"), new=new)
+    assert "# Copyright 2024 Sandia" in tmp_path.joinpath("b.sh").read_text()
+
+
+"""
+Copyright 2023 Sandia National Laboratories
+
+Notice: This computer software was prepared by National Technology and Engineering Solutions of
+Sandia, LLC, hereinafter the Contractor, under Contract DE-NA0003525 with the Department of Energy
+(DOE). All rights in the computer software are reserved by DOE on behalf of the United States
+Government and the Contractor as provided in the Contract. You are authorized to use this computer
+software for Governmental purposes but it is not to be released or distributed to the public.
+NEITHER THE U.S. GOVERNMENT NOR THE CONTRACTOR MAKES ANY WARRANTY, EXPRESS OR IMPLIED, OR ASSUMES
+ANY LIABILITY FOR THE USE OF THIS SOFTWARE. This notice including this sentence must appear on any
+copies of this computer software. Export of this data may require a license from the United States
+Government.
+"""
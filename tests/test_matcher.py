@@ -0,0 +1,110 @@
+"""This module tests the matcher module."""
+
+import pytest
+
+import snlcopyright.copyright_crud as cr
+from snlcopyright import matcher
+
+
+NEW = "Copyright 2023 Sandia National Laboratories\nContract DE-NA0003525"
+OLD = "Copyright 2019 Sandia National Laboratories\nContract DE-AC04-94AL85000"
+
+
+def test_notice_matcher():
+    """Verify the variants are found in one pass, and reported by name."""
+    nm = matcher.NoticeMatcher(
+        [matcher.Variant("current", NEW), matcher.Variant("old.txt", OLD)]
+    )
+    assert nm.search("x = 1\n") is None
+    assert nm.search("x = 1\n" + OLD).variant == "old.txt"
+    assert nm.search(NEW + "\n" + OLD).variant == "current"
+    assert [item.variant for item in nm.find_all(OLD + NEW)] == ["old.txt", "current"]
+
+    # Exact variants do not match reflowed text or other years.
+    assert nm.search(NEW.replace("\n", " ")) is None
+    assert nm.search(NEW.replace("2023", "2021")) is None
+
+    with pytest.raises(ValueError):
+        matcher.NoticeMatcher([])
+
+
+def test_notice_matcher_tolerant():
+    """Verify a tolerant variant matches any whitespace and any years."""
+    nm = matcher.NoticeMatcher([matcher.Variant("current", NEW)], tolerant=True)
+    assert nm.search(NEW.replace("\n", "\n  ")) is not None
+    assert nm.search(NEW.replace("2023", "2021")) is not None
+    assert nm.search(NEW.replace("2023", "2019-2023")) is not None
+    assert nm.search(NEW.replace("2023", "2019, 2021")) is not None
+    assert nm.search(NEW.replace("Sandia", "Other")) is None
+    assert nm.search(NEW.replace("2023", "120231")) is None
+    assert nm.search(NEW.replace("2023", "2023a")) is None
+    assert nm.digest() != matcher.NoticeMatcher([matcher.Variant("x", NEW)]).digest()
+
+
+def test_with_years():
+    """Verify only whole years and year spans take the given years, not the
+    digits of longer numbers."""
+    text = "Copyright 2019, 2021 Sandia, release 1.20230, ticket 202311, ID x2021"
+    assert matcher.with_years(text, "2019-2026") == (
+        "Copyright 2019-2026 Sandia, release 1.20230, ticket 202311, ID x2021"
+    )
+
+
+def test_notice_matcher_sub(tmp_path):
+    """Verify every variant is replaced, and the variants are read from files."""
+    old = tmp_path.joinpath("old.txt")
+    old.write_text(OLD)
+    nm = matcher.NoticeMatcher.from_files(NEW, [old])
+    assert [item.name for item in nm.variants] == [matcher.CURRENT, "old.txt"]
+
+    text, matches = nm.sub(NEW, "a\n" + OLD + "\nb\n" + OLD)
+    assert text == "a\n" + NEW + "\nb\n" + NEW
+    assert len(matches) == 2
+    assert nm.sub(NEW, "a\n") == ("a\n", [])
+
+
+def test_process_file_migrate(tmp_path):
+    """Verify create with `migrate` replaces the legacy blocks in one write,
+    and status with a `window` reports the variant found."""
+    op = cr.Operation()
+    act = cr.Action()
+    notice = cr.notice_template()
+    old = notice.text.replace("2023", "2019")
+    nm = matcher.NoticeMatcher(
+        [matcher.Variant(matcher.CURRENT, notice.text), matcher.Variant("old", old)]
+    )
+
+    aa = tmp_path.joinpath("a.py")
+    aa.write_text("x = 1\n\n" + old + "\n")
+    result = cr.process_file(aa, op.status, notice, matcher=nm, window=64)
+    assert result == cr.FileResult(aa, True, act.unchanged, variant="old")
+
+    result = cr.process_file(aa, op.create, notice, matcher=nm)
+    assert result.action == act.unchanged  # found, so left unmarked
+
+    result = cr.process_file(aa, op.create, notice, matcher=nm, migrate=True)
+    assert result == cr.FileResult(aa, True, act.updated, variant="old")
+    assert aa.read_text() == "x = 1\n\n" + notice.text + "\n"
+
+    result = cr.process_file(aa, op.create, notice, matcher=nm, migrate=True)
+    assert result == cr.FileResult(aa, True, act.unchanged, variant="current")
+
+    bb = tmp_path.joinpath("b.py")
+    bb.write_text("x = 1\n")
+    result = cr.process_file(bb, op.create, notice, matcher=nm, migrate=True)
+    assert result == cr.FileResult(bb, False, act.created)
+
+
+"""
+Copyright 2023 Sandia National Laboratories
+
+Notice: This computer software was prepared by National Technology and Engineering Solutions of
+Sandia, LLC, hereinafter the Contractor, under Contract DE-NA0003525 with the Department of Energy
+(DOE). All rights in the computer software are reserved by DOE on behalf of the United States
+Government and the Contractor as provided in the Contract. You are authorized to use this computer
+software for Governmental purposes but it is not to be released or distributed to the public.
+NEITHER THE U.S. GOVERNMENT NOR THE CONTRACTOR MAKES ANY WARRANTY, EXPRESS OR IMPLIED, OR ASSUMES
+ANY LIABILITY FOR THE USE OF THIS SOFTWARE. This notice including this sentence must appear on any
+copies of this computer software. Export of this data may require a license from the United States
+Government.
+"""
@@ -0,0 +1,135 @@
+"""This module tests the report module."""
+
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+import snlcopyright.copyright_crud as cr
+from snlcopyright import report
+
+act = cr.Action()
+results = [
+    cr.FileResult(Path("a.py"), True, act.unchanged),
+    cr.FileResult(Path("b.py"), False, act.unchanged),
+    cr.FileResult(Path("c.py"), False, act.created),
+    cr.FileResult(Path("d.py"), False, act.error, FileNotFoundError("d.py")),
+]
+
+
+def run(format: str, **kwargs) -> str:
+    """Writes the `results` in the given `format` and returns the output."""
+    stream = io.StringIO()
+    rr = report.make_report(format, stream=stream, **kwargs)
+    rr.start("Processing path: .")
+    for result in results:
+        rr.write(result)
+    rr.finish()
+    return stream.getvalue()
+
+
+def test_text_report():
+    """Verify the text messages, and that quiet keeps only the failures."""
+    found = run("text").splitlines()
+    assert found[0] == "Processing path: ."
+    assert "a.py ✓ copyright was found" in found
+    assert found[-2] == "1 file(s) could not be processed:"
+
+    found = run("text", quiet=True).splitlines()
+    assert found == [
+        "b.py ❌ copyright was not found",
+        "1 file(s) could not be processed:",
+        "d.py ❌ d.py",
+    ]
+
+
+def test_json_reports():
+    """Verify the JSON document and the JSON lines round trip."""
+    document = json.loads(run("json"))
+    assert [item["path"] for item in document["files"]] == [
+        "a.py",
+        "b.py",
+        "c.py",
+        "d.py",
+    ]
+    assert document["summary"]["files"] == 4
+    assert document["summary"]["missing"] == 3
+    assert document["summary"]["error"] == 1
+
+    lines = [json.loads(line) for line in run("jsonl", quiet=True).splitlines()]
+    assert [line.get("path") for line in lines] == ["b.py", "d.py", None]
+    assert lines[-1]["summary"] == document["summary"]
+
+    assert json.loads(run("json", quiet=True))["summary"] == document["summary"]
+
+
+def test_summary_report():
+    """Verify the summary lists only the totals."""
+    assert run("summary").splitlines()[:3] == ["files: 4", "found: 1", "missing: 3"]
+    with pytest.raises(ValueError):
+        report.make_report("xml")
+
+
+def test_copyright_status_check():
+    """Verify the check fails when a file is missing the copyright block."""
+    aa = Path(__file__).parent.joinpath("files")
+    stream = io.StringIO()
+    rr = report.make_report("summary", stream=stream)
+    assert not cr.copyright_status(paths=[aa], check=True, report=rr)
+    assert rr.totals["missing"] == 1
+
+    bb = aa.joinpath("module_with_copyright.py")
+    assert cr.copyright(paths=[bb], check=True)
+
+
+def test_root_totals(tmp_path):
+    """Verify the totals of each root of a run over many roots."""
+    for name in ("one", "two", "three"):
+        tmp_path.joinpath(name).mkdir()
+    tmp_path.joinpath("one", "a.py").write_text("a = 1\n")
+    tmp_path.joinpath("one", "b.py").write_text("b = 1\n")
+    tmp_path.joinpath("two", "c.py").write_text("c = 1\n")
+    roots = [tmp_path / name for name in ("one", "two", "three")]
+    roots.append(tmp_path / "gone.py")
+
+    stream = io.StringIO()
+    rr = report.make_report("json", stream=stream, roots=roots)
+    assert cr.copyright(paths=roots, jobs=2, report=rr) is False  # gone.py
+    document = json.loads(stream.getvalue())
+    assert document["summary"]["files"] == 4
+    totals = {
+        Path(root).name: (item["files"], item["created"], item["error"])
+        for root, item in document["roots"].items()
+    }
+    assert totals == {
+        "one": (2, 2, 0),
+        "two": (1, 1, 0),
+        "three": (0, 0, 0),
+        "gone.py": (1, 0, 1),
+    }
+
+    stream = io.StringIO()
+    rr = report.make_report("summary", stream=stream, roots=roots)
+    assert cr.copyright_status(paths=roots[:2], report=rr)
+    assert (
+        stream.getvalue()
+        .splitlines()[-4]
+        .endswith("one: 2 file(s), 2 found, 0 missing, 0 error(s)")
+    )
+    assert not report.make_report("summary", roots=roots[:1]).root_totals
+
+
+"""
+Copyright 2023 Sandia National Laboratories
+
+Notice: This computer software was prepared by National Technology and Engineering Solutions of
+Sandia, LLC, hereinafter the Contractor, under Contract DE-NA0003525 with the Department of Energy
+(DOE). All rights in the computer software are reserved by DOE on behalf of the United States
+Government and the Contractor as provided in the Contract. You are authorized to use this computer
+software for Governmental purposes but it is not to be released or distributed to the public.
+NEITHER THE U.S. GOVERNMENT NOR THE CONTRACTOR MAKES ANY WARRANTY, EXPRESS OR IMPLIED, OR ASSUMES
+ANY LIABILITY FOR THE USE OF THIS SOFTWARE. This notice including this sentence must appear on any
+copies of this computer software. Export of this data may require a license from the United States
+Government.
+"""
@@ -0,0 +1,81 @@
+"""This module tests the stats module."""
+
+import time
+
+import snlcopyright.copyright_crud as cr
+from snlcopyright import stats
+
+
+def test_stats():
+    """Verify the slowest files are kept, the slowest first."""
+    recorder = stats.Stats(slowest=2)
+    for ii, seconds in enumerate([0.1, 0.3, 0.2]):
+        recorder.add_file(f"{ii}.py", seconds)
+    assert recorder.slowest_files() == [(0.3, "1.py"), (0.2, "2.py")]
+    assert recorder.counters["files_processed"] == 3
+    assert recorder.lines()[0] == "Statistics:"
+
+    stats.count("directories")  # not recording: nothing happens
+    with stats.timed("walk"):
+        pass
+
+
+def test_recording(tmp_path):
+    """Verify a run records its counters and the time of each phase."""
+    for name in ("a.py", "b.py"):
+        tmp_path.joinpath(name).write_text("x = 1\n")
+    tmp_path.joinpath("sub").mkdir()
+    tmp_path.joinpath("sub", "c.py").write_text("x = 1\n")
+
+    notice = cr.notice_template()
+    with stats.recording(stats.Stats(slowest=1)) as recorder:
+        results = cr.process_files(cr.Operation().create, notice, paths=[tmp_path])
+        assert len(list(results)) == 3
+
+    summary = recorder.summary()
+    assert summary["counters"] == {
+        "directories": 2,
+        "files_matched": 3,
+        "files_processed": 3,
+        "files_linked": 0,
+        "files_duplicated": 0,
+        "bytes_read": 3 * len("x = 1\n"),
+        "bytes_written": 3 * len("\n\n" + notice.text + "\n"),
+    }
+    assert all(summary["seconds"][phase] > 0 for phase in stats.PHASES)
+    assert len(summary["slowest"]) == 1
+    assert stats._active is None
+
+
+def test_phases_apart(tmp_path, monkeypatch):
+    """Verify the time to read a file one chunk at a time is not counted as
+    the time to search it."""
+    tmp_path.joinpath("a.py").write_text("x = 1\n" * 10)
+
+    def slow_read(fin, overlap=0):
+        time.sleep(0.05)
+        yield fin.read()
+
+    monkeypatch.setattr(cr, "STREAM_SIZE", 0)
+    monkeypatch.setattr(cr.chunked, "chunks", slow_read)
+    with stats.recording(stats.Stats()) as recorder:
+        for window in (None, 10**6):
+            cr.copyright_exists(tmp_path.joinpath("a.py"), window=window)
+    seconds = recorder.summary()["seconds"]
+    assert seconds["read"] >= 0.05
+    assert seconds["match"] < 0.05
+
+
+"""
+Copyright 2023 Sandia National Laboratories
+
+Notice: This computer software was prepared by National Technology and Engineering Solutions of
+Sandia, LLC, hereinafter the Contractor, under Contract DE-NA0003525 with the Department of Energy
+(DOE). All rights in the computer software are reserved by DOE on behalf of the United States
+Government and the Contractor as provided in the Contract. You are authorized to use this computer
+software for Governmental purposes but it is not to be released or distributed to the public.
+NEITHER THE U.S. GOVERNMENT NOR THE CONTRACTOR MAKES ANY WARRANTY, EXPRESS OR IMPLIED, OR ASSUMES
+ANY LIABILITY FOR THE USE OF THIS SOFTWARE. This notice including this sentence must appear on any
+copies of this computer software. Export of this data may require a license from the United States
+Government.
+"""
@@ -0,0 +1,116 @@
+"""This module tests the throttle module."""
+
+import os
+import subprocess
+import sys
+import zipfile
+
+import pytest
+
+import snlcopyright.copyright_crud as cr
+from snlcopyright import command_line as cl
+from snlcopyright import chunked, stats, throttle
+
+
+def test_rate():
+    """Verify rates are read with their units, and only positive ones."""
+    assert throttle.rate("500") == 500
+    assert throttle.rate("512K") == 512 * 1024
+    assert throttle.rate("1.5g") == 1.5 * 2**30
+    assert throttle.rate("50MB") == 50 * 2**20
+    for text in ("0", "-1M", "fast"):
+        with pytest.raises(ValueError):
+            throttle.rate(text)
+
+
+def test_bucket():
+    """Verify a bucket gives a second's worth of tokens, then makes the takers
+    wait in turn."""
+    bucket = throttle.Bucket(rate=100)
+    assert bucket.take(100) == 0
+    assert bucket.take(50) == pytest.approx(0.5, abs=0.05)
+    assert bucket.take(50) == pytest.approx(1.0, abs=0.05)
+
+
+def test_throttling(tmp_path):
+    """Verify a run within the limits waits, and finds the same results."""
+    tmp_path.joinpath("big.py").write_text("x = 1\n" * 2000)  # 12000 bytes
+    tmp_path.joinpath("small.py").write_text("x = 1\n")
+
+    throttle.transfer(10**9)  # not throttling: nothing happens
+    throttle.file()
+
+    notice = cr.notice_template()
+    limits = throttle.Throttle(bytes_per_second=10000, files_per_second=1000)
+    with throttle.throttling(limits):
+        results = cr.process_files(cr.Operation().status, notice, paths=[tmp_path])
+        assert [result.found for result in results] == [False, False]
+    assert throttle._active is None
+    assert 0.1 < limits.waited < 1
+
+
+def test_throttling_streamed(tmp_path, monkeypatch):
+    """Verify each chunk of a file rewritten a chunk at a time is counted and
+    throttled as it is read and written, and so are the archive members."""
+    monkeypatch.setattr(cr, "STREAM_SIZE", 0)
+    notice = cr.notice_template()
+    path = tmp_path.joinpath("big.py")
+    path.write_text("x = 1\n" * (2**19 // 3) + notice.text + "\n")  # 1 MiB+
+    size = path.stat().st_size
+
+    limits = throttle.Throttle(bytes_per_second=2 * size)
+    transfers = []
+    transfer = limits.transfer
+    monkeypatch.setattr(
+        limits, "transfer", lambda n: transfers.append(n) or transfer(n)
+    )
+    new = notice.text.replace("2023", "2024")
+    with stats.recording() as recorder, throttle.throttling(limits):
+        result = cr.process_file(path, cr.Operation().update, notice, new=new)
+    assert result.action == cr.Action().updated
+    assert recorder.counters["bytes_read"] >= 2 * size  # the search, the copy
+    assert recorder.counters["bytes_written"] == path.stat().st_size
+    assert max(transfers) <= chunked.CHUNK_SIZE + len(notice.text)
+    assert 0.2 < limits.waited < 2
+
+    with zipfile.ZipFile(str(tmp_path / "a.whl"), mode="w") as zf:
+        zf.write(str(path), "pkg/big.py")
+    transfers.clear()
+    with stats.recording() as recorder, throttle.throttling(limits):
+        assert [
+            item.found for item in cr.archive_results([tmp_path / "a.whl"], notice)
+        ] == [False]
+    assert recorder.counters["bytes_read"] >= size
+    assert sum(transfers) >= size
+
+
+def test_cli(tmp_path):
+    """Verify the options are taken by the commands."""
+    tmp_path.joinpath("a.py").write_text("x = 1\n")
+    argv = ["--bwlimit", "1M", "--iops", "100", "--quiet", str(tmp_path)]
+    assert cl.copyright_cli(argv) == 0
+    assert cl.copyright_status_cli(["--check"] + argv) == 0
+
+
+def test_lower_priority():
+    """Verify the CPU priority of a process is lowered, in a process of its own."""
+    code = "from snlcopyright import throttle; print(throttle.lower_priority())"
+    output = subprocess.run(
+        [sys.executable, "-c", code], stdout=subprocess.PIPE, check=True
+    ).stdout.decode()
+    assert "cpu" in output or not hasattr(os, "nice")
+
+
+"""
+Copyright 2023 Sandia National Laboratories
+
+Notice: This computer software was prepared by National Technology and Engineering Solutions of
+Sandia, LLC, hereinafter the Contractor, under Contract DE-NA0003525 with the Department of Energy
+(DOE). All rights in the computer software are reserved by DOE on behalf of the United States
+Government and the Contractor as provided in the Contract. You are authorized to use this computer
+software for Governmental purposes but it is not to be released or distributed to the public.
+NEITHER THE U.S. GOVERNMENT NOR THE CONTRACTOR MAKES ANY WARRANTY, EXPRESS OR IMPLIED, OR ASSUMES
+ANY LIABILITY FOR THE USE OF THIS SOFTWARE. This notice including this sentence must appear on any
+copies of this computer software. Export of this data may require a license from the United States
+Government.
+"""
@@ -0,0 +1,218 @@
+"""This module tests the vcs module."""
+
+import io
+import os
+import subprocess
+import time
+from collections import Counter
+
+import pytest
+
+from snlcopyright import matcher, report, vcs
+import snlcopyright.command_line as cl
+import snlcopyright.copyright_crud as cr
+
+
+def run_git(root, *args) -> None:
+    """Runs a git command in `root`, with a throwaway identity."""
+    subprocess.run(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@example.com"]
+        + list(args),
+        cwd=str(root),
+        check=True,
+        stdout=subprocess.DEVNULL,
+    )
+
+
+def make_repo(root):
+    """Creates a git repository with one commit and returns its root."""
+    run_git(root, "init", "-q")
+    for name in ("a.py", "b.py", "c.py", "notes.txt"):
+        root.joinpath(name).write_text("x = 1\n")
+    run_git(root, "add", ".")
+    run_git(root, "commit", "-q", "-m", "initial")
+    return root.resolve()
+
+
+def test_changed_files(tmp_path):
+    """Verify staged, unstaged, untracked, and deleted files are reported as
+    expected, relative to HEAD or to a base revision."""
+    root = make_repo(tmp_path)
+
+    root.joinpath("a.py").write_text("x = 2\n")  # modified, staged
+    root.joinpath("notes.txt").write_text("y\n")  # modified, not Python
+    run_git(root, "add", "a.py", "notes.txt")
+    root.joinpath("b.py").write_text("x = 2\n")  # modified, not staged
+    root.joinpath("c.py").unlink()  # deleted
+    root.joinpath("d.py").write_text("x = 1\n")  # untracked
+
+    assert vcs.changed_files(root, staged=True) == [root.joinpath("a.py")]
+    assert vcs.changed_files(root) == [
+        root.joinpath("a.py"),
+        root.joinpath("b.py"),
+        root.joinpath("d.py"),
+    ]
+
+    run_git(root, "commit", "-q", "-am", "second")
+    assert vcs.changed_files(root, base="HEAD~1") == [
+        root.joinpath("a.py"),
+        root.joinpath("b.py"),
+    ]
+
+
+def test_changed_files_not_a_repo(tmp_path):
+    """Verify a helpful error is raised outside of a git repository."""
+    with pytest.raises(RuntimeError):
+        vcs.changed_files(tmp_path)
+
+
+def test_changed_files_roots(tmp_path, capsys, monkeypatch):
+    """Verify the changed files of roots in different repositories are each
+    found in their own repository, from outside of both."""
+    roots = []
+    for name in ("one", "two"):
+        tmp_path.joinpath(name).mkdir()
+        root = make_repo(tmp_path.joinpath(name))
+        root.joinpath("b.py").write_text("x = 2\n")
+        roots.append(root)
+    outside = tmp_path.joinpath("outside")
+    outside.mkdir()
+    monkeypatch.chdir(outside)
+
+    args = ["--changed", str(roots[0]), str(roots[1].joinpath("b.py"))]
+    assert cl.copyright_status_cli(args) == 0
+    out = capsys.readouterr().out
+    for root in roots:
+        assert f"{root.joinpath('b.py')} " in out
+        assert f"{root.joinpath('a.py')} " not in out
+
+
+def test_copyright_status_cli_paths(tmp_path, capsys):
+    """Verify explicit files are processed, as pre-commit passes them."""
+    aa = tmp_path.joinpath("a.py")
+    aa.write_text("x = 1\n")
+    assert cl.copyright_status_cli([str(aa)]) == 0
+    assert f"{aa} " in capsys.readouterr().out
+
+
+def commit(root, year: int, message: str) -> None:
+    """Commits all the changes in `root`, as authored in the `year`."""
+    env = dict(os.environ, GIT_AUTHOR_DATE=f"{year}-06-01T12:00:00")
+    for args in (["add", "-A"], ["commit", "-q", "-m", message]):
+        subprocess.run(
+            ["git", "-c", "user.name=test", "-c", "user.email=test@example.com"] + args,
+            cwd=str(root),
+            env=env,
+            check=True,
+            stdout=subprocess.DEVNULL,
+        )
+
+
+def test_file_years(tmp_path):
+    """Verify the years of each file are read from the history in one pass,
+    and each block is marked, or its years replaced, with them."""
+    notice = cr.notice_template()
+    this_year = time.localtime().tm_year
+    root = tmp_path.resolve()
+    run_git(root, "init", "-q")
+    root.joinpath(".gitignore").write_text("d.py\n")
+    root.joinpath("a.py").write_text(f"x = 1\n\n{notice.text}\n")
+    root.joinpath("b.py").write_text("x = 1\n")
+    commit(root, 2019, "first")
+    root.joinpath("a.py").write_text(f"x = 2\n\n{notice.text}\n")
+    commit(root, 2021, "second")
+    root.joinpath("b.py").write_text("x = 2\n")  # changed this year
+    root.joinpath("c.py").write_text("x = 3\n")  # untracked
+    root.joinpath("d.py").write_text("x = 4\n")  # ignored
+
+    assert vcs.history_years(root) == {
+        ".gitignore": (2019, 2019),
+        "a.py": (2019, 2021),
+        "b.py": (2019, 2019),
+    }
+    years = vcs.FileYears([root / "a.py", root])
+    assert years.span(root / "a.py") == "2019-2021"
+    assert years.span(root / "b.py") == f"2019-{this_year}"
+    assert years.span(root / "c.py") == str(this_year)
+    assert years.span(root / "d.py") is None
+
+    rr = report.make_report("summary", stream=io.StringIO())
+    assert cr.copyright(paths=[root], years=years, gitignore=False, report=rr)
+    assert (rr.totals["updated"], rr.totals["created"]) == (1, 2)
+    text = root.joinpath("a.py").read_text()
+    assert text.count("Copyright") == 1
+    assert f"Copyright 2019-{this_year} Sandia" in text  # changed now
+    assert f"Copyright 2019-{this_year} Sandia" in root.joinpath("b.py").read_text()
+    assert root.joinpath("d.py").read_text() == "x = 4\n"
+
+    rr = report.make_report("summary", stream=io.StringIO())
+    years = vcs.FileYears([root])  # as of the files marked
+    assert cr.copyright(paths=[root], years=years, check=True, report=rr)
+    root.joinpath("a.py").write_text(f"x = 2\n\n{notice.text}\n")
+    assert not cr.copyright(paths=[root], years=years, check=True, report=rr)
+
+
+def test_years_again(tmp_path):
+    """Verify marking the files with their years again, before and after the
+    marking is committed, leaves them as they are."""
+    notice = cr.notice_template()
+    this_year = time.localtime().tm_year
+    root = tmp_path.resolve()
+    run_git(root, "init", "-q")
+    root.joinpath("a.py").write_text("x = 1\n")
+    root.joinpath("b.py").write_text(
+        f"x = 1\n\n{matcher.with_years(notice.text, '2019-2021')}\n"
+    )
+    commit(root, 2019, "first")
+    root.joinpath("b.py").write_text(root.joinpath("b.py").read_text() + "y = 2\n")
+    commit(root, 2021, "second")
+
+    def mark(**kwargs) -> Counter:
+        rr = report.make_report("summary", stream=io.StringIO())
+        years = vcs.FileYears([root])
+        assert cr.copyright(paths=[root], years=years, report=rr, **kwargs)
+        return rr.totals
+
+    assert mark()["created"] == 1
+    assert f"Copyright 2019-{this_year} Sandia" in root.joinpath("a.py").read_text()
+    assert "Copyright 2019-2021 Sandia" in root.joinpath("b.py").read_text()
+    assert mark()["unchanged"] == 2
+    assert mark(check=True)["found"] == 2
+    commit(root, this_year, "mark")
+    assert mark()["unchanged"] == 2
+    assert mark(check=True)["found"] == 2
+
+
+@pytest.mark.skipif(os.name != "posix", reason="a shell script stands in for git")
+def test_history_years_errors(tmp_path, monkeypatch):
+    """Verify the history is read, and the error reported, when git writes
+    more to its standard error than a pipe holds."""
+    bin_dir = tmp_path.joinpath("bin")
+    bin_dir.mkdir()
+    git = bin_dir.joinpath("git")
+    git.write_text(
+        "#!/bin/sh\n"
+        "printf '\\0002020\\na.py\\n'\n"
+        "head -c 1000000 /dev/zero | tr '\\0' x >&2\n"
+        "echo fatal: broken >&2\n"
+        "exit 1\n"
+    )
+    git.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    with pytest.raises(RuntimeError, match="fatal: broken"):
+        vcs.history_years(tmp_path)
+
+
+"""
+Copyright 2023 Sandia National Laboratories
+
+Notice: This computer software was prepared by National Technology and Engineering Solutions of
+Sandia, LLC, hereinafter the Contractor, under Contract DE-NA0003525 with the Department of Energy
+(DOE). All rights in the computer software are reserved by DOE on behalf of the United States
+Government and the Contractor as provided in the Contract. You are authorized to use this computer
+software for Governmental purposes but it is not to be released or distributed to the public.
+NEITHER THE U.S. GOVERNMENT NOR THE CONTRACTOR MAKES ANY WARRANTY, EXPRESS OR IMPLIED, OR ASSUMES
+ANY LIABILITY FOR THE USE OF THIS SOFTWARE. This notice including this sentence must appear on any
+copies of this computer software. Export of this data may require a license from the United States
+Government.
+"""
@@ -0,0 +1,105 @@
+"""This module tests the walk module."""
+
+import types
+from pathlib import Path
+
+from snlcopyright import walk
+
+
+def make_tree(root: Path, names) -> None:
+    """Creates an empty file at each of the relative path `names`."""
+    for name in names:
+        path = root.joinpath(name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("")
+
+
+def relative(root: Path, paths) -> list:
+    """Returns the `paths` relative to `root`, as posix strings."""
+    return [path.relative_to(root).as_posix() for path in paths]
+
+
+def test_iter_modules_default_excludes(tmp_path):
+    """Verify tooling and build directories are pruned, and the walk is lazy
+    and in name order."""
+    make_tree(
+        tmp_path,
+        [
+            "b.py",
+            "a.py",
+            "notes.txt",
+            "pkg/z.py",
+            "pkg/sub/y.py",
+            ".git/hooks/x.py",
+            ".venv/lib/site.py",
+            "node_modules/gyp/gyp.py",
+            "build/lib/a.py",
+            "pkg/__pycache__/z.py",
+            "pkg/foo.egg-info/setup.py",
+        ],
+    )
+
+    found = walk.iter_modules(tmp_path)
+    assert isinstance(found, types.GeneratorType)
+    assert relative(tmp_path, found) == ["a.py", "b.py", "pkg/z.py", "pkg/sub/y.py"]
+
+
+def test_iter_modules_patterns(tmp_path):
+    """Verify the `.gitignore` files and the exclude patterns are honored."""
+    make_tree(
+        tmp_path,
+        [
+            "a.py",
+            "a_pb2.py",
+            "keep_pb2.py",
+            "generated/g.py",
+            "src/generated/g.py",
+            "src/vendor/v.py",
+            "src/c.py",
+            "docs/conf.py",
+        ],
+    )
+    tmp_path.joinpath(".gitignore").write_text(
+        "# comment\n\ngenerated/\n*_pb2.py\n!keep_pb2.py\n"
+    )
+    tmp_path.joinpath("src", ".gitignore").write_text("/vendor\n")
+
+    found = walk.iter_modules(tmp_path, exclude=("docs/conf.py",))
+    assert relative(tmp_path, found) == ["a.py", "keep_pb2.py", "src/c.py"]
+
+    found = walk.iter_modules(tmp_path, exclude=("**/g.py",), gitignore=False)
+    assert relative(tmp_path, found) == [
+        "a.py",
+        "a_pb2.py",
+        "keep_pb2.py",
+        "docs/conf.py",
+        "src/c.py",
+        "src/vendor/v.py",
+    ]
+
+
+def test_compile_rule():
+    """Verify blank lines and comments are skipped, and globs translate."""
+    assert walk.compile_rule("  ", base="/") is None
+    assert walk.compile_rule("# build/", base="/") is None
+
+    rule = walk.compile_rule("src/**/test_*.py", base="/")
+    assert rule.regex.match("src/test_a.py")
+    assert rule.regex.match("src/a/b/test_a.py")
+    assert not rule.regex.match("lib/src/test_a.py")
+    assert not rule.regex.match("src/a/test_a.pyc")
+
+
+"""
+Copyright 2023 Sandia National Laboratories
+
+Notice: This computer software was prepared by National Technology and Engineering Solutions of
+Sandia, LLC, hereinafter the Contractor, under Contract DE-NA0003525 with the Department of Energy
+(DOE). All rights in the computer software are reserved by DOE on behalf of the United States
+Government and the Contractor as provided in the Contract. You are authorized to use this computer
+software for Governmental purposes but it is not to be released or distributed to the public.
+NEITHER THE U.S. GOVERNMENT NOR THE CONTRACTOR MAKES ANY WARRANTY, EXPRESS OR IMPLIED, OR ASSUMES
+ANY LIABILITY FOR THE USE OF THIS SOFTWARE. This notice including this sentence must appear on any
+copies of this computer software. Export of this data may require a license from the United States
+Government.
+"""
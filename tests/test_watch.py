@@ -0,0 +1,141 @@
+"""This module tests the watch module."""
+
+import io
+import threading
+
+import pytest
+
+import snlcopyright.copyright_crud as cr
+from snlcopyright import report, watch
+from snlcopyright.config import NoticeIndex
+
+NOTICE = cr.notice_template()
+
+
+def statuses(watcher) -> dict:
+    """Returns the status in the index of the `watcher`, by file name."""
+    return {result.path.name: result.found for result in watcher.results()}
+
+
+def make_tree(root) -> None:
+    """Creates one marked and one unmarked module, and a file to skip."""
+    root.joinpath("pkg").mkdir()
+    root.joinpath("pkg", "a.py").write_text(f"x = 1\n\n{NOTICE.text}\n")
+    root.joinpath("pkg", "b.py").write_text("x = 2\n")
+    root.joinpath("notes.txt").write_text("not a module\n")
+
+
+def test_watcher_polling(tmp_path):
+    """Verify the index follows created, modified, and removed files and
+    directories, and marks new files with `create`."""
+    make_tree(tmp_path)
+    watcher = watch.Watcher([tmp_path], backend=watch.Polling(0.01), create=True)
+    watcher.scan()
+    assert statuses(watcher) == {"a.py": True, "b.py": False}  # not marked
+
+    tmp_path.joinpath("pkg", "a.py").write_text("x = 1\n# changed\n")
+    tmp_path.joinpath("pkg", "b.py").unlink()
+    tmp_path.joinpath("sub").mkdir()
+    tmp_path.joinpath("sub", "c.py").write_text("x = 3\n")
+    assert watcher.backend.wait(timeout=1.0) is None
+    watcher.refresh(None)
+    assert statuses(watcher) == {"a.py": False, "c.py": True}
+    assert cr.copyright_exists(tmp_path.joinpath("sub", "c.py"))
+
+    tmp_path.joinpath("sub", "c.py").unlink()
+    tmp_path.joinpath("sub").rmdir()
+    watcher.refresh(None)
+    assert statuses(watcher) == {"a.py": False}
+    assert [item.name for item in watcher.results([tmp_path / "sub"])] == []
+
+    config = NoticeIndex(tmp_path, [("pkg", None)])
+    watcher = watch.Watcher([tmp_path], backend=watch.Polling(0.01), config=config)
+    watcher.scan()
+    assert statuses(watcher) == {}
+    assert watcher.refusal({"settings": watch.settings(NOTICE)}) is not None
+
+
+def test_watcher_inotify(tmp_path):
+    """Verify inotify reports the directories in which files changed."""
+    try:
+        backend = watch.Inotify()
+    except OSError:
+        pytest.skip("inotify is not available")
+    make_tree(tmp_path)
+    watcher = watch.Watcher([tmp_path], backend=backend)
+    try:
+        watcher.scan()
+        assert backend.wait(timeout=0.01) == set()
+        tmp_path.joinpath("pkg", "b.py").write_text(f"x = 2\n\n{NOTICE.text}\n")
+        changed = backend.wait(timeout=5.0)
+        assert changed == {str(tmp_path / "pkg")}
+        watcher.refresh(changed)
+        assert statuses(watcher) == {"a.py": True, "b.py": True}
+    finally:
+        backend.close()
+
+
+def test_copyright_status_daemon(tmp_path):
+    """Verify `copyright_status` takes the status from a watcher, and reads
+    the files if none answers."""
+    make_tree(tmp_path)
+    socket_path = tmp_path.joinpath("watch.sock")
+    stop, ready = threading.Event(), threading.Event()
+    thread = threading.Thread(
+        target=watch.watch,
+        args=([tmp_path],),
+        kwargs=dict(socket_path=socket_path, poll=0.05, stop=stop, ready=ready),
+    )
+    thread.start()
+    try:
+        assert ready.wait(timeout=10)
+        results = watch.query(socket_path, [tmp_path / "pkg"])
+        assert [(item.path.name, item.found) for item in results] == [
+            ("a.py", True),
+            ("b.py", False),
+        ]
+        rr = report.make_report("summary", stream=io.StringIO())
+        assert not cr.copyright_status(
+            paths=[tmp_path], daemon=socket_path, check=True, report=rr
+        )
+        assert rr.totals["files"] == 2
+        assert rr.totals["missing"] == 1
+
+        # Paths outside the watched directories, and other settings, are
+        # refused, and the files are read instead.
+        other = tmp_path.parent.joinpath(tmp_path.name + "-other")
+        other.mkdir()
+        other.joinpath("c.py").write_text("x = 3\n")
+        with pytest.raises(OSError, match="does not watch"):
+            watch.query(socket_path, [other])
+        for options in (dict(paths=[other]), dict(paths=[tmp_path], window=100)):
+            stream = io.StringIO()
+            rr = report.make_report("text", stream=stream)
+            assert not cr.copyright_status(
+                daemon=socket_path, check=True, report=rr, **options
+            )
+            assert "reading files" in stream.getvalue()
+            assert rr.totals["missing"] == 1
+    finally:
+        stop.set()
+        thread.join(timeout=10)
+    assert not socket_path.exists()
+
+    rr = report.make_report("summary", stream=io.StringIO())
+    assert cr.copyright_status(paths=[tmp_path], daemon=socket_path, report=rr)
+    assert rr.totals["files"] == 2
+
+
+"""
+Copyright 2023 Sandia National Laboratories
+
+Notice: This computer software was prepared by National Technology and Engineering Solutions of
+Sandia, LLC, hereinafter the Contractor, under Contract DE-NA0003525 with the Department of Energy
+(DOE). All rights in the computer software are reserved by DOE on behalf of the United States
+Government and the Contractor as provided in the Contract. You are authorized to use this computer
+software for Governmental purposes but it is not to be released or distributed to the public.
+NEITHER THE U.S. GOVERNMENT NOR THE CONTRACTOR MAKES ANY WARRANTY, EXPRESS OR IMPLIED, OR ASSUMES
+ANY LIABILITY FOR THE USE OF THIS SOFTWARE. This notice including this sentence must appear on any
+copies of this computer software. Export of this data may require a license from the United States
+Government.
+"""